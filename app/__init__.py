@@ -1,45 +1,53 @@
 from flask import Flask, jsonify
 from flask_pymongo import PyMongo
 from pymongo.errors import ServerSelectionTimeoutError
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.middleware.proxy_fix import ProxyFix
 from config import Config
 from app.routes.auth import init_auth_routes
 from app.routes.events import init_event_routes
+from app.routes.media import init_media_routes
+from app.utils.mongo_options import client_options
 from flask_cors import CORS
 
 mongo = PyMongo()
 
 
+def allowed_origins():
+    """Front-end origins allowed to call the API"""
+    origins = [
+        "https://www.aup.events",
+        "https://aup.events",
+        "https://app.aup.events",
+    ]
+    if Config.FLASK_ENV == "development":
+        origins.append("http://localhost:3000")
+    return origins
+
+
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
+    if Config.PROXY_HOPS:
+        # Client address from X-Forwarded-For, as set by our own proxies
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=Config.PROXY_HOPS)
 
-    # Test MongoDB connection
-    try:
-        mongo.init_app(app)
-        # Verify connection
-        mongo.db.command("ping")
-        print("Successfully connected to MongoDB!")
-    except ServerSelectionTimeoutError:
-        print(
-            "Could not connect to MongoDB. Please check your connection string and network connection."
-        )
+    # The client connects on first use, so nothing here waits on MongoDB and
+    # a preloaded app forks cleanly: each worker opens its own connections.
+    # Collections and indexes are set up by bootstrap_database beforehand
+    mongo.init_app(app, **client_options())
 
     # Register blueprints
     app.register_blueprint(init_auth_routes(mongo), url_prefix="/api/auth")
     app.register_blueprint(init_event_routes(mongo), url_prefix="/api")
+    if Config.STORAGE_BACKEND == "local":
+        # Serves the files LocalStorage wrote; nothing to serve otherwise
+        app.register_blueprint(init_media_routes(), url_prefix="/media")
 
     # Configure CORS
-    allowed_origins = [
-        "https://www.aup.events",
-        "https://aup.events",
-        "https://app.aup.events",
-    ]
-    if app.config["FLASK_ENV"] == "development":
-        allowed_origins.append("http://localhost:3000")
-
     CORS(
         app,
-        resources={r"/api/*": {"origins": allowed_origins}},
+        resources={r"/api/*": {"origins": allowed_origins()}},
         supports_credentials=True,
         allow_headers=["Content-Type", "Authorization"],
         methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
@@ -53,4 +61,15 @@ def create_app():
             500,
         )
 
+    @app.errorhandler(RequestEntityTooLarge)
+    def handle_too_large(error):
+        return (
+            jsonify(
+                {
+                    "message": f"Request body is larger than {Config.MAX_CONTENT_LENGTH} bytes"
+                }
+            ),
+            413,
+        )
+
     return app
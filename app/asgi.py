@@ -0,0 +1,105 @@
+"""ASGI entry point serving the busiest read routes on asyncio.
+
+GET /api/events, /api/events/<id>, /api/events/registered and
+/api/events/created are answered by the coroutines in
+app/routes/async_events.py through pymongo's AsyncMongoClient, so one
+process can keep thousands of these requests waiting on the database at
+once. Every other request (and every other method, including CORS
+preflights) is passed to the Flask app, which runs in a thread pool.
+
+    uvicorn asgi:app --workers 4
+"""
+import re
+from asgiref.wsgi import WsgiToAsgi
+from bson import json_util
+from app import allowed_origins
+from app.models.async_event import AsyncEventReader
+from app.routes.async_events import init_async_event_routes
+from app.utils.auth_middleware import decode_token
+from app.utils.mongo_options import client_options
+from config import Config
+
+
+class AsyncReadApp:
+    def __init__(self, flask_app=None):
+        self.fallback = WsgiToAsgi(flask_app) if flask_app else None
+        self.origins = set(allowed_origins())
+        self.client = None
+        self.routes = None
+
+    def _get_routes(self):
+        # The client belongs to the event loop of this worker, so it is
+        # created on first use rather than at import
+        if self.routes is None:
+            from pymongo import AsyncMongoClient
+
+            self.client = AsyncMongoClient(Config.MONGO_URI, **client_options())
+            reader = AsyncEventReader(self.client.get_default_database())
+            self.routes = [
+                (re.compile(f"^{pattern}$"), handler)
+                for pattern, handler in init_async_event_routes(reader)
+            ]
+        return self.routes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+
+        if scope["type"] == "http" and scope["method"] == "GET":
+            for pattern, handler in self._get_routes():
+                match = pattern.match(scope["path"])
+                if match:
+                    await self._handle(scope, send, handler, match.groupdict())
+                    return
+
+        if self.fallback is None:
+            await self._respond(scope, send, {"message": "Not found"}, 404)
+            return
+        await self.fallback(scope, receive, send)
+
+    async def _handle(self, scope, send, handler, params):
+        headers = dict(scope["headers"])
+        authorization = headers.get(b"authorization", b"").decode("latin-1")
+        current_user, claims, error = decode_token(authorization)
+        if error:
+            body, status = error
+        else:
+            body, status = await handler(current_user, **params, **claims)
+        await self._respond(scope, send, body, status)
+
+    async def _respond(self, scope, send, body, status):
+        payload = json_util.dumps(body).encode()
+        headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(payload)).encode()),
+        ]
+        # Same CORS headers Flask-CORS adds to /api responses
+        origin = dict(scope.get("headers") or []).get(b"origin", b"").decode("latin-1")
+        if origin in self.origins:
+            headers += [
+                (b"access-control-allow-origin", origin.encode("latin-1")),
+                (b"access-control-allow-credentials", b"true"),
+                (b"access-control-expose-headers", b"Content-Type, Authorization"),
+                (b"vary", b"Origin"),
+            ]
+        await send(
+            {"type": "http.response.start", "status": status, "headers": headers}
+        )
+        await send({"type": "http.response.body", "body": payload})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self.client is not None:
+                    await self.client.close()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+def create_asgi_app(flask_app=None):
+    """Serve the async read routes, and everything else with flask_app"""
+    return AsyncReadApp(flask_app)
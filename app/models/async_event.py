@@ -0,0 +1,53 @@
+import logging
+from bson import ObjectId
+from app.models.event import registered_query, serialize_event
+from app.utils.mongo_options import secondary_reads
+
+
+class AsyncEventReader:
+    """The Event model's read queries on an asyncio database handle.
+
+    Used by the async read routes (app/routes/async_events.py) with
+    pymongo's AsyncMongoClient; results match the Event methods of the
+    same name.
+    """
+
+    def __init__(self, db):
+        self.events_collection = db.events
+        # Event lists may be served by a lagging secondary, as in Event
+        self.events_reads = secondary_reads(self.events_collection)
+        self.deeplinks_collection = db.deeplinks
+
+    async def _find(self, collection, query):
+        return [serialize_event(event) async for event in collection.find(query)]
+
+    async def get_all_events(self, include_pending=False):
+        # If include_pending is False, only show approved events
+        return await self._find(
+            self.events_reads, {} if include_pending else {"is_approved": True}
+        )
+
+    async def get_events_by_code(self, event_code):
+        """Get all events with matching event code"""
+        return await self._find(
+            self.events_reads, {"event_code": event_code, "allow_external": True}
+        )
+
+    async def get_event_by_id(self, event_id):
+        try:
+            event = await self.events_collection.find_one({"_id": ObjectId(event_id)})
+            if event:
+                serialize_event(event)
+            return event
+        except Exception as ex:
+            logging.exception("Error fetching event by ID, %s", ex)
+            return None
+
+    async def get_registered_events(self, user_id):
+        return await self._find(self.events_collection, registered_query(user_id))
+
+    async def get_created_events(self, user_id):
+        return await self._find(self.events_collection, {"creator_id": user_id})
+
+    async def find_deeplink(self, query):
+        return await self.deeplinks_collection.find_one(query)
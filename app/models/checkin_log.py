@@ -0,0 +1,96 @@
+import hashlib
+from datetime import datetime, timezone
+from pymongo.errors import BulkWriteError
+
+
+def checkin_key(event_id, enrollment_number, device_id, scanned_at):
+    """Idempotency key for a scan uploaded without one"""
+    raw = f"{event_id}:{enrollment_number}:{device_id}:{scanned_at.isoformat()}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _entry_id(event_id, checkin):
+    """Log entry _id; idempotency keys are chosen by scanners, so they are
+    only unique per event and device"""
+    return {
+        "event_id": str(event_id),
+        "device_id": checkin["device_id"],
+        "key": checkin["idempotency_key"],
+    }
+
+
+class CheckinLog:
+    """Append-only log of uploaded scans, keyed by event, device and
+    idempotency key.
+
+    Each scan is stored once; uploading it again is reported as a
+    duplicate. Entries stay "applied": False until their attendance has
+    been written, so a retry after a failure half way re-applies them.
+    """
+
+    def __init__(self, mongo):
+        self.mongo = mongo
+        self.collection = self.mongo.db.checkin_log
+
+    def record(self, event_id, checkins):
+        """Store scans and return those that still need to be applied.
+
+        checkins are dicts with idempotency_key, enrollment_number,
+        scanned_at and device_id. Returns (pending, duplicates): pending are
+        the checkins to apply, duplicates the (device_id, idempotency_key)
+        pairs that were already applied earlier.
+        """
+        received_at = datetime.now(timezone.utc)
+        documents = [
+            {
+                "_id": _entry_id(event_id, checkin),
+                "event_id": str(event_id),
+                "enrollment_number": checkin["enrollment_number"],
+                "device_id": checkin["device_id"],
+                "scanned_at": checkin["scanned_at"],
+                "received_at": received_at,
+                "applied": False,
+            }
+            for checkin in checkins
+        ]
+        if not documents:
+            return [], set()
+
+        stored = set(range(len(documents)))
+        try:
+            self.collection.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                if error.get("code") != 11000:
+                    raise
+                stored.discard(error["index"])
+
+        existing = [
+            document["_id"]
+            for index, document in enumerate(documents)
+            if index not in stored
+        ]
+        # Scans seen before but never applied (e.g. the last upload failed)
+        unapplied = {
+            (entry["_id"]["device_id"], entry["_id"]["key"])
+            for entry in self.collection.find(
+                {"_id": {"$in": existing}, "applied": False}, {"_id": 1}
+            )
+        }
+        pending = [
+            checkin
+            for index, checkin in enumerate(checkins)
+            if index in stored
+            or (checkin["device_id"], checkin["idempotency_key"]) in unapplied
+        ]
+        duplicates = {
+            (entry_id["device_id"], entry_id["key"]) for entry_id in existing
+        } - unapplied
+        return pending, duplicates
+
+    def mark_applied(self, event_id, checkins):
+        ids = [_entry_id(event_id, checkin) for checkin in checkins]
+        if ids:
+            self.collection.update_many(
+                {"_id": {"$in": ids}}, {"$set": {"applied": True}}
+            )
@@ -1,29 +1,59 @@
+from contextlib import contextmanager
 from datetime import datetime, timezone
 import logging
 from bson import ObjectId
-from io import BytesIO
-from fpdf import FPDF
-import xlsxwriter
+from io import StringIO
+import csv
+import os
 from app.models.user import User  # Import here to avoid circular imports
 from app.models.external_participant import ExternalParticipant
-import random
-import string
+from app.models.event_analytics import EventAnalytics
+from app.utils.id_allocator import event_code_allocator
+from app.utils import report_pool
+from app.utils.mongo_options import majority_writes, secondary_reads
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
 import secrets
 from config import Config
 import json
 
+# Attempts made to reserve a fresh event code before giving up
+MAX_CODE_ATTEMPTS = 5
 
-class PDF(FPDF):
-    def header(self):
-        # Transparent
-        self.set_fill_color(215, 183, 255)  # Indigo with 10% opacity
-        self.rect(0, 0, self.w, 50, "F")
 
-    def footer(self):
-        self.set_y(-15)
-        self.set_font("Arial", "I", 8)
-        self.set_text_color(128, 128, 128)
-        self.cell(0, 10, f"Page {self.page_no()}/{{nb}}", align="C")
+def serialize_event(event):
+    """Give an event document a string id and ISO dates for the API"""
+    event["_id"] = str(event["_id"])
+    if "date" in event and not isinstance(event["date"], str):
+        event["date"] = event["date"].isoformat()
+    if "created_at" in event and not isinstance(event["created_at"], str):
+        event["created_at"] = event["created_at"].isoformat()
+    return event
+
+
+def registered_query(user_id):
+    """Filter for the events user_id is registered for"""
+    # Query for both old and new format
+    return {
+        "$or": [
+            {"participants": user_id},  # Old format
+            {"participants.enrollment_number": user_id},  # New format
+        ]
+    }
+
+
+def summarize_participants(events, current_user):
+    """Hide the participant lists of events current_user did not create"""
+    for event in events:
+        if str(event.get("creator_id")) != str(current_user):
+            # For non-creators, only send participant count and registration status
+            participants = event.get("participants", [])
+            event["is_registered"] = any(
+                p.get("enrollment_number") == current_user for p in participants
+            )
+            event["participants"] = len(participants)
+        # Creators see full participant data for their events
+    return events
 
 
 class Event:
@@ -31,13 +61,28 @@ class Event:
         self.mongo = mongo
         self.collection = self.mongo.db.users
         self.events_collection = self.mongo.db.events
+        # Event lists and reports may be read from a lagging secondary;
+        # registrations and attendance are confirmed by a majority
+        self.events_reads = secondary_reads(self.events_collection)
+        self.events_writes = majority_writes(self.events_collection)
         self.user_model = User(mongo)
         self.external_participants_collection = self.mongo.db.external_participants
+        self.analytics = EventAnalytics(mongo)
 
     def create_event(self, event_data, creator_id):
         def generate_event_code():
-            chars = string.ascii_uppercase + string.digits
-            return "".join(random.choices(chars, k=6))
+            # Reserve the code in the registry; its _id index rejects reuse
+            allocator = event_code_allocator(self.mongo)
+            for _ in range(MAX_CODE_ATTEMPTS):
+                code = allocator.next_id()
+                try:
+                    self.mongo.db.event_codes.insert_one(
+                        {"_id": code, "created_at": datetime.now()}
+                    )
+                    return code
+                except DuplicateKeyError:
+                    continue
+            raise RuntimeError("Could not allocate a unique event code")
 
         # Generate approval token - used for approving the event
         approval_token = secrets.token_urlsafe(32)
@@ -87,6 +132,8 @@ class Event:
             "approval_request_time": datetime.now(),
             "approval_time": None if require_approval else datetime.now(),
             "custom_slug": event_data.get("custom_slug", None),
+            # Bumped on every change that affects participant reports
+            "version": 1,
         }
 
         minutes = int(event_data.get("duration_minutes") or 0)
@@ -155,25 +202,17 @@ class Event:
     def get_all_events(self, include_pending=False):
         # If include_pending is False, only show approved events
         filter_query = {} if include_pending else {"is_approved": True}
-        events = list(self.events_collection.find(filter_query))
+        events = list(self.events_reads.find(filter_query))
         # Convert ObjectId to string for each event
         for event in events:
-            event["_id"] = str(event["_id"])
-            if "date" in event and not isinstance(event["date"], str):
-                event["date"] = event["date"].isoformat()
-            if "created_at" in event and not isinstance(event["created_at"], str):
-                event["created_at"] = event["created_at"].isoformat()
+            serialize_event(event)
         return events
 
     def get_pending_events(self):
         events = list(self.events_collection.find({"approval_status": "pending"}))
         # Convert ObjectId to string for each event
         for event in events:
-            event["_id"] = str(event["_id"])
-            if "date" in event and not isinstance(event["date"], str):
-                event["date"] = event["date"].isoformat()
-            if "created_at" in event and not isinstance(event["created_at"], str):
-                event["created_at"] = event["created_at"].isoformat()
+            serialize_event(event)
         return events
 
     def approve_event(self, event_id, token):
@@ -239,11 +278,7 @@ class Event:
         try:
             event = self.events_collection.find_one({"_id": ObjectId(event_id)})
             if event:
-                event["_id"] = str(event["_id"])
-                if "date" in event:
-                    event["date"] = event["date"].isoformat()
-                if "created_at" in event:
-                    event["created_at"] = event["created_at"].isoformat()
+                serialize_event(event)
             return event
         except Exception as ex:
             logging.exception("Error fetching event by ID, %s", ex)
@@ -270,7 +305,7 @@ class Event:
             return False, "Event is full"
 
         # Get participant details
-        participant = self.user_model.get_user_by_enrollment(
+        participant = self.user_model.get_user_profile(
             enrollment_number
         ) or self.external_participants_collection.find_one(
             {"temp_enrollment": enrollment_number}
@@ -299,12 +334,87 @@ class Event:
             "custom_field_values": custom_field_values,
         }
 
-        self.events_collection.update_one(
-            {"_id": ObjectId(event_id)}, {"$push": {"participants": participant_entry}}
+        result = self.events_writes.update_one(
+            {"_id": ObjectId(event_id)},
+            {"$push": {"participants": participant_entry}, "$inc": {"version": 1}},
         )
+        if result.modified_count:
+            self.analytics.record_registrations(event_id, [participant_entry])
 
         return True, "Successfully registered for event"
 
+    def check_external_team(self, event_id, members):
+        """Check that a team could register right now, before any account is
+        created for it. register_external_team re-checks seats atomically.
+        """
+        event = self.get_event_by_id(event_id)
+        if not event:
+            return False, "Event not found"
+
+        if not event.get("is_approved", False):
+            return False, "Event is not approved yet"
+
+        if len(event["participants"]) + len(members) > int(event["max_participants"]):
+            return False, "Not enough seats left for the whole team"
+
+        for member in members:
+            validation_result = self._validate_custom_field_values(
+                event.get("custom_fields", []), member["custom_field_values"]
+            )
+            if validation_result:
+                return False, f"Missing required field: {validation_result}"
+        return True, ""
+
+    def register_external_team(self, event_id, members):
+        """Register a team of external participants in one atomic update.
+
+        Either every member is added to the event or none is (e.g. when the
+        team no longer fits in the remaining seats).
+        """
+        success, message = self.check_external_team(event_id, members)
+        if not success:
+            return False, message
+
+        registered_at = datetime.now(timezone.utc)
+        entries = [
+            {
+                "enrollment_number": member["temp_enrollment"],
+                "name": member["name"],
+                "amity_email": member["email"],
+                "branch": "",
+                "year": "",
+                "phone_number": member["phone_number"],
+                "registered_at": registered_at,
+                "attendance": False,
+                "custom_field_values": member["custom_field_values"],
+            }
+            for member in members
+        ]
+
+        # Capacity is re-checked inside the update so concurrent registrations
+        # cannot push the event past max_participants
+        result = self.events_writes.update_one(
+            {
+                "_id": ObjectId(event_id),
+                "is_approved": True,
+                "$expr": {
+                    "$lte": [
+                        {"$add": [{"$size": "$participants"}, len(entries)]},
+                        {"$toInt": "$max_participants"},
+                    ]
+                },
+            },
+            {
+                "$push": {"participants": {"$each": entries}},
+                "$inc": {"version": 1},
+            },
+        )
+
+        if result.modified_count:
+            self.analytics.record_registrations(event_id, entries)
+            return True, "Team registered successfully"
+        return False, "Not enough seats left for the whole team"
+
     def _validate_custom_field_values(self, custom_fields, values):
         """Validate that all required custom fields have values"""
         # Check if custom_fields is already in enhanced format
@@ -334,6 +444,7 @@ class Event:
         # Delete the event
         result = self.events_collection.delete_one({"_id": ObjectId(event_id)})
         if result.deleted_count:
+            self.analytics.delete(event_id)
             return True, "Event deleted successfully"
         return False, "Failed to delete event"
 
@@ -355,6 +466,8 @@ class Event:
             "description",
             "prizes",
             "image_url",
+            "image_detail_url",
+            "image_thumbnail_url",
             "custom_slug",
         ]
         duration_fields = ["duration_days", "duration_hours", "duration_minutes"]
@@ -396,7 +509,8 @@ class Event:
 
         # Update the event
         result = self.events_collection.update_one(
-            {"_id": ObjectId(event_id)}, {"$set": update_fields}
+            {"_id": ObjectId(event_id)},
+            {"$set": update_fields, "$inc": {"version": 1}},
         )
 
         if result.modified_count:
@@ -409,21 +523,29 @@ class Event:
             return False, "Event not found"
 
         # Check if user is registered (in either old or new format)
-        is_registered = any(
-            (isinstance(p, dict) and p["enrollment_number"] == user_id)
-            for p in event["participants"]
+        entry = next(
+            (
+                p
+                for p in event["participants"]
+                if isinstance(p, dict) and p["enrollment_number"] == user_id
+            ),
+            None,
         )
 
-        if not is_registered:
+        if not entry:
             return False, "Not registered for this event"
 
         # Remove participant using both formats in one query
-        result = self.events_collection.update_one(
+        result = self.events_writes.update_one(
             {"_id": ObjectId(event_id)},
-            {"$pull": {"participants": {"enrollment_number": user_id}}},
+            {
+                "$pull": {"participants": {"enrollment_number": user_id}},
+                "$inc": {"version": 1},
+            },
         )
 
         if result.modified_count:
+            self.analytics.record_unregistration(event_id, entry)
             # If external participant, remove from external_participants collection
             if user_id.startswith("EXT"):
                 from app.models.external_participant import ExternalParticipant
@@ -434,268 +556,276 @@ class Event:
         return False, "Failed to unregister"
 
     def get_registered_events(self, user_id):
-        # Query for both old and new format
-        events = list(
-            self.events_collection.find(
-                {
-                    "$or": [
-                        {"participants": user_id},  # Old format
-                        {"participants.enrollment_number": user_id},  # New format
-                    ]
-                }
-            )
-        )
+        events = list(self.events_collection.find(registered_query(user_id)))
         for event in events:
-            event["_id"] = str(event["_id"])
-            if "date" in event and not isinstance(event["date"], str):
-                event["date"] = event["date"].isoformat()
-            if "created_at" in event and not isinstance(event["created_at"], str):
-                event["created_at"] = event["created_at"].isoformat()
+            serialize_event(event)
         return events
 
     def get_created_events(self, user_id):
         events = list(self.events_collection.find({"creator_id": user_id}))
         for event in events:
-            event["_id"] = str(event["_id"])
-            if "date" in event and not isinstance(event["date"], str):
-                event["date"] = event["date"].isoformat()
-            if "created_at" in event and not isinstance(event["created_at"], str):
-                event["created_at"] = event["created_at"].isoformat()
+            serialize_event(event)
         return events
 
     def get_event_participants(self, event_id):
-        event = self.get_event_by_id(event_id)
-        if not event:
-            return []
-
-        participants = []
-        for participant_data in event["participants"]:
-            # Handle both old format (string) and new format (dict)
-            if isinstance(participant_data, str):
-                enrollment_number = participant_data
-                registered_at = datetime.now()
-                attendance = False
-                custom_field_values = {}
-            else:
-                enrollment_number = participant_data["enrollment_number"]
-                registered_at = participant_data["registered_at"]
-                attendance = participant_data.get("attendance", False)
-                custom_field_values = participant_data.get("custom_field_values", {})
+        with self._report_session(event_id) as session:
+            return list(self.iter_event_participants(event_id, session=session))
+
+    @contextmanager
+    def _report_session(self, event_id):
+        """A session for reading an event's participants from a secondary.
+
+        The session is causally consistent and starts with a read of the
+        event on the primary, so a secondary answers the reports that
+        follow only once it has caught up with that read: reports (cached
+        by event version) never miss changes made before they were asked for.
+        """
+        client = self.events_collection.database.client
+        with client.start_session(causal_consistency=True) as session:
+            self.events_collection.find_one(
+                {"_id": ObjectId(event_id)}, {"_id": 1}, session=session
+            )
+            yield session
 
-            # First try to get from regular users
-            user = self.user_model.get_user_by_enrollment(enrollment_number)
+    def iter_event_participants(self, event_id, batch_size=500, session=None):
+        """Yield an event's participants with current user details.
 
-            # If not found, try to get from external participants
-            if not user and enrollment_number.startswith("EXT"):
-                from app.models.external_participant import ExternalParticipant
+        The participant array is unwound and joined with users and external
+        participants inside MongoDB, so rows arrive in cursor batches instead
+        of the whole list (plus one query per participant) being built in
+        memory.
+        """
+        try:
+            event_oid = ObjectId(event_id)
+        except Exception:
+            return
+
+        pipeline = [
+            {"$match": {"_id": event_oid}},
+            {"$project": {"participant": "$participants"}},
+            {"$unwind": "$participant"},
+            # Old format stores the enrollment number string directly
+            {
+                "$project": {
+                    "_id": 0,
+                    "enrollment_number": {
+                        "$ifNull": ["$participant.enrollment_number", "$participant"]
+                    },
+                    "registered_at": "$participant.registered_at",
+                    "attendance": {"$ifNull": ["$participant.attendance", False]},
+                    "custom_field_values": {
+                        "$ifNull": ["$participant.custom_field_values", {}]
+                    },
+                }
+            },
+            {
+                "$lookup": {
+                    "from": "users",
+                    "localField": "enrollment_number",
+                    "foreignField": "enrollment_number",
+                    "as": "user",
+                }
+            },
+            {
+                "$lookup": {
+                    "from": "external_participants",
+                    "localField": "enrollment_number",
+                    "foreignField": "temp_enrollment",
+                    "as": "external",
+                }
+            },
+            {
+                "$project": {
+                    "enrollment_number": 1,
+                    "registered_at": 1,
+                    "attendance": 1,
+                    "custom_field_values": 1,
+                    "user": {"$arrayElemAt": ["$user", 0]},
+                    "external": {"$arrayElemAt": ["$external", 0]},
+                }
+            },
+            {"$project": {"user.password": 0, "external.password": 0}},
+        ]
 
-                external_model = ExternalParticipant(self.mongo)
-                user = external_model.get_by_temp_enrollment(enrollment_number)
-                if user:
+        for row in self.events_reads.aggregate(
+            pipeline, batchSize=batch_size, session=session
+        ):
+            user = row.get("user")
+            # If not found, try to get from external participants
+            if not user and row["enrollment_number"].startswith("EXT"):
+                external = row.get("external")
+                if external:
                     # Format external user data to match regular user structure
                     user = {
-                        "name": user["name"],
-                        "enrollment_number": user["temp_enrollment"],
-                        "amity_email": user[
-                            "email"
-                        ],  # Use regular email for external users
+                        "name": external["name"],
+                        "enrollment_number": external["temp_enrollment"],
+                        "amity_email": external["email"],
                         "branch": "External",
                         "year": "-",
-                        "phone_number": user["phone_number"],
+                        "phone_number": external["phone_number"],
                     }
 
             if user:
-                participants.append(
-                    {
-                        "name": user["name"],
-                        "enrollment_number": user["enrollment_number"],
-                        "amity_email": user["amity_email"],
-                        "branch": user["branch"],
-                        "year": user["year"],
-                        "phone_number": user["phone_number"],
-                        "registered_at": registered_at,
-                        "attendance": attendance,
-                        "custom_field_values": custom_field_values,
-                    }
-                )
+                yield {
+                    "name": user["name"],
+                    "enrollment_number": user["enrollment_number"],
+                    "amity_email": user["amity_email"],
+                    "branch": user["branch"],
+                    "year": user["year"],
+                    "phone_number": user["phone_number"],
+                    "registered_at": row.get("registered_at") or datetime.now(),
+                    "attendance": row["attendance"],
+                    "custom_field_values": row["custom_field_values"],
+                }
 
-        return participants
+    def get_custom_field_names(self, event_id, session=None):
+        """Names of every custom field any participant has filled in, sorted"""
+        pipeline = [
+            {"$match": {"_id": ObjectId(event_id)}},
+            {"$unwind": "$participants"},
+            {
+                "$project": {
+                    "fields": {
+                        "$objectToArray": {
+                            "$ifNull": ["$participants.custom_field_values", {}]
+                        }
+                    }
+                }
+            },
+            {"$unwind": "$fields"},
+            {"$group": {"_id": "$fields.k"}},
+        ]
+        return sorted(
+            row["_id"] for row in self.events_reads.aggregate(pipeline, session=session)
+        )
 
     def generate_pdf_report(self, event_id, fields_printed=None):
         """Generate PDF report of participants with selected fields"""
-        participants = self.get_event_participants(event_id)
-        if not participants:
-            return None
-
-        # Define all possible fields and their display names
-        all_fields = {
-            "name": "Name",
-            "enrollment_number": "Enrollment Number",
-            "amity_email": "Amity Email",
-            "phone_number": "Phone Number",
-            "branch": "Branch",
-            "year": "Year",
-            "registered_at": "Registration Date",
-            "attendance": "Attendance Status",
-        }
-
-        # Add custom fields to all_fields if they exist in any participant
-        custom_fields = set()
-        for participant in participants:
-            if participant.get("custom_field_values"):
-                custom_fields.update(participant["custom_field_values"].keys())
-
-        for field in custom_fields:
-            all_fields[f"custom_{field}"] = field
-
-        # Parse fields_printed from comma-separated string
-        selected_fields = (
-            fields_printed.split(",") if fields_printed else list(all_fields.keys())
-        )
-
-        # Create PDF
-        pdf = PDF("P", "mm", "A4")
-        pdf.add_page()
-        pdf.set_font("Arial", "B", 16)
-
-        # Get event details
-        event = self.get_event_by_id(event_id)
+        with self._report_session(event_id) as session:
+            event = self.events_reads.find_one(
+                {"_id": ObjectId(event_id)},
+                {"name": 1, "date": 1, "venue": 1, "max_participants": 1},
+                session=session,
+            )
+            participant_count = self.get_participant_count(event_id, session)
+            if not event or not participant_count:
+                return None
 
-        # Event Title
-        pdf.set_font("Arial", "B", 24)
-        pdf.set_text_color(79, 70, 229)  # Indigo-600
-        pdf.cell(0, 15, event["name"], align="C", ln=True)
+            labels, selected_fields = self._report_columns(
+                event_id, fields_printed, require_enrollment=False, session=session
+            )
+            rows = (
+                [
+                    str(self._report_value(participant, field))
+                    for field in selected_fields
+                ]
+                for participant in self.iter_event_participants(
+                    event_id, session=session
+                )
+            )
+            rows_path = report_pool.write_rows(rows)
 
-        # Format date
-        if isinstance(event["date"], str):
-            try:
-                event_date = datetime.strptime(event["date"], "%Y-%m-%dT%H:%M:%S.%f")
-            except ValueError:
-                try:
-                    event_date = datetime.strptime(event["date"], "%Y-%m-%dT%H:%M:%S")
-                except ValueError:
-                    event_date = datetime.now()  # fallback
-        else:
-            event_date = event["date"]
-
-        formatted_date = event_date.strftime("%B %d, %Y at %I:%M %p")
-
-        # Event Info Box
-        pdf.set_fill_color(243, 244, 246)  # Gray-100
-        pdf.set_draw_color(229, 231, 235)  # Gray-200
-
-        info_box_y = pdf.get_y() + 5
-        info_box_height = 25
-        pdf.rect(15, info_box_y, pdf.w - 30, info_box_height, "DF")
-
-        # Info text
-        pdf.set_font("Arial", "", 10)
-        pdf.set_text_color(55, 65, 81)  # Gray-700
-
-        # Calculate widths for three columns
-        col_width = (pdf.w - 30) / 3
-
-        pdf.set_xy(15, info_box_y + 5)
-        pdf.set_font("Arial", "B", 10)
-        pdf.cell(col_width, 5, "Date & Time:", align="C")
-        pdf.set_font("Arial", "", 10)
-        pdf.set_xy(15, info_box_y + 12)
-        pdf.cell(col_width, 5, formatted_date, align="C")
-
-        pdf.set_xy(15 + col_width, info_box_y + 5)
-        pdf.set_font("Arial", "B", 10)
-        pdf.cell(col_width, 5, "Venue:", align="C")
-        pdf.set_font("Arial", "", 10)
-        pdf.set_xy(15 + col_width, info_box_y + 12)
-        pdf.cell(col_width, 5, event["venue"], align="C")
-
-        pdf.set_xy(15 + 2 * col_width, info_box_y + 5)
-        pdf.set_font("Arial", "B", 10)
-        pdf.cell(col_width, 5, "Participants:", align="C")
-        pdf.set_font("Arial", "", 10)
-        pdf.set_xy(15 + 2 * col_width, info_box_y + 12)
-        pdf.cell(
-            col_width,
-            5,
-            f"{len(participants)} / {event['max_participants']}",
-            align="C",
+        # Render in the report process pool so layout work does not hold this
+        # worker's GIL; only the spooled plain rows cross the process boundary
+        try:
+            event = {key: value for key, value in event.items() if key != "_id"}
+            output_path = report_pool.run_in_pool(
+                report_pool.render_pdf_file,
+                event,
+                participant_count,
+                labels,
+                selected_fields,
+                rows_path,
+                suffix=".pdf",
+            )
+        finally:
+            os.remove(rows_path)
+        return report_pool.open_and_unlink(output_path)
+
+    def get_participant_count(self, event_id, session=None):
+        result = list(
+            self.events_reads.aggregate(
+                [
+                    {"$match": {"_id": ObjectId(event_id)}},
+                    {"$project": {"count": {"$size": "$participants"}}},
+                ],
+                session=session,
+            )
         )
+        return result[0]["count"] if result else 0
 
-        # Participants List Header
-        pdf.ln(35)
-        pdf.set_font("Arial", "B", 14)
-        pdf.set_text_color(31, 41, 55)  # Gray-800
-        pdf.cell(0, 10, "Participants List", ln=True)
-
-        # Table headers
-        pdf.set_fill_color(249, 250, 251)  # Gray-50
-        pdf.set_font("Arial", "B", 10)
-
-        # Calculate column widths
-        col_widths = []
-        total_width = pdf.w - 30
-
-        for field in selected_fields:
-            if field == "enrollment_number":
-                col_widths.append(total_width * 0.15)
-            elif field == "name":
-                col_widths.append(total_width * 0.2)
-            elif field == "amity_email":
-                col_widths.append(total_width * 0.25)
-            else:
-                col_widths.append(total_width * 0.15)
-
-        # Draw headers
-        pdf.set_x(15)
-        for i, field in enumerate(selected_fields):
-            pdf.cell(col_widths[i], 10, all_fields[field], 1, 0, "L", True)
-        pdf.ln()
-
-        # Table data
-        pdf.set_font("Arial", "", 10)
-        pdf.set_fill_color(255, 255, 255)  # White
-
-        for i, participant in enumerate(participants):
-            if pdf.get_y() + 10 > pdf.page_break_trigger:
-                pdf.add_page()
-                # Redraw headers
-                pdf.set_font("Arial", "B", 10)
-                pdf.set_x(15)
-                for j, field in enumerate(selected_fields):
-                    pdf.cell(col_widths[j], 10, all_fields[field], 1, 0, "L", True)
-                pdf.ln()
-                pdf.set_font("Arial", "", 10)
-
-            pdf.set_x(15)
-            for j, field in enumerate(selected_fields):
-                if field.startswith("custom_"):
-                    # Handle custom field values
-                    custom_field = field[7:]  # Remove 'custom_' prefix
-                    value = participant.get("custom_field_values", {}).get(
-                        custom_field, "-"
-                    )
-                else:
-                    value = participant[field]
-
-                if field == "registered_at":
-                    value = value.strftime("%d/%m/%Y %I:%M %p")
-                elif field == "attendance":
-                    value = "Present" if value else "Absent"
-
-                pdf.cell(col_widths[j], 10, str(value), 1, 0, "L", i % 2 == 0)
-            pdf.ln()
+    def generate_excel_report(self, event_id, fields_printed=None):
+        """Generate Excel report of participants with selected fields.
+
+        Rows are streamed from the database into a spool file and the
+        workbook is written by the report process pool in xlsxwriter's
+        constant_memory mode, so memory stays flat regardless of the number
+        of participants and rendering does not hold this worker's GIL.
+        """
+        count = 0
+
+        def numbered_rows(session):
+            nonlocal count
+            for count, participant in enumerate(
+                self.iter_event_participants(event_id, session=session), 1
+            ):
+                yield [count] + [
+                    self._report_value(participant, field) for field in selected_fields
+                ]
 
-        buffer = BytesIO()
-        pdf.output(buffer)
-        buffer.seek(0)
-        return buffer
+        with self._report_session(event_id) as session:
+            labels, selected_fields = self._report_columns(
+                event_id, fields_printed, session=session
+            )
+            headers = ["No."] + labels
+            rows_path = report_pool.write_rows(numbered_rows(session))
+        try:
+            if count == 0:
+                return None
+            output_path = report_pool.run_in_pool(
+                report_pool.render_excel_file, headers, rows_path, suffix=".xlsx"
+            )
+        finally:
+            os.remove(rows_path)
+        return report_pool.open_and_unlink(output_path)
+
+    def generate_csv_report(self, event_id, fields_printed=None, batch_rows=200):
+        """Yield a CSV report of participants in chunks of batch_rows rows.
+
+        Uses the same columns as the Excel report and reads rows straight
+        from the database cursor, so the first chunk is produced immediately
+        and memory does not grow with the event size.
+        """
+        with self._report_session(event_id) as session:
+            labels, selected_fields = self._report_columns(
+                event_id, fields_printed, session=session
+            )
+            headers = ["No."] + labels
+
+            buffer = StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(headers)
+
+            participants = self.iter_event_participants(event_id, session=session)
+            for row, participant in enumerate(participants, 1):
+                writer.writerow(
+                    [row]
+                    + [
+                        self._report_value(participant, field)
+                        for field in selected_fields
+                    ]
+                )
+                if row % batch_rows == 0:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
 
-    def generate_excel_report(self, event_id, fields_printed=None):
-        """Generate Excel report of participants with selected fields"""
-        participants = self.get_event_participants(event_id)
-        if not participants:
-            return None
+        yield buffer.getvalue()
 
+    def _report_columns(
+        self, event_id, fields_printed=None, require_enrollment=True, session=None
+    ):
+        """Return (column labels, selected_fields) for participant reports"""
         # Define all possible fields and their display names
         all_fields = {
             "name": "Name",
@@ -709,12 +839,7 @@ class Event:
         }
 
         # Add custom fields
-        custom_fields = set()
-        for participant in participants:
-            if participant.get("custom_field_values"):
-                custom_fields.update(participant["custom_field_values"].keys())
-
-        for field in custom_fields:
+        for field in self.get_custom_field_names(event_id, session):
             all_fields[f"custom_{field}"] = field
 
         # Parse fields_printed from comma-separated string
@@ -723,87 +848,237 @@ class Event:
         )
 
         # Always include enrollment_number if not already included
-        if "enrollment_number" not in selected_fields:
+        if require_enrollment and "enrollment_number" not in selected_fields:
             selected_fields.insert(0, "enrollment_number")
 
-        output = BytesIO()
-        workbook = xlsxwriter.Workbook(output)
-        worksheet = workbook.add_worksheet()
-
-        # Write headers
-        headers = ["No."] + [all_fields[field] for field in selected_fields]
-        for col, header in enumerate(headers):
-            worksheet.write(0, col, header)
-
-        # Write data
-        for row, participant in enumerate(participants, 1):
-            worksheet.write(row, 0, row)  # Write row number
-            for col, field in enumerate(selected_fields, 1):
-                if field.startswith("custom_"):
-                    # Handle custom field values
-                    custom_field = field[7:]  # Remove 'custom_' prefix
-                    value = participant.get("custom_field_values", {}).get(
-                        custom_field, "-"
-                    )
-                else:
-                    value = participant[field]
-
-                if field == "registered_at":
-                    value = value.strftime("%d/%m/%Y %I:%M %p")
-                elif field == "attendance":
-                    value = "Present" if value else "Absent"
-
-                worksheet.write(row, col, value)
+        labels = [
+            all_fields.get(field, field[7:] if field.startswith("custom_") else field)
+            for field in selected_fields
+        ]
+        return labels, selected_fields
+
+    def _report_value(self, participant, field):
+        """Format one participant field for PDF/Excel/CSV reports"""
+        if field.startswith("custom_"):
+            # Handle custom field values
+            custom_field = field[7:]  # Remove 'custom_' prefix
+            value = participant.get("custom_field_values", {}).get(custom_field, "-")
+        else:
+            value = participant[field]
 
-        workbook.close()
-        output.seek(0)
-        return output
+        if field == "registered_at":
+            value = value.strftime("%d/%m/%Y %I:%M %p")
+        elif field == "attendance":
+            value = "Present" if value else "Absent"
+        return value
 
     def mark_attendance(self, event_id, enrollment_number, status):
         """Mark attendance for a participant"""
-        result = self.events_collection.update_one(
+        result = self.events_writes.update_one(
             {
                 "_id": ObjectId(event_id),
-                "participants.enrollment_number": enrollment_number,
+                "participants": {
+                    "$elemMatch": {
+                        "enrollment_number": enrollment_number,
+                        "attendance": {"$ne": True} if status else True,
+                    }
+                },
             },
-            {"$set": {"participants.$.attendance": status}},
+            {"$set": {"participants.$.attendance": status}, "$inc": {"version": 1}},
         )
 
         if result.modified_count:
+            self.analytics.record_attendance(event_id, 1 if status else -1)
             return True, "Attendance marked successfully"
         return False, "Failed to mark attendance"
 
     def get_events_by_code(self, event_code):
         """Get all events with matching event code"""
         events = list(
-            self.events_collection.find(
-                {"event_code": event_code, "allow_external": True}
-            )
+            self.events_reads.find({"event_code": event_code, "allow_external": True})
         )
 
         for event in events:
-            event["_id"] = str(event["_id"])
-            if "date" in event and not isinstance(event["date"], str):
-                event["date"] = event["date"].isoformat()
-            if "created_at" in event and not isinstance(event["created_at"], str):
-                event["created_at"] = event["created_at"].isoformat()
+            serialize_event(event)
         return events
 
     def mark_batch_attendance(self, event_id, attendance_data):
-        """Mark attendance for multiple participants at once"""
+        """Mark attendance for multiple participants in a single atomic update.
+
+        Returns (success, message, results) where results holds one
+        {"enrollment_number", "attendance", "matched"} entry per record.
+        When a participant appears more than once the last record wins.
+        """
+        attendance = {}
+        for record in attendance_data:
+            if record.get("enrollment_number"):
+                attendance[record["enrollment_number"]] = bool(record.get("attendance"))
+
+        present = [number for number, status in attendance.items() if status]
+        absent = [number for number, status in attendance.items() if not status]
+        update = {}
+        array_filters = []
+        if present:
+            update["participants.$[present].attendance"] = True
+            array_filters.append({"present.enrollment_number": {"$in": present}})
+        if absent:
+            update["participants.$[absent].attendance"] = False
+            array_filters.append({"absent.enrollment_number": {"$in": absent}})
+
         try:
-            for record in attendance_data:
-                self.events_collection.update_one(
+            before = None
+            if update:
+                # The pre-update participant states tell which records matched
+                # and how the attended count changed, without a second read
+                before = self.events_writes.find_one_and_update(
                     {
                         "_id": ObjectId(event_id),
-                        "participants.enrollment_number": record["enrollment_number"],
+                        "participants.enrollment_number": {"$in": list(attendance)},
+                    },
+                    {"$set": update, "$inc": {"version": 1}},
+                    projection={
+                        "participants.enrollment_number": 1,
+                        "participants.attendance": 1,
                     },
-                    {"$set": {"participants.$.attendance": record["attendance"]}},
+                    array_filters=array_filters,
+                    return_document=ReturnDocument.BEFORE,
                 )
-            return True, "Attendance marked successfully"
         except Exception as e:
             print(f"Error marking batch attendance: {str(e)}")
-            return False, "Failed to mark attendance"
+            return False, "Failed to mark attendance", []
+
+        previous = {
+            p["enrollment_number"]: p.get("attendance") is True
+            for p in (before or {}).get("participants", [])
+            if isinstance(p, dict) and p.get("enrollment_number") in attendance
+        }
+        self.analytics.record_attendance(
+            event_id,
+            sum(
+                (1 if status else -1)
+                for number, status in attendance.items()
+                if number in previous and previous[number] != status
+            ),
+        )
+
+        results = [
+            {
+                "enrollment_number": record.get("enrollment_number"),
+                "attendance": bool(record.get("attendance")),
+                "matched": record.get("enrollment_number") in previous,
+            }
+            for record in attendance_data
+        ]
+        matched = sum(1 for result in results if result["matched"])
+        return (
+            True,
+            f"Attendance marked for {matched} of {len(results)} participants",
+            results,
+        )
+
+    def record_checkins(self, event_id, checkins):
+        """Mark scanned participants present, keeping the earliest scan.
+
+        checkins is a list of {"enrollment_number", "scanned_at",
+        "device_id"}. A participant's checked_in_at/checked_in_device only
+        move to an earlier scan (first scan wins), so replaying or
+        re-uploading scans is harmless. Attendance and scan times are sent
+        as two unordered bulk_writes; the attended count in the analytics
+        rollup follows the first one's result. Returns
+        {enrollment_number: status} with status "checked_in",
+        "already_checked_in" or "not_registered".
+        """
+        earliest = {}
+        for checkin in checkins:
+            number = checkin["enrollment_number"]
+            if number not in earliest or checkin["scanned_at"] < earliest[number][0]:
+                earliest[number] = (checkin["scanned_at"], checkin.get("device_id"))
+
+        event = self.events_collection.find_one(
+            {"_id": ObjectId(event_id)},
+            {
+                "participants.enrollment_number": 1,
+                "participants.attendance": 1,
+                "participants.checked_in_at": 1,
+            },
+        )
+        current = {
+            p["enrollment_number"]: p
+            for p in (event or {}).get("participants", [])
+            if isinstance(p, dict) and p.get("enrollment_number") in earliest
+        }
+
+        statuses = {}
+        attend_operations = []
+        operations = []
+        for number, (scanned_at, device_id) in earliest.items():
+            participant = current.get(number)
+            if participant is None:
+                statuses[number] = "not_registered"
+                continue
+            checked_in_at = participant.get("checked_in_at")
+            if checked_in_at is not None and checked_in_at <= scanned_at:
+                statuses[number] = "already_checked_in"
+                continue
+
+            statuses[number] = (
+                "already_checked_in"
+                if participant.get("attendance") is True
+                else "checked_in"
+            )
+            if participant.get("attendance") is not True:
+                # Only modifies the document if no one else has marked the
+                # participant present since the read above
+                attend_operations.append(
+                    UpdateOne(
+                        {
+                            "_id": ObjectId(event_id),
+                            "participants": {
+                                "$elemMatch": {
+                                    "enrollment_number": number,
+                                    "attendance": {"$ne": True},
+                                }
+                            },
+                        },
+                        {
+                            "$set": {"participants.$.attendance": True},
+                            "$inc": {"version": 1},
+                        },
+                    )
+                )
+            # The scan time is re-checked in the array filter so a concurrent
+            # earlier scan is never overwritten by a later one
+            operations.append(
+                UpdateOne(
+                    {"_id": ObjectId(event_id)},
+                    {
+                        "$set": {
+                            "participants.$[p].checked_in_at": scanned_at,
+                            "participants.$[p].checked_in_device": device_id,
+                        },
+                        "$inc": {"version": 1},
+                    },
+                    array_filters=[
+                        {
+                            "p.enrollment_number": number,
+                            "$or": [
+                                {"p.checked_in_at": {"$exists": False}},
+                                {"p.checked_in_at": {"$gt": scanned_at}},
+                            ],
+                        }
+                    ],
+                )
+            )
+
+        if attend_operations:
+            # Count the check-ins this write made, not the ones the read
+            # predicted: two devices syncing the same participants at once
+            # would otherwise both count them
+            result = self.events_writes.bulk_write(attend_operations, ordered=False)
+            self.analytics.record_attendance(event_id, result.modified_count)
+        if operations:
+            self.events_writes.bulk_write(operations, ordered=False)
+        return statuses
 
     def get_custom_field_schema(self, event_id):
         """Get the custom field schema for an event"""
@@ -849,12 +1124,15 @@ class Event:
         if validation_result:
             return False, f"Missing required field: {validation_result}"
 
-        result = self.events_collection.update_one(
+        result = self.events_writes.update_one(
             {
                 "_id": ObjectId(event_id),
                 "participants.enrollment_number": enrollment_number,
             },
-            {"$set": {"participants.$.custom_field_values": custom_field_values}},
+            {
+                "$set": {"participants.$.custom_field_values": custom_field_values},
+                "$inc": {"version": 1},
+            },
         )
 
         if result.modified_count:
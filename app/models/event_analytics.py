@@ -0,0 +1,257 @@
+from datetime import datetime, timezone
+from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+from app.utils.live_updates import broker, snapshot_from
+
+# Bucket used when a participant has no branch/year/registration date
+UNKNOWN = "Unknown"
+
+
+def _key(value):
+    """Make a breakdown value safe to use as a MongoDB field name"""
+    value = str(value).strip() if value is not None else ""
+    if not value:
+        return UNKNOWN
+    return value.replace(".", "_").replace("$", "_")
+
+
+def _day(value):
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d")
+    return UNKNOWN
+
+
+def _breakdown(enrollment_number, branch, year, registered_at):
+    """Return the (day, branch, year) buckets a participant is counted in"""
+    if str(enrollment_number).startswith("EXT"):
+        # Match how reports label external participants
+        return _day(registered_at), "External", "-"
+    return _day(registered_at), _key(branch), _key(year)
+
+
+class EventAnalytics:
+    """Per-event rollup of registrations and attendance.
+
+    One document per event holds running counters that the Event model
+    adjusts with $inc as participants register, leave and get their
+    attendance marked, so reading analytics never scans the participants.
+    Counters can drift if a process dies between the event write and the
+    rollup write; rebuild() recomputes them from the events collection.
+    """
+
+    def __init__(self, mongo):
+        self.mongo = mongo
+        self.collection = self.mongo.db.event_analytics
+
+    def record_registrations(self, event_id, entries):
+        """Count newly registered participant entries"""
+        inc = {"registrations": 0, "attended": 0}
+        for entry in entries:
+            day, branch, year = _breakdown(
+                entry.get("enrollment_number"),
+                entry.get("branch"),
+                entry.get("year"),
+                entry.get("registered_at"),
+            )
+            inc["registrations"] += 1
+            inc["attended"] += 1 if entry.get("attendance") else 0
+            for path in (f"by_day.{day}", f"by_branch.{branch}", f"by_year.{year}"):
+                inc[path] = inc.get(path, 0) + 1
+        self._inc(event_id, inc)
+
+    def record_unregistration(self, event_id, entry):
+        """Remove a participant entry that was pulled from the event"""
+        day, branch, year = _breakdown(
+            entry.get("enrollment_number"),
+            entry.get("branch"),
+            entry.get("year"),
+            entry.get("registered_at"),
+        )
+        self._inc(
+            event_id,
+            {
+                "registrations": -1,
+                "attended": -1 if entry.get("attendance") else 0,
+                f"by_day.{day}": -1,
+                f"by_branch.{branch}": -1,
+                f"by_year.{year}": -1,
+            },
+        )
+
+    def record_attendance(self, event_id, delta):
+        """Adjust the attended count by the number of participants that changed"""
+        if delta:
+            self._inc(event_id, {"attended": delta})
+
+    def _inc(self, event_id, inc):
+        # Every change bumps the rollup version; live streams use it to tell
+        # new counts from ones they have already sent
+        projection = {"registrations": 1, "attended": 1, "version": 1}
+        rollup = self.collection.find_one_and_update(
+            {"_id": ObjectId(event_id)},
+            {
+                "$inc": dict(inc, version=1),
+                "$set": {"updated_at": datetime.now(timezone.utc)},
+            },
+            projection=projection,
+            return_document=ReturnDocument.AFTER,
+        )
+        if rollup is None:
+            # No rollup yet (e.g. an event older than analytics): deltas alone
+            # would be wrong, so build it from the event, which already
+            # includes this change
+            self.rebuild(event_id)
+            rollup = self.collection.find_one({"_id": ObjectId(event_id)}, projection)
+        broker.publish(str(event_id), snapshot_from(rollup or {}))
+
+    def snapshot(self, event_id):
+        """Current registration/attendance counts and rollup version"""
+        rollup = self.collection.find_one(
+            {"_id": ObjectId(event_id)},
+            {"registrations": 1, "attended": 1, "version": 1},
+        )
+        if rollup is None:
+            self.rebuild(event_id)
+            rollup = self.collection.find_one({"_id": ObjectId(event_id)}) or {}
+        return snapshot_from(rollup)
+
+    def delete(self, event_id):
+        self.collection.delete_one({"_id": ObjectId(event_id)})
+
+    def get(self, event_id):
+        """Return the analytics summary for an event, building it on first use"""
+        rollup = self.collection.find_one({"_id": ObjectId(event_id)})
+        if rollup is None:
+            self.rebuild(event_id)
+            rollup = self.collection.find_one({"_id": ObjectId(event_id)}) or {}
+
+        registrations = rollup.get("registrations", 0)
+        attended = rollup.get("attended", 0)
+        updated_at = rollup.get("updated_at")
+        return {
+            "event_id": str(event_id),
+            "registrations": registrations,
+            "attended": attended,
+            "attendance_rate": (
+                round(attended / registrations, 4) if registrations else 0
+            ),
+            "registrations_per_day": [
+                {"date": day, "count": count}
+                for day, count in sorted(rollup.get("by_day", {}).items())
+                if count > 0
+            ],
+            "branches": _positive(rollup.get("by_branch", {})),
+            "years": _positive(rollup.get("by_year", {})),
+            "updated_at": updated_at.isoformat() if updated_at else None,
+        }
+
+    def rebuild(self, event_id=None):
+        """Recompute rollups from the events collection.
+
+        Rebuilds a single event when event_id is given, otherwise every
+        event. Returns the number of rollup documents written.
+        """
+        match = {"_id": ObjectId(event_id)} if event_id else {}
+        pipeline = [
+            {"$match": match},
+            {"$project": {"participant": "$participants"}},
+            {"$unwind": "$participant"},
+            {
+                "$project": {
+                    # Old events stored bare enrollment numbers
+                    "enrollment_number": {
+                        "$ifNull": ["$participant.enrollment_number", "$participant"]
+                    },
+                    "branch": "$participant.branch",
+                    "year": "$participant.year",
+                    "registered_at": "$participant.registered_at",
+                    "attendance": "$participant.attendance",
+                }
+            },
+            {
+                "$lookup": {
+                    "from": "users",
+                    "localField": "enrollment_number",
+                    "foreignField": "enrollment_number",
+                    "as": "user",
+                }
+            },
+            {"$unwind": {"path": "$user", "preserveNullAndEmptyArrays": True}},
+            {
+                "$group": {
+                    "_id": {
+                        "event_id": "$_id",
+                        "external": {
+                            "$eq": [{"$substrCP": ["$enrollment_number", 0, 3]}, "EXT"]
+                        },
+                        "day": {
+                            "$dateToString": {
+                                "format": "%Y-%m-%d",
+                                "date": "$registered_at",
+                            }
+                        },
+                        "branch": {"$ifNull": ["$branch", "$user.branch"]},
+                        "year": {"$ifNull": ["$year", "$user.year"]},
+                    },
+                    "registrations": {"$sum": 1},
+                    "attended": {
+                        "$sum": {"$cond": [{"$eq": ["$attendance", True]}, 1, 0]}
+                    },
+                }
+            },
+        ]
+
+        rollups = {}
+        for group in self.mongo.db.events.aggregate(pipeline):
+            key = group["_id"]
+            rollup = rollups.setdefault(key["event_id"], _empty_rollup())
+            if key.get("external"):
+                branch, year = "External", "-"
+            else:
+                branch, year = _key(key.get("branch")), _key(key.get("year"))
+            day = key.get("day") or UNKNOWN
+            count = group["registrations"]
+            rollup["registrations"] += count
+            rollup["attended"] += group["attended"]
+            for field, bucket in (
+                ("by_day", day),
+                ("by_branch", branch),
+                ("by_year", year),
+            ):
+                rollup[field][bucket] = rollup[field].get(bucket, 0) + count
+
+        # Events without participants still get an (empty) rollup
+        event_ids = (
+            [ObjectId(event_id)]
+            if event_id
+            else self.mongo.db.events.distinct("_id", match)
+        )
+        now = datetime.now(timezone.utc)
+        operations = [
+            UpdateOne(
+                {"_id": _id},
+                {
+                    "$set": dict(rollups.get(_id) or _empty_rollup(), updated_at=now),
+                    "$inc": {"version": 1},
+                },
+                upsert=True,
+            )
+            for _id in event_ids
+        ]
+        if operations:
+            self.collection.bulk_write(operations, ordered=False)
+        return len(operations)
+
+
+def _empty_rollup():
+    return {
+        "registrations": 0,
+        "attended": 0,
+        "by_day": {},
+        "by_branch": {},
+        "by_year": {},
+    }
+
+
+def _positive(counts):
+    return {key: count for key, count in sorted(counts.items()) if count > 0}
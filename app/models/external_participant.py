@@ -1,6 +1,11 @@
 from datetime import datetime, timezone
 import string
 import random
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from app.utils.id_allocator import temp_enrollment_allocator
+
+# Attempts made with a fresh temp enrollment when an insert hits a duplicate
+MAX_INSERT_ATTEMPTS = 5
 
 
 class ExternalParticipant:
@@ -9,8 +14,8 @@ class ExternalParticipant:
         self.collection = self.mongo.db.external_participants
 
     def generate_temp_credentials(self):
-        # Generate temporary enrollment number with 'EXT' prefix
-        temp_id = "EXT" + "".join(random.choices(string.digits, k=8))
+        # Allocate a unique temporary enrollment number with 'EXT' prefix
+        temp_id = temp_enrollment_allocator(self.mongo).next_id()
         # Generate temporary password
         temp_password = "".join(
             random.choices(string.ascii_letters + string.digits, k=8)
@@ -28,9 +33,66 @@ class ExternalParticipant:
             "created_at": datetime.now(timezone.utc),
             "is_external": True,
         }
-        result = self.collection.insert_one(participant)
+        for attempt in range(MAX_INSERT_ATTEMPTS):
+            try:
+                result = self.collection.insert_one(participant)
+                break
+            except DuplicateKeyError:
+                if attempt == MAX_INSERT_ATTEMPTS - 1:
+                    raise
+                participant.pop("_id", None)
+                participant["temp_enrollment"] = temp_enrollment_allocator(
+                    self.mongo
+                ).next_id()
+        # Callers read back the enrollment number that was finally stored
+        participant_data["temp_enrollment"] = participant["temp_enrollment"]
         return result.inserted_id
 
+    def create_external_participants(self, participants_data, event_code):
+        """Insert several participants (each with a password hash) in one round trip.
+
+        Members whose temp enrollment collides are retried with a fresh one and
+        participants_data is updated in place with the stored values.
+        """
+        created_at = datetime.now(timezone.utc)
+        participants = [
+            {
+                "name": data["name"],
+                "email": data["email"],
+                "phone_number": data["phone_number"],
+                "temp_enrollment": data["temp_enrollment"],
+                "password": data["password_hash"],
+                "event_code": event_code,
+                "created_at": created_at,
+                "is_external": True,
+            }
+            for data in participants_data
+        ]
+        pending = participants
+        for attempt in range(MAX_INSERT_ATTEMPTS):
+            try:
+                self.collection.insert_many(pending, ordered=False)
+                break
+            except BulkWriteError as ex:
+                errors = ex.details.get("writeErrors", [])
+                if attempt == MAX_INSERT_ATTEMPTS - 1 or any(
+                    error.get("code") != 11000 for error in errors
+                ):
+                    raise
+                pending = [pending[error["index"]] for error in errors]
+                for participant in pending:
+                    participant.pop("_id", None)
+                    participant["temp_enrollment"] = temp_enrollment_allocator(
+                        self.mongo
+                    ).next_id()
+
+        for data, participant in zip(participants_data, participants):
+            data["temp_enrollment"] = participant["temp_enrollment"]
+        return [participant["_id"] for participant in participants]
+
+    def delete_by_temp_enrollments(self, temp_enrollments):
+        self.collection.delete_many({"temp_enrollment": {"$in": temp_enrollments}})
+
     def get_by_temp_enrollment(self, temp_enrollment):
         return self.collection.find_one({"temp_enrollment": temp_enrollment})
 
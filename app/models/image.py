@@ -0,0 +1,52 @@
+import hashlib
+from datetime import datetime, timezone
+
+# Bytes read at a time when hashing uploads
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+def hash_file(file):
+    """Return the SHA-256 hex digest of a file object, read in chunks"""
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ImageStore:
+    """Public URLs of uploaded images, keyed by the digest of their content.
+
+    An image whose bytes were uploaded before reuses the stored URLs
+    instead of being processed and uploaded again. Entries are tied to the
+    processing profile they were produced with, so changing the image
+    sizes, format or quality uploads images afresh.
+    """
+
+    def __init__(self, mongo):
+        self.mongo = mongo
+        self.collection = self.mongo.db.images
+
+    def find(self, digest, profile):
+        """Return the stored URLs for an image, or None when it is unknown"""
+        image = self.collection.find_one_and_update(
+            {"_id": digest, "profile": profile},
+            {"$set": {"last_used_at": datetime.now(timezone.utc)}},
+            {"urls": 1},
+        )
+        return image["urls"] if image else None
+
+    def save(self, digest, profile, urls, size=None):
+        now = datetime.now(timezone.utc)
+        self.collection.update_one(
+            {"_id": digest},
+            {
+                "$set": {
+                    "profile": profile,
+                    "urls": urls,
+                    "size": size,
+                    "last_used_at": now,
+                },
+                "$setOnInsert": {"created_at": now},
+            },
+            upsert=True,
+        )
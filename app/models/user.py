@@ -1,7 +1,23 @@
 from datetime import datetime, timezone, timedelta
 import logging
+import re
 import jwt
+from flask import g, has_request_context
+from pymongo import InsertOne
+from pymongo.errors import BulkWriteError
 from config import Config
+from app.utils.cache import TTLCache
+
+AMITY_EMAIL_PATTERN = r"^[a-zA-Z0-9._%+-]+@(s|ch|pb)\.amity\.edu$"
+
+# Fields returned by profile lookups; the password hash is never cached
+PROFILE_PROJECTION = {"password": 0}
+
+_profile_cache = TTLCache(ttl=Config.USER_CACHE_TTL_SECONDS)
+
+
+def is_valid_amity_email(email):
+    return bool(re.match(AMITY_EMAIL_PATTERN, email))
 
 
 class User:
@@ -24,17 +40,87 @@ class User:
         result = self.collection.insert_one(user)
         return result.inserted_id
 
+    def bulk_create_users(self, users):
+        """Insert prepared user documents in one unordered bulk write.
+
+        Returns a dict mapping the index of every document that failed to
+        insert to its error message.
+        """
+        if not users:
+            return {}
+        try:
+            self.collection.bulk_write(
+                [InsertOne(user) for user in users], ordered=False
+            )
+        except BulkWriteError as ex:
+            return {
+                error["index"]: error.get("errmsg", "Insert failed")
+                for error in ex.details.get("writeErrors", [])
+            }
+        return {}
+
+    def find_existing(self, amity_emails, enrollment_numbers):
+        """Return the emails and enrollment numbers that are already registered"""
+        existing = self.collection.find(
+            {
+                "$or": [
+                    {"amity_email": {"$in": list(amity_emails)}},
+                    {"enrollment_number": {"$in": list(enrollment_numbers)}},
+                ]
+            },
+            {"amity_email": 1, "enrollment_number": 1},
+        )
+        emails, enrollments = set(), set()
+        for user in existing:
+            emails.add(user.get("amity_email"))
+            enrollments.add(user.get("enrollment_number"))
+        return emails, enrollments
+
     def get_user_by_email(self, amity_email):
         return self.collection.find_one({"amity_email": amity_email})
 
     def get_user_by_enrollment(self, enrollment_number):
         return self.collection.find_one({"enrollment_number": enrollment_number})
 
+    def get_user_profile(self, enrollment_number):
+        """Get a user without the password hash, memoized per request and cached briefly"""
+        memo = None
+        if has_request_context():
+            memo = g.setdefault("user_profiles", {})
+            if enrollment_number in memo:
+                user = memo[enrollment_number]
+                return dict(user) if user else None
+
+        user = _profile_cache.get(enrollment_number)
+        if user is None:
+            user = self.collection.find_one(
+                {"enrollment_number": enrollment_number}, PROFILE_PROJECTION
+            )
+            if user:
+                _profile_cache.set(enrollment_number, user)
+
+        # The memo and every caller get their own copy, so editing a returned
+        # profile cannot change later lookups
+        if memo is not None:
+            memo[enrollment_number] = dict(user) if user else None
+        return dict(user) if user else None
+
+    def invalidate_profile(self, amity_email=None, enrollment_number=None):
+        """Drop cached profiles after a write to the users collection"""
+        if enrollment_number:
+            _profile_cache.delete(enrollment_number)
+        if amity_email:
+            _profile_cache.delete_where(lambda u: u.get("amity_email") == amity_email)
+        if has_request_context():
+            g.pop("user_profiles", None)
+
     def update_email_verification(self, amity_email, verified=True):
         print("Verifying email", amity_email, verified)
-        return self.collection.update_one(
+        result = self.collection.update_one(
             {"amity_email": amity_email}, {"$set": {"email_verified": verified}}
         )
+        self.invalidate_profile(amity_email=amity_email)
+        return result
 
     def user_exists(self, amity_email=None, enrollment_number=None):
         query = {}
@@ -75,4 +161,5 @@ class User:
         result = self.collection.update_one(
             {"amity_email": email}, {"$set": {"password": password_hash}}
         )
+        self.invalidate_profile(amity_email=email)
         return result.modified_count > 0
@@ -0,0 +1,78 @@
+from bson import ObjectId
+from app.models.event import summarize_participants
+
+
+def init_async_event_routes(event_reader):
+    """Async versions of the busiest read routes in events.py.
+
+    Returns (path pattern, handler) pairs for app.asgi; a handler gets the
+    authenticated user, the path parameters and the token claims, and
+    returns (body, status). Bodies and errors match the Flask routes.
+    """
+
+    async def get_events(current_user, **kwargs):
+        try:
+            # If external participant, show all events with matching code
+            if kwargs.get("is_external"):
+                events = await event_reader.get_events_by_code(kwargs.get("event_code"))
+                # Filter out sensitive data
+                for event in events:
+                    event["participants"] = len(event.get("participants", []))
+                return {"events": events}, 200
+
+            # Get all events, filtering by approval status
+            events = await event_reader.get_all_events(include_pending=False)
+
+            # Filter sensitive data based on whether user is creator
+            summarize_participants(events, current_user)
+            return {"events": events}, 200
+
+        except Exception as e:
+            return {"error": f"Error fetching events: {str(e)}"}, 500
+
+    async def get_event(current_user, event_identifier, **kwargs):
+        try:
+            # Check if event_identifier is a valid ObjectId
+            if ObjectId.is_valid(event_identifier):
+                event_id = event_identifier
+            else:
+                # Otherwise, try to look it up as a custom slug
+                deeplink = await event_reader.find_deeplink({"slug": event_identifier})
+                if not deeplink:
+                    return {"message": "Event not found"}, 404
+
+                event_id = deeplink["event_id"]
+
+            event = await event_reader.get_event_by_id(event_id)
+            if event:
+                # If there's a custom slug for this event, include it in the response
+                deeplink = await event_reader.find_deeplink({"event_id": str(event_id)})
+                if deeplink:
+                    event["custom_slug"] = deeplink["slug"]
+
+                return event, 200
+            return {"message": "Event not found"}, 404
+        except Exception as e:
+            return {"message": f"Error fetching event: {str(e)}"}, 500
+
+    async def get_registered_events(current_user, **kwargs):
+        try:
+            events = await event_reader.get_registered_events(current_user)
+            return {"events": events}, 200
+        except Exception as e:
+            return {"message": f"Error fetching registered events: {str(e)}"}, 500
+
+    async def get_created_events(current_user, **kwargs):
+        try:
+            events = await event_reader.get_created_events(current_user)
+            return {"events": events}, 200
+        except Exception as e:
+            return {"message": f"Error fetching created events: {str(e)}"}, 500
+
+    # Fixed paths come before /events/<event_identifier>, as in Flask
+    return [
+        (r"/api/events", get_events),
+        (r"/api/events/registered", get_registered_events),
+        (r"/api/events/created", get_created_events),
+        (r"/api/events/(?P<event_identifier>[^/]+)", get_event),
+    ]
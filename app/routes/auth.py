@@ -1,12 +1,25 @@
 from flask import Blueprint, request, jsonify
-from app.models.user import User
+from app.models.user import User, is_valid_amity_email
+from app.models.event import Event
 from app.models.external_participant import ExternalParticipant
+from app.utils.auth_middleware import token_required
+from app.utils.concurrency import spawn
 from app.utils.otp import OTPManager
-from app.utils.password import generate_password_hash, check_password_hash
+from app.utils.password import (
+    generate_password_hash,
+    generate_password_hashes,
+    check_password_hash,
+)
+from app.utils.rate_limit import (
+    SlidingWindowLimiter,
+    client_ip,
+    json_field,
+    rate_limited,
+)
 import jwt
+from bson import ObjectId
 from datetime import datetime, timedelta, timezone
 from config import Config
-import re
 
 
 def init_auth_routes(mongo):
@@ -14,14 +27,27 @@ def init_auth_routes(mongo):
     user_model = User(mongo)
     otp_manager = OTPManager(mongo)
     external_participant_model = ExternalParticipant(mongo)
-
-    def is_valid_amity_email(email):
-        return bool(re.match(r"^[a-zA-Z0-9._%+-]+@(s|ch|pb)\.amity\.edu$", email))
+    event_model = Event(mongo)
+
+    limiters = {
+        name: SlidingWindowLimiter(mongo, name, limit, window)
+        for name, (limit, window) in Config.RATE_LIMITS.items()
+    }
+    otp_rules = (
+        (limiters["otp_ip"], client_ip),
+        (limiters["otp_email"], json_field("email")),
+    )
+    login_rules = (
+        (limiters["login_ip"], client_ip),
+        (limiters["login_enrollment"], json_field("enrollment_number")),
+    )
+    external_team_rules = ((limiters["external_team_ip"], client_ip),)
 
     @auth.route("/verify-email", methods=["POST"])
+    @rate_limited(*otp_rules)
     def verify_email():
         data = request.get_json()
-        email = data.get("email")
+        email = data.get("email") if isinstance(data, dict) else None
 
         if not email or not is_valid_amity_email(email):
             return jsonify({"error": "Please provide a valid Amity email address"}), 400
@@ -87,10 +113,15 @@ def init_auth_routes(mongo):
         )
 
     @auth.route("/login", methods=["POST"])
+    @rate_limited(*login_rules)
     def login():
         data = request.get_json()
 
-        if not data or not data.get("enrollment_number") or not data.get("password"):
+        if (
+            not isinstance(data, dict)
+            or not data.get("enrollment_number")
+            or not data.get("password")
+        ):
             return (
                 jsonify({"error": "Enrollment number and password are required"}),
                 400,
@@ -174,6 +205,60 @@ def init_auth_routes(mongo):
             200,
         )
 
+    @auth.route("/admin/import-students", methods=["POST"])
+    @token_required
+    def import_students(current_user, **kwargs):
+        # Only admin can bulk import students
+        if current_user != Config.ADMIN_USER_ID:
+            return jsonify({"error": "Unauthorized access"}), 403
+
+        file = request.files.get("file")
+        if not file or not file.filename:
+            return jsonify({"error": "A CSV or XLSX file is required"}), 400
+
+        # Imported lazily so pandas is only loaded when an import runs
+        from app.utils.student_import import read_students, run_import_job
+
+        try:
+            students = read_students(file, file.filename)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        # Hashing thousands of passwords outlasts the request timeout, so the
+        # import runs in the background; poll the job for its report
+        job_id = mongo.db.import_jobs.insert_one(
+            {
+                "status": "running",
+                "rows": len(students),
+                "created_at": datetime.now(timezone.utc),
+            }
+        ).inserted_id
+        spawn(run_import_job, mongo.db.import_jobs, job_id, user_model, students)
+        return (
+            jsonify(
+                {
+                    "job_id": str(job_id),
+                    "status": "running",
+                    "rows": len(students),
+                }
+            ),
+            202,
+        )
+
+    @auth.route("/admin/import-students/<job_id>", methods=["GET"])
+    @token_required
+    def get_import_job(current_user, job_id, **kwargs):
+        if current_user != Config.ADMIN_USER_ID:
+            return jsonify({"error": "Unauthorized access"}), 403
+        if not ObjectId.is_valid(job_id):
+            return jsonify({"error": "Import job not found"}), 404
+
+        job = mongo.db.import_jobs.find_one({"_id": ObjectId(job_id)})
+        if not job:
+            return jsonify({"error": "Import job not found"}), 404
+        job["job_id"] = str(job.pop("_id"))
+        return jsonify(job), 200
+
     @auth.route("/verify-event-code", methods=["POST"])
     def verify_event_code():
         data = request.get_json()
@@ -228,6 +313,8 @@ def init_auth_routes(mongo):
         _ = external_participant_model.create_external_participant(
             participant_data, event["event_code"], password_hash
         )
+        # A fresh enrollment number is used if the allocated one collided
+        temp_enrollment = participant_data["temp_enrollment"]
 
         # Send credentials via email
         credentials = {"enrollment_number": temp_enrollment, "password": temp_password}
@@ -252,10 +339,142 @@ def init_auth_routes(mongo):
             201,
         )
 
+    @auth.route("/register-external-team", methods=["POST"])
+    @rate_limited(*external_team_rules)
+    def register_external_team():
+        data = request.get_json() or {}
+        members = data.get("members") if isinstance(data, dict) else None
+
+        if not isinstance(members, list) or not members:
+            return jsonify({"error": "At least one team member is required"}), 400
+        if len(members) > Config.EXTERNAL_TEAM_MAX_MEMBERS:
+            return (
+                jsonify(
+                    {
+                        "error": "A team can have at most "
+                        f"{Config.EXTERNAL_TEAM_MAX_MEMBERS} members"
+                    }
+                ),
+                400,
+            )
+
+        required_fields = ["name", "email", "phone_number"]
+        if not all(
+            isinstance(member, dict) and all(member.get(f) for f in required_fields)
+            for member in members
+        ):
+            return (
+                jsonify({"error": "Name, email and phone number are required"}),
+                400,
+            )
+
+        emails = [member["email"].strip().lower() for member in members]
+        if len(set(emails)) != len(emails):
+            return jsonify({"error": "Each team member needs a unique email"}), 400
+
+        # Validate event code and resolve the event the team registers for
+        query = {"event_code": data.get("event_code"), "allow_external": True}
+        if data.get("event_id"):
+            if not ObjectId.is_valid(data["event_id"]):
+                return jsonify({"error": "Invalid event"}), 400
+            query["_id"] = ObjectId(data["event_id"])
+        events = list(mongo.db.events.find(query, {"name": 1, "event_code": 1}))
+
+        if not events:
+            return jsonify({"error": "Invalid event code"}), 400
+        if len(events) > 1:
+            return (
+                jsonify({"error": "Event id is required for this event code"}),
+                400,
+            )
+        event = events[0]
+
+        team = []
+        for member in members:
+            custom_field_values = member.get("custom_field_values") or {}
+            team.append(
+                {
+                    "name": member["name"],
+                    "email": member["email"],
+                    "phone_number": member["phone_number"],
+                    "custom_field_values": custom_field_values
+                    if isinstance(custom_field_values, dict)
+                    else {},
+                }
+            )
+
+        # Check seats and required fields before any credentials are made
+        success, message = event_model.check_external_team(str(event["_id"]), team)
+        if not success:
+            return jsonify({"error": message}), 400
+
+        # Generate temporary credentials and hash them in parallel
+        credentials = [
+            external_participant_model.generate_temp_credentials() for _ in team
+        ]
+        password_hashes = generate_password_hashes(
+            temp_password for _, temp_password in credentials
+        )
+        for member, (temp_enrollment, _), password_hash in zip(
+            team, credentials, password_hashes
+        ):
+            member["temp_enrollment"] = temp_enrollment
+            member["password_hash"] = password_hash
+
+        external_participant_model.create_external_participants(
+            team, event["event_code"]
+        )
+
+        success, message = event_model.register_external_team(str(event["_id"]), team)
+        if not success:
+            # Roll back the accounts so a failed team leaves nothing behind
+            external_participant_model.delete_by_temp_enrollments(
+                [member["temp_enrollment"] for member in team]
+            )
+            return jsonify({"error": message}), 400
+
+        # Send every member their credentials in one batched dispatch
+        recipients = [
+            {
+                "email": member["email"],
+                "name": member["name"],
+                "enrollment_number": member["temp_enrollment"],
+                "password": temp_password,
+            }
+            for member, (_, temp_password) in zip(team, credentials)
+        ]
+
+        from app.utils.mail import MailgunMailer
+
+        mailer = MailgunMailer()
+        mailer.send_external_credentials_batch(event["name"], recipients)
+
+        return (
+            jsonify(
+                {
+                    "message": message,
+                    "event_id": str(event["_id"]),
+                    "members": [
+                        {
+                            "name": r["name"],
+                            "email": r["email"],
+                            "credentials": {
+                                "enrollment_number": r["enrollment_number"],
+                                "password": r["password"],
+                            },
+                        }
+                        for r in recipients
+                    ],
+                }
+            ),
+            201,
+        )
+
     @auth.route("/forgot-password", methods=["POST"])
+    @rate_limited(*otp_rules)
     def forgot_password():
         data = request.get_json()
-        email = data.get("email")
+        email = data.get("email") if isinstance(data, dict) else None
 
         if not email or not is_valid_amity_email(email):
             return jsonify({"error": "Please provide a valid Amity email address"}), 400
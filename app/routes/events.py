@@ -1,17 +1,43 @@
 from datetime import timedelta
-from flask import Blueprint, request, jsonify, send_file
+from flask import (
+    Blueprint,
+    Response,
+    request,
+    jsonify,
+    send_file,
+    stream_with_context,
+)
 from app.utils.auth_middleware import token_required
-from app.models.event import Event
-from app.utils.file_upload import FAILED_FILE_URL, save_image
+from app.models.event import Event, summarize_participants
+from app.utils.file_upload import FAILED_FILE_URL
+from app.utils.multipart import (
+    InvalidUpload,
+    UploadTooLarge,
+    discard_images,
+    parse_image_form,
+)
+from app.utils.image_uploader import ImageUploader
 from dateutil.parser import parse
 from bson import json_util, ObjectId
 import json
 import os
 from app.utils.mail import MailgunMailer
+from app.utils.report_jobs import ReportCache, ReportJobs
+from app.utils.checkin import (
+    CheckinBuffer,
+    checkin_qr_png,
+    issue_checkin_token,
+    parse_offline_checkins,
+    verify_checkin_token,
+)
+from app.models.checkin_log import CheckinLog
+from app.utils.live_updates import broker
+from app.utils.cache import TTLCache
+from app.utils.concurrency import run_blocking, spawn
 from datetime import datetime
 import re
 from config import Config
-from threading import Thread
+import time
 
 mailer = MailgunMailer()
 events_bp = Blueprint("events", __name__)
@@ -19,10 +45,87 @@ events_bp = Blueprint("events", __name__)
 
 def init_event_routes(mongo):
     event_model = Event(mongo)
+    image_uploader = ImageUploader(mongo)
+
+    # Pick up image uploads interrupted by a restart of this machine. Each
+    # worker does so on its first request, after gunicorn forked it, so no
+    # upload thread is started in a preloading master process. The scan runs
+    # in the background so that first request does not wait on it
+    @events_bp.before_app_first_request
+    def resume_pending_uploads():
+        spawn(image_uploader.resume_pending)
+
+    report_jobs = ReportJobs(
+        ReportCache(
+            Config.REPORT_CACHE_DIR,
+            Config.REPORT_CACHE_MAX_BYTES,
+            Config.REPORT_CACHE_MAX_AGE,
+        ),
+        Config.REPORT_WORKERS,
+        # Waiting for a render slot and rendering may each take the full timeout
+        stale_after=3 * Config.REPORT_TIMEOUT_SECONDS,
+    )
+    report_formats = {
+        "pdf": (event_model.generate_pdf_report, "application/pdf", "pdf"),
+        "excel": (
+            event_model.generate_excel_report,
+            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            "xlsx",
+        ),
+    }
+
+    def send_report(event_id, report_format, path):
+        _, mimetype, extension = report_formats[report_format]
+        return send_file(
+            path,
+            download_name=f"participants_{event_id}_{datetime.now().strftime('%Y%m%d')}.{extension}",
+            mimetype=mimetype,
+        )
+
+    def serve_report(event, report_format, fields_printed):
+        """Send a fresh cached report, or start rendering it and return a job id"""
+        event_id = str(event["_id"])
+        key = ReportCache.key(
+            event_id, event.get("version"), report_format, fields_printed
+        )
+
+        path = report_jobs.cache.get(key)
+        if path:
+            return send_report(event_id, report_format, path)
+
+        if report_jobs.status(key) == ReportJobs.EMPTY:
+            return jsonify({"message": "Event not found"}), 404
 
-    # Create MongoDB collection for deeplinks if it doesn't exist
-    if "deeplinks" not in mongo.db.list_collection_names():
-        mongo.db.create_collection("deeplinks")
+        render, _, _ = report_formats[report_format]
+        report_jobs.submit(key, lambda: render(event_id, fields_printed))
+        return (
+            jsonify(
+                {
+                    "message": "Report is being generated",
+                    "job_id": key,
+                    "status": ReportJobs.PENDING,
+                }
+            ),
+            202,
+        )
+
+    broker.start(mongo)
+    checkins = CheckinBuffer(event_model)
+    checkin_log = CheckinLog(mongo)
+    # Event creators looked up once per event so gate scans stay off the database
+    event_creators = TTLCache(ttl=300)
+
+    def get_event_creator(event_id):
+        creator_id = event_creators.get(event_id)
+        if creator_id is None:
+            event = event_model.events_collection.find_one(
+                {"_id": ObjectId(event_id)}, {"creator_id": 1}
+            )
+            if not event:
+                return None
+            creator_id = str(event["creator_id"])
+            event_creators.set(event_id, creator_id)
+        return creator_id
 
     def is_valid_slug(slug):
         """Check if slug is valid (alphanumeric, hyphens, underscores)"""
@@ -42,14 +145,15 @@ def init_event_routes(mongo):
                 jsonify({"message": "External participants cannot create events"}),
                 403,
             )
+        images = {}
         try:
             # Get creator details
-            creator = mongo.db.users.find_one({"enrollment_number": current_user})
+            creator = event_model.user_model.get_user_profile(current_user)
             if not creator:
                 return jsonify({"message": "Creator not found"}), 404
 
-            # Handle form data
-            data = request.form.to_dict()
+            # Handle form data; the image is streamed into the upload spool
+            data, images = parse_image_form({"image"})
 
             # Check required fields
             required_fields = ["name", "date", "max_participants", "venue"]
@@ -113,17 +217,18 @@ def init_event_routes(mongo):
             except ValueError:
                 return jsonify({"message": "Invalid date format"}), 400
 
-            if "image" in request.files:
-                file = request.files["image"]
-                image_url = save_image(file)
-                if image_url:
-                    data["image_url"] = image_url
-            else:
-                data["image_url"] = FAILED_FILE_URL
+            # Placeholder until the background upload patches in the CDN URL
+            data["image_url"] = FAILED_FILE_URL
 
             # Create event and get approval token
             event_id, approval_token = event_model.create_event(data, current_user)
 
+            image_status = None
+            if images.get("image"):
+                image_status = image_uploader.submit(event_id, images["image"])
+                # The uploader owns the spooled file from here on
+                images.pop("image")
+
             # Save custom slug if provided
             if custom_slug:
                 mongo.db.deeplinks.insert_one(
@@ -169,6 +274,8 @@ def init_event_routes(mongo):
                 }
                 if custom_slug:
                     response_data["custom_slug"] = custom_slug
+                if image_status:
+                    response_data["image_status"] = image_status
 
                 return jsonify(response_data), 201
             else:
@@ -179,13 +286,19 @@ def init_event_routes(mongo):
                 }
                 if custom_slug:
                     response_data["custom_slug"] = custom_slug
+                if image_status:
+                    response_data["image_status"] = image_status
 
                 return jsonify(response_data), 201
 
-        except ValueError as e:
+        except UploadTooLarge as e:
+            return jsonify({"message": str(e)}), 413
+        except (InvalidUpload, ValueError) as e:
             return jsonify({"message": str(e)}), 400
         except Exception as e:
             return jsonify({"message": f"Error creating event: {str(e)}"}), 500
+        finally:
+            discard_images(images)
 
     @events_bp.route("/events", methods=["GET"])
     @token_required
@@ -203,17 +316,7 @@ def init_event_routes(mongo):
             events = event_model.get_all_events(include_pending=False)
 
             # Filter sensitive data based on whether user is creator
-            for event in events:
-                if str(event.get("creator_id")) != str(current_user):
-                    # For non-creators, only send participant count and registration status
-                    is_registered = any(
-                        p.get("enrollment_number") == current_user
-                        for p in event.get("participants", [])
-                    )
-                    participant_count = len(event.get("participants", []))
-                    event["participants"] = participant_count
-                    event["is_registered"] = is_registered
-                # Creators see full participant data for their events
+            summarize_participants(events, current_user)
             return json.loads(json_util.dumps({"events": events})), 200
 
         except Exception as e:
@@ -247,8 +350,8 @@ def init_event_routes(mongo):
                 if success:
                     # Get event and creator details
                     event = event_model.get_event_by_id(event_id)
-                    creator = mongo.db.users.find_one(
-                        {"enrollment_number": event.get("creator_id")}
+                    creator = event_model.user_model.get_user_profile(
+                        event.get("creator_id")
                     )
 
                     if creator and event:
@@ -328,8 +431,8 @@ def init_event_routes(mongo):
                     if success:
                         # Get event and creator details
                         event = event_model.get_event_by_id(event_id)
-                        creator = mongo.db.users.find_one(
-                            {"enrollment_number": event.get("creator_id")}
+                        creator = event_model.user_model.get_user_profile(
+                            event.get("creator_id")
                         )
 
                         if creator and event:
@@ -393,8 +496,8 @@ def init_event_routes(mongo):
             if success:
                 # Get event and creator details
                 event = event_model.get_event_by_id(event_id)
-                creator = mongo.db.users.find_one(
-                    {"enrollment_number": event.get("creator_id")}
+                creator = event_model.user_model.get_user_profile(
+                    event.get("creator_id")
                 )
 
                 if creator and event:
@@ -492,13 +595,11 @@ def init_event_routes(mongo):
                 return jsonify({"message": "This event is pending approval"}), 403
 
             # Get user details for email
-            user = mongo.db.users.find_one({"enrollment_number": current_user})
+            user = event_model.user_model.get_user_profile(current_user)
             if not user:
                 return jsonify({"message": "User not found"}), 404
 
-            organizer = mongo.db.users.find_one(
-                {"enrollment_number": event["creator_id"]}
-            )
+            organizer = event_model.user_model.get_user_profile(event["creator_id"])
             if not organizer:
                 return jsonify({"message": "Organizer not found"}), 404
 
@@ -526,9 +627,17 @@ def init_event_routes(mongo):
                 event_date = event["date"]
 
             formatted_date = event_date.strftime("%B %d, %Y at %I:%M %p")
+            checkin_token = issue_checkin_token(event_id, current_user)
 
-            # Send emails asynchronously using threads
+            # Send emails in the background
             def send_emails():
+                try:
+                    checkin_qr = run_blocking(checkin_qr_png, checkin_token)
+                except Exception as e:
+                    # Still confirm the registration, just without the QR code
+                    print(f"Error rendering check-in QR code: {str(e)}")
+                    checkin_qr = None
+
                 try:
                     # Send confirmation to participant
                     mailer.send_event_registration_confirmation(
@@ -538,6 +647,7 @@ def init_event_routes(mongo):
                         event_date=formatted_date,
                         venue=event["venue"],
                         organizer_email=organizer["amity_email"],
+                        checkin_qr=checkin_qr,
                     )
 
                     # Send notification to organizer
@@ -550,9 +660,9 @@ def init_event_routes(mongo):
                     print(f"Error sending registration emails: {str(e)}")
 
             # Start email sending in background
-            Thread(target=send_emails).start()
+            spawn(send_emails)
 
-            return jsonify({"message": message}), 200
+            return jsonify({"message": message, "checkin_token": checkin_token}), 200
 
         except Exception as e:
             return jsonify({"message": f"Error registering for event: {str(e)}"}), 500
@@ -571,9 +681,10 @@ def init_event_routes(mongo):
     @events_bp.route("/events/<event_id>", methods=["PUT"])
     @token_required
     def update_event(current_user, event_id):
+        images = {}
         try:
-            # Handle form data and file upload
-            data = request.form.to_dict()
+            # Handle form data; the image is streamed into the upload spool
+            data, images = parse_image_form({"image"})
 
             try:
                 parsed_date = parse(data["date"])
@@ -616,22 +727,36 @@ def init_event_routes(mongo):
                     upsert=True,
                 )
 
-            if data.get("has_image_been_changed", "false").lower() == "true":
-                if "image" in request.files:
-                    file = request.files["image"]
-                    image_url = save_image(file)
-                    if image_url:
-                        data["image_url"] = image_url
-                else:
-                    data["image_url"] = FAILED_FILE_URL
+            image_changed = (
+                data.get("has_image_been_changed", "false").lower() == "true"
+            )
+            # The current image stays until a new one is uploaded
+            if image_changed and not images.get("image"):
+                data["image_url"] = FAILED_FILE_URL
+                data["image_detail_url"] = FAILED_FILE_URL
+                data["image_thumbnail_url"] = FAILED_FILE_URL
 
             success, message = event_model.update_event(event_id, current_user, data)
             if success:
+                if image_changed and images.get("image"):
+                    image_status = image_uploader.submit(event_id, images["image"])
+                    # The uploader owns the spooled file from here on
+                    images.pop("image")
+                    return (
+                        jsonify({"message": message, "image_status": image_status}),
+                        200,
+                    )
                 return jsonify({"message": message}), 200
             return jsonify({"message": message}), 403
 
+        except UploadTooLarge as e:
+            return jsonify({"message": str(e)}), 413
+        except InvalidUpload as e:
+            return jsonify({"message": str(e)}), 400
         except Exception as e:
             return jsonify({"message": f"Error updating event: {str(e)}"}), 500
+        finally:
+            discard_images(images)
 
     @events_bp.route("/events/<event_identifier>", methods=["GET"])
     @token_required
@@ -759,22 +884,16 @@ def init_event_routes(mongo):
                 event_id = deeplink["event_id"]
 
             # Check if user is the event creator
-            event = event_model.events_collection.find_one({"_id": ObjectId(event_id)})
+            event = event_model.events_collection.find_one(
+                {"_id": ObjectId(event_id)}, {"creator_id": 1, "version": 1}
+            )
             if not event or str(event["creator_id"]) != str(current_user):
                 return jsonify({"message": "Unauthorized access"}), 403
 
             # Get fields to be printed from query parameters
             fields_printed = request.args.get("fields_printed")
 
-            pdf_buffer = event_model.generate_pdf_report(event_id, fields_printed)
-            if pdf_buffer is None:
-                return jsonify({"message": "Event not found"}), 404
-
-            return send_file(
-                pdf_buffer,
-                download_name=f"participants_{event_id}_{datetime.now().strftime('%Y%m%d')}.pdf",
-                mimetype="application/pdf",
-            )
+            return serve_report(event, "pdf", fields_printed)
         except Exception as e:
             return jsonify({"message": f"Error generating PDF report: {str(e)}"}), 500
 
@@ -796,24 +915,388 @@ def init_event_routes(mongo):
                 event_id = deeplink["event_id"]
 
             # Check if user is the event creator
-            event = event_model.events_collection.find_one({"_id": ObjectId(event_id)})
+            event = event_model.events_collection.find_one(
+                {"_id": ObjectId(event_id)}, {"creator_id": 1, "version": 1}
+            )
             if not event or str(event["creator_id"]) != str(current_user):
                 return jsonify({"message": "Unauthorized access"}), 403
 
             # Get fields to be printed from query parameters
             fields_printed = request.args.get("fields_printed")
 
-            excel_buffer = event_model.generate_excel_report(event_id, fields_printed)
-            if excel_buffer is None:
+            return serve_report(event, "excel", fields_printed)
+        except Exception as e:
+            return jsonify({"message": f"Error generating Excel report: {str(e)}"}), 500
+
+    @events_bp.route("/events/<event_identifier>/reports/<job_id>", methods=["GET"])
+    @token_required
+    def get_report_job(current_user, event_identifier, job_id):
+        """Poll a background report job; sends the file once it is ready"""
+        try:
+            # Check if event_identifier is a valid ObjectId
+            if ObjectId.is_valid(event_identifier):
+                # Directly use it as event_id
+                event_id = event_identifier
+            else:
+                # Otherwise, try to look it up as a custom slug
+                deeplink = mongo.db.deeplinks.find_one({"slug": event_identifier})
+                if not deeplink:
+                    return jsonify({"message": "Event not found"}), 404
+
+                event_id = deeplink["event_id"]
+
+            # Check if user is the event creator
+            event = event_model.events_collection.find_one(
+                {"_id": ObjectId(event_id)}, {"creator_id": 1}
+            )
+            if not event or str(event["creator_id"]) != str(current_user):
+                return jsonify({"message": "Unauthorized access"}), 403
+
+            # Jobs are only served for the event they were rendered for
+            parsed = ReportCache.parse_key(job_id)
+            if not parsed or parsed[1] != str(event["_id"]):
+                return jsonify({"message": "Report job not found"}), 404
+            report_format = parsed[0]
+            if report_format not in report_formats:
+                return jsonify({"message": "Report job not found"}), 404
+
+            status = report_jobs.status(job_id)
+            if status == ReportJobs.READY:
+                path = report_jobs.cache.get(job_id)
+                if path:
+                    return send_report(event_id, report_format, path)
+            if status in (ReportJobs.READY, ReportJobs.PENDING):
+                return jsonify({"job_id": job_id, "status": ReportJobs.PENDING}), 202
+            if status == ReportJobs.EMPTY:
                 return jsonify({"message": "Event not found"}), 404
+            if status == ReportJobs.FAILED:
+                return jsonify({"message": "Report generation failed"}), 500
+            return jsonify({"message": "Report job not found"}), 404
+        except Exception as e:
+            return jsonify({"message": f"Error fetching report: {str(e)}"}), 500
+
+    @events_bp.route("/events/<event_identifier>/participants/csv", methods=["GET"])
+    @token_required
+    def download_csv(current_user, event_identifier):
+        """Stream participants list as CSV"""
+        try:
+            # Check if event_identifier is a valid ObjectId
+            if ObjectId.is_valid(event_identifier):
+                # Directly use it as event_id
+                event_id = event_identifier
+            else:
+                # Otherwise, try to look it up as a custom slug
+                deeplink = mongo.db.deeplinks.find_one({"slug": event_identifier})
+                if not deeplink:
+                    return jsonify({"message": "Event not found"}), 404
+
+                event_id = deeplink["event_id"]
+
+            # Check if user is the event creator
+            event = event_model.events_collection.find_one(
+                {"_id": ObjectId(event_id)}, {"creator_id": 1}
+            )
+            if not event or str(event["creator_id"]) != str(current_user):
+                return jsonify({"message": "Unauthorized access"}), 403
 
-            return send_file(
-                excel_buffer,
-                download_name=f"participants_{event_id}_{datetime.now().strftime('%Y%m%d')}.xlsx",
-                mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            # Get fields to be printed from query parameters
+            fields_printed = request.args.get("fields_printed")
+
+            filename = (
+                f"participants_{event_id}_{datetime.now().strftime('%Y%m%d')}.csv"
+            )
+            return Response(
+                stream_with_context(
+                    event_model.generate_csv_report(event_id, fields_printed)
+                ),
+                mimetype="text/csv",
+                headers={"Content-Disposition": f"attachment; filename={filename}"},
             )
         except Exception as e:
-            return jsonify({"message": f"Error generating Excel report: {str(e)}"}), 500
+            return jsonify({"message": f"Error generating CSV report: {str(e)}"}), 500
+
+    @events_bp.route("/events/<event_identifier>/checkin-token", methods=["GET"])
+    @token_required
+    def get_checkin_token(current_user, event_identifier):
+        """Return the current user's check-in token (e.g. to show the QR again)"""
+        try:
+            # Check if event_identifier is a valid ObjectId
+            if ObjectId.is_valid(event_identifier):
+                # Directly use it as event_id
+                event_id = event_identifier
+            else:
+                # Otherwise, try to look it up as a custom slug
+                deeplink = mongo.db.deeplinks.find_one({"slug": event_identifier})
+                if not deeplink:
+                    return jsonify({"message": "Event not found"}), 404
+
+                event_id = deeplink["event_id"]
+
+            registered = event_model.events_collection.find_one(
+                {
+                    "_id": ObjectId(event_id),
+                    "participants.enrollment_number": current_user,
+                },
+                {"_id": 1},
+            )
+            if not registered:
+                return jsonify({"message": "Not registered for this event"}), 404
+
+            return (
+                jsonify({"checkin_token": issue_checkin_token(event_id, current_user)}),
+                200,
+            )
+        except Exception as e:
+            return jsonify({"message": f"Error fetching check-in token: {str(e)}"}), 500
+
+    @events_bp.route("/events/<event_identifier>/checkin", methods=["POST"])
+    @token_required
+    def check_in(current_user, event_identifier):
+        """Check a participant in by scanning their QR code at the gate.
+
+        The token's signature proves the registration, so a scan needs no
+        database read; attendance is written by the check-in buffer in
+        micro-batches.
+        """
+        try:
+            # Check if event_identifier is a valid ObjectId
+            if ObjectId.is_valid(event_identifier):
+                # Directly use it as event_id
+                event_id = event_identifier
+            else:
+                # Otherwise, try to look it up as a custom slug
+                deeplink = mongo.db.deeplinks.find_one({"slug": event_identifier})
+                if not deeplink:
+                    return jsonify({"message": "Event not found"}), 404
+
+                event_id = deeplink["event_id"]
+
+            # Only the event creator can check participants in
+            creator_id = get_event_creator(event_id)
+            if creator_id is None:
+                return jsonify({"message": "Event not found"}), 404
+            if creator_id != str(current_user):
+                return jsonify({"message": "Unauthorized"}), 403
+
+            data = request.get_json(silent=True) or {}
+            verified = verify_checkin_token(data.get("token"))
+            if not verified:
+                return jsonify({"message": "Invalid check-in token"}), 400
+
+            token_event_id, enrollment_number = verified
+            if token_event_id != str(event_id):
+                return jsonify({"message": "Token is for a different event"}), 400
+
+            first_scan = checkins.check_in(str(event_id), enrollment_number)
+            return (
+                jsonify(
+                    {
+                        "message": (
+                            "Checked in successfully"
+                            if first_scan
+                            else "Already checked in"
+                        ),
+                        "enrollment_number": enrollment_number,
+                        "already_checked_in": not first_scan,
+                    }
+                ),
+                200,
+            )
+        except Exception as e:
+            return jsonify({"message": f"Error checking in: {str(e)}"}), 500
+
+    @events_bp.route("/events/<event_identifier>/checkin/sync", methods=["POST"])
+    @token_required
+    def sync_checkins(current_user, event_identifier):
+        """Upload scans queued by a scanner while it was offline.
+
+        Scans are de-duplicated by idempotency key, so a scanner can simply
+        re-upload its whole queue until it gets a response; when a
+        participant was scanned more than once the earliest scan wins.
+        """
+        try:
+            # Check if event_identifier is a valid ObjectId
+            if ObjectId.is_valid(event_identifier):
+                # Directly use it as event_id
+                event_id = event_identifier
+            else:
+                # Otherwise, try to look it up as a custom slug
+                deeplink = mongo.db.deeplinks.find_one({"slug": event_identifier})
+                if not deeplink:
+                    return jsonify({"message": "Event not found"}), 404
+
+                event_id = deeplink["event_id"]
+
+            # Only the event creator can check participants in
+            creator_id = get_event_creator(event_id)
+            if creator_id is None:
+                return jsonify({"message": "Event not found"}), 404
+            if creator_id != str(current_user):
+                return jsonify({"message": "Unauthorized"}), 403
+
+            data = request.get_json(silent=True) or {}
+            records = data.get("records")
+            if not isinstance(records, list) or not records:
+                return jsonify({"message": "records must be a non-empty list"}), 400
+            if len(records) > Config.CHECKIN_SYNC_MAX_RECORDS:
+                return (
+                    jsonify(
+                        {
+                            "message": f"At most {Config.CHECKIN_SYNC_MAX_RECORDS} "
+                            "records per upload"
+                        }
+                    ),
+                    413,
+                )
+
+            parsed, results = parse_offline_checkins(str(event_id), records)
+            pending, duplicates = checkin_log.record(str(event_id), parsed)
+            statuses = event_model.record_checkins(str(event_id), pending)
+            checkin_log.mark_applied(str(event_id), pending)
+
+            for checkin in parsed:
+                key = checkin["idempotency_key"]
+                if (checkin["device_id"], key) in duplicates:
+                    status = "duplicate"
+                else:
+                    status = statuses[checkin["enrollment_number"]]
+                results.append(
+                    {
+                        "index": checkin["index"],
+                        "idempotency_key": key,
+                        "enrollment_number": checkin["enrollment_number"],
+                        "status": status,
+                    }
+                )
+            results.sort(key=lambda result: result["index"])
+
+            counts = {}
+            for result in results:
+                counts[result["status"]] = counts.get(result["status"], 0) + 1
+            return (
+                jsonify(
+                    {
+                        "message": f"Processed {len(records)} check-ins",
+                        "counts": counts,
+                        "results": results,
+                    }
+                ),
+                200,
+            )
+        except Exception as e:
+            return jsonify({"message": f"Error syncing check-ins: {str(e)}"}), 500
+
+    @events_bp.route("/events/<event_identifier>/live", methods=["GET"])
+    @token_required
+    def stream_event_updates(current_user, event_identifier, **kwargs):
+        """Server-Sent Events stream of seats left and attendance for an event.
+
+        Sends a snapshot on connect and then one "update" message whenever
+        the counts change, with deltas against the previous message. The
+        stream closes after SSE_MAX_DURATION seconds and the client
+        reconnects, which keeps worker slots turning over.
+        """
+        try:
+            # Check if event_identifier is a valid ObjectId
+            if ObjectId.is_valid(event_identifier):
+                # Directly use it as event_id
+                event_id = event_identifier
+            else:
+                # Otherwise, try to look it up as a custom slug
+                deeplink = mongo.db.deeplinks.find_one({"slug": event_identifier})
+                if not deeplink:
+                    return jsonify({"message": "Event not found"}), 404
+
+                event_id = deeplink["event_id"]
+            event_id = str(event_id)
+
+            event = event_model.events_collection.find_one(
+                {"_id": ObjectId(event_id)}, {"max_participants": 1}
+            )
+            if not event:
+                return jsonify({"message": "Event not found"}), 404
+            capacity = int(event.get("max_participants") or 0)
+
+            snapshot = event_model.analytics.snapshot(event_id)
+            subscription = broker.subscribe(event_id, snapshot)
+            if subscription is None:
+                response = jsonify({"message": "Too many live connections"})
+                response.headers["Retry-After"] = str(Config.SSE_HEARTBEAT_SECONDS)
+                return response, 503
+        except Exception as e:
+            return jsonify({"message": f"Error opening live updates: {str(e)}"}), 500
+
+        def message(current, previous):
+            data = {
+                "event_id": event_id,
+                "registrations": current["registrations"],
+                "seats_left": max(capacity - current["registrations"], 0),
+                "attended": current["attended"],
+                "version": current["version"],
+            }
+            if previous is not None:
+                data["registrations_delta"] = (
+                    current["registrations"] - previous["registrations"]
+                )
+                data["attended_delta"] = current["attended"] - previous["attended"]
+            return (
+                f"event: update\nid: {current['version']}\ndata: {json.dumps(data)}\n\n"
+            )
+
+        def stream():
+            yield f"retry: {Config.SSE_HEARTBEAT_SECONDS * 1000}\n\n"
+            yield message(snapshot, None)
+            previous = snapshot
+            deadline = time.monotonic() + Config.SSE_MAX_DURATION
+            while time.monotonic() < deadline:
+                current = subscription.wait(Config.SSE_HEARTBEAT_SECONDS)
+                if current is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield message(current, previous)
+                previous = current
+
+        response = Response(
+            stream(),
+            mimetype="text/event-stream",
+            headers={
+                "Cache-Control": "no-cache",
+                # Stop nginx from buffering the stream
+                "X-Accel-Buffering": "no",
+            },
+        )
+        # The server closes the response even when the client leaves before
+        # the body is iterated, which a generator's finally would miss
+        response.call_on_close(lambda: broker.unsubscribe(subscription))
+        return response
+
+    @events_bp.route("/events/<event_identifier>/analytics", methods=["GET"])
+    @token_required
+    def get_event_analytics(current_user, event_identifier):
+        """Registration and attendance analytics for the event creator"""
+        try:
+            # Check if event_identifier is a valid ObjectId
+            if ObjectId.is_valid(event_identifier):
+                # Directly use it as event_id
+                event_id = event_identifier
+            else:
+                # Otherwise, try to look it up as a custom slug
+                deeplink = mongo.db.deeplinks.find_one({"slug": event_identifier})
+                if not deeplink:
+                    return jsonify({"message": "Event not found"}), 404
+
+                event_id = deeplink["event_id"]
+
+            # Check if user is the event creator
+            event = event_model.events_collection.find_one(
+                {"_id": ObjectId(event_id)}, {"creator_id": 1}
+            )
+            if not event or str(event["creator_id"]) != str(current_user):
+                return jsonify({"message": "Unauthorized access"}), 403
+
+            return jsonify(event_model.analytics.get(event_id)), 200
+        except Exception as e:
+            return jsonify({"message": f"Error fetching analytics: {str(e)}"}), 500
 
     @events_bp.route(
         "/events/<event_identifier>/participants/<enrollment_number>",
@@ -877,11 +1360,22 @@ def init_event_routes(mongo):
             data = request.get_json()
             attendance_data = data.get("attendance", [])
 
-            success, message = event_model.mark_batch_attendance(
+            success, message, results = event_model.mark_batch_attendance(
                 event_id, attendance_data
             )
             if success:
-                return jsonify({"message": message}), 200
+                matched = sum(1 for result in results if result["matched"])
+                return (
+                    jsonify(
+                        {
+                            "message": message,
+                            "matched": matched,
+                            "unmatched": len(results) - matched,
+                            "results": results,
+                        }
+                    ),
+                    200,
+                )
             return jsonify({"error": message}), 400
         except Exception as e:
             return jsonify({"message": f"Error marking attendance: {str(e)}"}), 500
@@ -899,12 +1393,15 @@ def init_event_routes(mongo):
                 return jsonify({"message": "Missing required fields"}), 400
 
             # Update the participant's custom field values
-            result = event_model.events_collection.update_one(
+            result = event_model.events_writes.update_one(
                 {
                     "_id": ObjectId(event_id),
                     "participants.enrollment_number": enrollment_number,
                 },
-                {"$set": {"participants.$.custom_field_values": custom_field_values}},
+                {
+                    "$set": {"participants.$.custom_field_values": custom_field_values},
+                    "$inc": {"version": 1},
+                },
             )
 
             if result.modified_count:
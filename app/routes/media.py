@@ -0,0 +1,46 @@
+import mimetypes
+import os
+
+from flask import Blueprint, Response, jsonify, send_file
+from app.utils.storage import LocalStorage
+from config import Config
+
+
+def init_media_routes():
+    media = Blueprint("media", __name__)
+    storage = LocalStorage()
+
+    def cache_headers(response, etag):
+        response.cache_control.public = True
+        response.cache_control.max_age = Config.MEDIA_MAX_AGE
+        # Content-addressed files never change under the same name
+        response.cache_control.immutable = True
+        response.set_etag(etag)
+        return response
+
+    @media.route("/<path:key>", methods=["GET"])
+    def get_media(key):
+        path = storage.path_for(key)
+        if not path:
+            return jsonify({"message": "File not found"}), 404
+
+        etag = storage.etag_for(key)
+        if Config.MEDIA_OFFLOAD in ("x-sendfile", "x-accel-redirect"):
+            # The web server sends the file and answers range and
+            # conditional requests itself
+            response = Response(mimetype=mimetypes.guess_type(path)[0])
+            if Config.MEDIA_OFFLOAD == "x-sendfile":
+                response.headers["X-Sendfile"] = os.path.abspath(path)
+            else:
+                response.headers[
+                    "X-Accel-Redirect"
+                ] = f"{Config.MEDIA_ACCEL_PREFIX.rstrip('/')}/{key}"
+            return cache_headers(response, etag)
+
+        # Handles If-None-Match / If-Modified-Since and Range requests
+        response = send_file(
+            path, conditional=True, etag=etag, max_age=Config.MEDIA_MAX_AGE
+        )
+        return cache_headers(response, etag)
+
+    return media
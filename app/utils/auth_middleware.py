@@ -4,31 +4,48 @@ import jwt
 from config import Config
 
 
-def token_required(f):
-    @wraps(f)
-    def decorated(*args, **kwargs):
-        token = None
-        if "Authorization" in request.headers:
-            token = request.headers["Authorization"].split(" ")[1]
+def decode_token(authorization):
+    """Check an Authorization header value.
+
+    Returns (current_user, kwargs, error): kwargs carries the external
+    participant claims, and error is a (body, status) pair when the token
+    is missing or invalid. Shared by token_required and the async routes.
+    """
+    token = None
+    if authorization:
+        token = authorization.split(" ")[1]
+
+    if not token:
+        return None, {}, ({"message": "Token is missing"}, 401)
 
-        if not token:
-            return jsonify({"message": "Token is missing"}), 401
+    kwargs = {}
+    try:
+        data = jwt.decode(token, Config.JWT_SECRET_KEY, algorithms=["HS256"])
+        current_user = data["enrollment_number"]
 
-        try:
-            data = jwt.decode(token, Config.JWT_SECRET_KEY, algorithms=["HS256"])
-            current_user = data["enrollment_number"]
+        # If user is external, check if their event still exists
+        if data.get("is_external"):
+            kwargs["event_code"] = data["event_code"]
+            kwargs["is_external"] = True
 
-            # If user is external, check if their event still exists
-            if data.get("is_external"):
-                kwargs["event_code"] = data["event_code"]
-                kwargs["is_external"] = True
+    except jwt.ExpiredSignatureError:
+        return None, {}, ({"error": "Token has expired"}, 401)
+    except Exception as e:
+        print(f"Token validation error: {str(e)}")
+        return None, {}, ({"message": "Token is invalid"}, 401)
 
-        except jwt.ExpiredSignatureError:
-            return jsonify({"error": "Token has expired"}), 401
-        except Exception as e:
-            print(f"Token validation error: {str(e)}")
-            return jsonify({"message": "Token is invalid"}), 401
+    return current_user, kwargs, None
+
+
+def token_required(f):
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        current_user, claims, error = decode_token(request.headers.get("Authorization"))
+        if error:
+            body, status = error
+            return jsonify(body), status
 
+        kwargs.update(claims)
         return f(current_user, *args, **kwargs)
 
     return decorated
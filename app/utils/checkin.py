@@ -0,0 +1,258 @@
+import atexit
+import base64
+import hashlib
+import hmac
+import os
+from datetime import datetime, timedelta, timezone
+from io import BytesIO
+from threading import Condition, Lock, Thread
+
+from dateutil.parser import parse
+
+from app.models.checkin_log import checkin_key
+from app.utils.cache import TTLCache
+from config import Config
+
+TOKEN_VERSION = "c1"
+# Bytes of the HMAC kept in a token; 128 bits keeps the QR code small
+SIGNATURE_BYTES = 16
+# device_id recorded for scans made through the live check-in endpoint
+ONLINE_DEVICE_ID = "online"
+
+
+def _signature(event_id, enrollment_number):
+    message = f"{TOKEN_VERSION}.{event_id}.{enrollment_number}".encode("utf-8")
+    digest = hmac.new(
+        Config.CHECKIN_SECRET.encode("utf-8"), message, hashlib.sha256
+    ).digest()[:SIGNATURE_BYTES]
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ascii")
+
+
+def issue_checkin_token(event_id, enrollment_number):
+    """Return the signed check-in token for a registration"""
+    signature = _signature(event_id, enrollment_number)
+    return f"{TOKEN_VERSION}.{event_id}.{enrollment_number}.{signature}"
+
+
+def verify_checkin_token(token):
+    """Return (event_id, enrollment_number) for a valid token, else None.
+
+    Only the signature is checked, so this needs no database access.
+    """
+    try:
+        version, event_id, rest = token.split(".", 2)
+        enrollment_number, signature = rest.rsplit(".", 1)
+    except (AttributeError, ValueError):
+        return None
+    if version != TOKEN_VERSION or not enrollment_number:
+        return None
+    if not hmac.compare_digest(signature, _signature(event_id, enrollment_number)):
+        return None
+    return event_id, enrollment_number
+
+
+def checkin_qr_png(token):
+    """Render a check-in token as a PNG QR code"""
+    import qrcode
+
+    image = qrcode.make(token, box_size=8, border=2)
+    buffer = BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class CheckinBuffer:
+    """De-duplicate gate scans in memory and write them to Mongo in batches.
+
+    A scan is accepted once per (event, participant) per worker; accepted
+    scans are queued and a background thread flushes them through
+    Event.record_checkins every CHECKIN_FLUSH_INTERVAL seconds, or sooner
+    once CHECKIN_FLUSH_SIZE scans are waiting. The in-memory set only
+    spares repeat scans a database write and is kept small
+    (CHECKIN_DEDUPE_MAX_ENTRIES); check-ins are idempotent (the first scan
+    wins), so a participant scanned on two workers, or forgotten here, is
+    still counted once.
+    """
+
+    def __init__(self, event_model, flush_interval=None, flush_size=None):
+        self.event_model = event_model
+        self.flush_interval = flush_interval or Config.CHECKIN_FLUSH_INTERVAL
+        self.flush_size = flush_size or Config.CHECKIN_FLUSH_SIZE
+        self._seen = TTLCache(
+            ttl=Config.CHECKIN_DEDUPE_TTL, max_size=Config.CHECKIN_DEDUPE_MAX_ENTRIES
+        )
+        self._seen_lock = Lock()
+        self._pending = {}
+        self._pending_count = 0
+        self._condition = Condition()
+        self._thread = None
+        self._pid = None
+        atexit.register(self.flush)
+
+    def check_in(self, event_id, enrollment_number):
+        """Queue a scan; returns False when it was already checked in here"""
+        key = (event_id, enrollment_number)
+        with self._seen_lock:
+            if self._seen.get(key):
+                return False
+            self._seen.set(key, True)
+
+        scanned_at = datetime.now(timezone.utc).replace(tzinfo=None)
+        self._ensure_thread()
+        with self._condition:
+            self._pending.setdefault(event_id, []).append(
+                {
+                    "enrollment_number": enrollment_number,
+                    "scanned_at": scanned_at,
+                    "device_id": ONLINE_DEVICE_ID,
+                }
+            )
+            self._pending_count += 1
+            if self._pending_count >= self.flush_size:
+                self._condition.notify()
+        return True
+
+    def _ensure_thread(self):
+        # A flusher thread does not survive fork, so each worker starts its own
+        if self._thread is None or self._pid != os.getpid():
+            with self._condition:
+                if self._thread is None or self._pid != os.getpid():
+                    self._pid = os.getpid()
+                    self._thread = Thread(
+                        target=self._run, name="checkin-flush", daemon=True
+                    )
+                    self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._pending_count >= self.flush_size,
+                    timeout=self.flush_interval,
+                )
+            self.flush()
+
+    def flush(self):
+        """Write all queued scans; failed batches are queued again"""
+        with self._condition:
+            pending, self._pending = self._pending, {}
+            self._pending_count = 0
+
+        for event_id, checkins in pending.items():
+            try:
+                statuses = self.event_model.record_checkins(event_id, checkins)
+            except Exception as e:
+                print(f"Error flushing check-ins for event {event_id}: {str(e)}")
+                with self._condition:
+                    self._pending.setdefault(event_id, []).extend(checkins)
+                    self._pending_count += len(checkins)
+                continue
+            unmatched = [
+                number
+                for number, status in statuses.items()
+                if status == "not_registered"
+            ]
+            if unmatched:
+                # Signed tokens of participants who have since unregistered
+                print(f"Check-ins for unknown participants of {event_id}: {unmatched}")
+
+
+def parse_scan_time(value):
+    """Parse an uploaded scan time (ISO 8601 or epoch milliseconds) to naive UTC"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        try:
+            scanned_at = datetime.fromtimestamp(value / 1000, timezone.utc)
+        except (OverflowError, OSError, ValueError):
+            return None
+        return scanned_at.replace(tzinfo=None)
+    try:
+        scanned_at = parse(value)
+    except (TypeError, ValueError, OverflowError):
+        return None
+    if scanned_at.tzinfo is not None:
+        scanned_at = scanned_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return scanned_at
+
+
+def parse_offline_checkins(event_id, records):
+    """Validate uploaded scans for event_id.
+
+    Each record needs device_id, scanned_at and either a check-in token or
+    an enrollment_number; idempotency_key is optional and derived from the
+    scan when missing. Returns (checkins, results) where results holds an
+    entry with status "invalid" for every rejected record.
+    """
+    checkins = []
+    results = []
+    seen_keys = set()
+    # Allow for scanner clocks running a little fast
+    latest = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(minutes=5)
+    for index, record in enumerate(records):
+        if not isinstance(record, dict):
+            results.append({"index": index, "status": "invalid"})
+            continue
+
+        enrollment_number = record.get("enrollment_number")
+        if record.get("token"):
+            verified = verify_checkin_token(record["token"])
+            if not verified or verified[0] != str(event_id):
+                results.append(
+                    {"index": index, "status": "invalid", "error": "Invalid token"}
+                )
+                continue
+            enrollment_number = verified[1]
+
+        device_id = record.get("device_id")
+        scanned_at = parse_scan_time(record.get("scanned_at"))
+        if not enrollment_number or not device_id or scanned_at is None:
+            results.append(
+                {
+                    "index": index,
+                    "status": "invalid",
+                    "error": "enrollment_number (or token), device_id and "
+                    "scanned_at are required",
+                }
+            )
+            continue
+        if scanned_at > latest:
+            results.append(
+                {
+                    "index": index,
+                    "status": "invalid",
+                    "error": "scanned_at is in the future",
+                }
+            )
+            continue
+
+        # MongoDB stores milliseconds; truncate so keys match stored scans
+        scanned_at = scanned_at.replace(
+            microsecond=scanned_at.microsecond // 1000 * 1000
+        )
+        key = str(
+            record.get("idempotency_key")
+            or checkin_key(event_id, enrollment_number, device_id, scanned_at)
+        )
+        # Keys are chosen by scanners, so they are only unique per device
+        if (str(device_id), key) in seen_keys:
+            results.append(
+                {
+                    "index": index,
+                    "idempotency_key": key,
+                    "enrollment_number": enrollment_number,
+                    "status": "duplicate",
+                }
+            )
+            continue
+        seen_keys.add((str(device_id), key))
+        checkins.append(
+            {
+                "index": index,
+                "idempotency_key": key,
+                "enrollment_number": str(enrollment_number),
+                "device_id": str(device_id),
+                "scanned_at": scanned_at,
+            }
+        )
+    return checkins, results
@@ -0,0 +1,73 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+from config import Config
+
+_executor = None
+_executor_lock = Lock()
+
+
+def green_backend():
+    """Return "gevent" or "eventlet" when running under a patched worker, else None"""
+    if "gevent.monkey" in sys.modules:
+        from gevent import monkey
+
+        if monkey.is_module_patched("threading"):
+            return "gevent"
+    if "eventlet.patcher" in sys.modules:
+        from eventlet import patcher
+
+        if patcher.is_monkey_patched("thread"):
+            return "eventlet"
+    return None
+
+
+def run_blocking(func, *args, **kwargs):
+    """Call func, keeping CPU-bound work off the event loop of green workers.
+
+    Under gevent/eventlet every greenlet of a worker shares one OS thread,
+    so a long computation (bcrypt, image resizing) stalls all requests of
+    the worker; there func runs in the hub's pool of native threads while
+    the calling greenlet waits. Sync workers just call func.
+    """
+    backend = green_backend()
+    if backend == "gevent":
+        import gevent
+
+        return gevent.get_hub().threadpool.apply(func, args, kwargs)
+    if backend == "eventlet":
+        from eventlet import tpool
+
+        return tpool.execute(func, *args, **kwargs)
+    return func(*args, **kwargs)
+
+
+def spawn(func, *args):
+    """Run func in the background without waiting for it (e.g. sending mail).
+
+    Green workers start a greenlet; sync workers share a bounded thread
+    pool, so a burst of requests cannot start a thread each.
+    """
+    if green_backend() == "gevent":
+        import gevent
+
+        gevent.spawn(func, *args)
+        return
+    if green_backend() == "eventlet":
+        import eventlet
+
+        eventlet.spawn_n(func, *args)
+        return
+    _get_executor().submit(func, *args)
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=Config.BACKGROUND_WORKERS,
+                thread_name_prefix="background",
+            )
+        return _executor
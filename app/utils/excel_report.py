@@ -0,0 +1,25 @@
+import xlsxwriter
+
+
+def render_participants_excel(headers, rows, output):
+    """Write the participants workbook to output (a path or binary file).
+
+    rows is an iterable of value lists; they are written one at a time in
+    xlsxwriter's constant_memory mode, so memory does not grow with the
+    number of rows. Returns the number of data rows written.
+    """
+    workbook = xlsxwriter.Workbook(output, {"constant_memory": True})
+    worksheet = workbook.add_worksheet()
+
+    # Write headers
+    for col, header in enumerate(headers):
+        worksheet.write(0, col, header)
+
+    # Write data
+    count = 0
+    for count, values in enumerate(rows, 1):
+        for col, value in enumerate(values):
+            worksheet.write(count, col, value)
+
+    workbook.close()
+    return count
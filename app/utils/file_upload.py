@@ -1,6 +1,12 @@
-import requests
+import hashlib
+import os
+import uuid
+from app.utils.image_processing import SNIFF_BYTES, sniff_image_format
+from app.utils.storage import get_storage
 from config import Config
 
+# Raster formats process_image can decode (HEIC/HEIF through pillow-heif);
+# SVG is not accepted, as it cannot be resized and may carry scripts
 ALLOWED_EXTENSIONS = {
     "png",
     "jpg",
@@ -10,7 +16,7 @@ ALLOWED_EXTENSIONS = {
     "bmp",
     "tiff",
     "heic",
-    "svg",
+    "heif",
     "ico",
 }
 
@@ -24,27 +30,91 @@ def allowed_file(filename):
 def save_image(file):
     if file and allowed_file(file.filename):
         try:
-            # Prepare the file upload to Fivemerr
-            files = {"file": (file.filename, file, file.mimetype)}
-            headers = {"Authorization": Config.FIVEMERR_API_KEY}
-
-            # Make the POST request to Fivemerr
-            response = requests.post(
-                "https://api.fivemerr.com/v1/media/images",
-                files=files,
-                headers=headers,
+            return (
+                get_storage().save(file, file.filename, file.mimetype)
+                or FAILED_FILE_URL
             )
-
-            # Check if upload was successful
-            if response.status_code == 200:
-                data = response.json()
-                return data["url"]  # Return the CDN URL
-            else:
-                print(f"Fivemerr upload failed: {response.text}")
-                return FAILED_FILE_URL
-
         except Exception as e:
-            print(f"Error uploading to Fivemerr: {str(e)}")
+            print(f"Error storing image: {str(e)}")
             return FAILED_FILE_URL
 
     return FAILED_FILE_URL
+
+
+class ImageSpool:
+    """Stream an uploaded image into the local spool directory.
+
+    Nothing is written until the leading bytes match an image format, and
+    the content is hashed as it is written. close() returns {"path",
+    "filename", "mimetype", "digest", "size"} for the background uploader,
+    or None when the upload is not an image.
+    """
+
+    def __init__(self, filename, mimetype):
+        self.filename = filename
+        self.mimetype = mimetype
+        self.size = 0
+        self.valid = bool(filename) and allowed_file(filename)
+        self._head = b""
+        self._file = None
+        self._path = None
+        self._digest = hashlib.sha256()
+
+    def write(self, chunk):
+        if not self.valid:
+            return
+        if self._file is None:
+            self._head += chunk
+            if len(self._head) >= SNIFF_BYTES:
+                self._open()
+            return
+        self._append(chunk)
+
+    def close(self):
+        if self.valid and self._file is None and self._head:
+            # Files shorter than SNIFF_BYTES
+            self._open()
+        if not self.valid or self._file is None:
+            return None
+        self._file.close()
+        return {
+            "path": self._path,
+            "filename": self.filename,
+            "mimetype": self.mimetype,
+            "digest": self._digest.hexdigest(),
+            "size": self.size,
+        }
+
+    def discard(self):
+        self.valid = False
+        if self._file is not None:
+            self._file.close()
+            discard_spool({"path": self._path})
+
+    def _open(self):
+        if sniff_image_format(self._head[:SNIFF_BYTES]) is None:
+            self.valid = False
+            return
+        os.makedirs(Config.IMAGE_SPOOL_DIR, exist_ok=True)
+        extension = self.filename.rsplit(".", 1)[1].lower()
+        self._path = os.path.join(
+            Config.IMAGE_SPOOL_DIR, f"{uuid.uuid4().hex}.{extension}"
+        )
+        self._file = open(self._path, "wb")
+        head, self._head = self._head, b""
+        self._append(head)
+
+    def _append(self, chunk):
+        self._digest.update(chunk)
+        self._file.write(chunk)
+        self.size += len(chunk)
+
+
+def discard_spool(spool):
+    """Remove a spooled upload that will not be handed to the uploader"""
+    if not spool:
+        return
+    try:
+        os.remove(spool["path"])
+    except OSError:
+        pass
@@ -0,0 +1,111 @@
+import os
+import string
+from threading import Lock
+
+from pymongo import ReturnDocument, UpdateOne
+
+from config import Config
+
+# Multiplier used to scatter sequential counters over the id space. It is
+# prime and shares no factor with 10 or 36, so the mapping is a bijection.
+_SCATTER_MULTIPLIER = 48271
+
+
+class IdAllocator:
+    """Hand out unique, non-sequential looking ids from a shared counter.
+
+    Each process reserves a block of `block_size` counter values with a single
+    atomic $inc on the counters collection and then serves ids from memory,
+    so the hot path needs no database round trip. Counter values are mapped
+    through a fixed bijection over the id space, which keeps ids unique and
+    stops consecutive ids from looking sequential. The mapping is public and
+    invertible, so ids are not secrets: anyone who sees a couple of them can
+    work out others.
+    """
+
+    def __init__(self, mongo, name, alphabet, length, prefix="", block_size=None):
+        self.mongo = mongo
+        self.name = name
+        self.alphabet = alphabet
+        self.length = length
+        self.prefix = prefix
+        self.block_size = block_size or Config.ID_BLOCK_SIZE
+        self.space = len(alphabet) ** length
+        self._offset = sum(ord(c) for c in name) * 7919 % self.space
+        self._next = 0
+        self._end = 0
+        self._pid = None
+        self._lock = Lock()
+
+    def next_id(self):
+        with self._lock:
+            # Blocks reserved before a fork must not be shared with the child
+            if self._pid != os.getpid() or self._next >= self._end:
+                self._reserve_block()
+            value = self._next
+            self._next += 1
+        return self.prefix + self._encode(value)
+
+    def _reserve_block(self):
+        counter = self.mongo.db.counters.find_one_and_update(
+            {"_id": self.name},
+            {"$inc": {"next": self.block_size}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        self._end = counter["next"]
+        self._next = self._end - self.block_size
+        self._pid = os.getpid()
+        if self._end > self.space:
+            raise RuntimeError(f"Id space for {self.name} is exhausted")
+
+    def _encode(self, value):
+        value = (value * _SCATTER_MULTIPLIER + self._offset) % self.space
+        base = len(self.alphabet)
+        chars = []
+        for _ in range(self.length):
+            value, digit = divmod(value, base)
+            chars.append(self.alphabet[digit])
+        return "".join(reversed(chars))
+
+
+_allocators = {}
+_allocators_lock = Lock()
+
+
+def get_allocator(mongo, name, alphabet, length, prefix=""):
+    """Return the per-process allocator for name, creating it on first use"""
+    with _allocators_lock:
+        if name not in _allocators:
+            _allocators[name] = IdAllocator(mongo, name, alphabet, length, prefix)
+        return _allocators[name]
+
+
+def temp_enrollment_allocator(mongo):
+    return get_allocator(mongo, "temp_enrollment", string.digits, 8, prefix="EXT")
+
+
+def event_code_allocator(mongo):
+    return get_allocator(mongo, "event_code", string.ascii_uppercase + string.digits, 6)
+
+
+def ensure_id_indexes(mongo):
+    """Create the unique indexes that back allocated ids (idempotent)"""
+    try:
+        mongo.db.external_participants.create_index("temp_enrollment", unique=True)
+    except Exception as e:
+        print(f"Could not create unique index on temp_enrollment: {str(e)}")
+
+    # Events may share a code, so uniqueness of newly issued codes is kept in
+    # a registry keyed by the code itself; backfill codes issued before it.
+    codes = mongo.db.events.distinct("event_code", {"event_code": {"$ne": None}})
+    if codes:
+        mongo.db.event_codes.bulk_write(
+            [
+                UpdateOne(
+                    {"_id": code}, {"$setOnInsert": {"legacy": True}}, upsert=True
+                )
+                for code in codes
+            ],
+            ordered=False,
+        )
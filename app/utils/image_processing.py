@@ -0,0 +1,148 @@
+import os
+
+from config import Config
+
+# Leading bytes of the raster formats we accept, checked instead of trusting
+# the file extension or the client supplied mimetype
+MAGIC_BYTES = [
+    (b"\xff\xd8\xff", "jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"GIF87a", "gif"),
+    (b"GIF89a", "gif"),
+    (b"BM", "bmp"),
+    (b"II*\x00", "tiff"),
+    (b"MM\x00*", "tiff"),
+    (b"\x00\x00\x01\x00", "ico"),
+]
+HEIF_BRANDS = {b"heic", b"heix", b"hevc", b"heim", b"heis", b"mif1", b"msf1"}
+SNIFF_BYTES = 16
+# Pillow decoders allowed for each sniffed format
+PIL_FORMATS = {
+    "jpeg": ["JPEG"],
+    "png": ["PNG"],
+    "gif": ["GIF"],
+    "bmp": ["BMP"],
+    "tiff": ["TIFF"],
+    "ico": ["ICO"],
+    "webp": ["WEBP"],
+    "heif": ["HEIF"],
+}
+
+# Variants uploaded for each event image: (name, longest side in pixels)
+VARIANTS = [
+    ("full", Config.IMAGE_MAX_DIMENSION),
+    ("detail", Config.IMAGE_DETAIL_DIMENSION),
+    ("list", Config.IMAGE_LIST_DIMENSION),
+]
+
+
+class ImageProcessingError(Exception):
+    pass
+
+
+def sniff_image_format(head):
+    """Return the image format from a file's first bytes, or None"""
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    if head[4:8] == b"ftyp" and head[8:12] in HEIF_BRANDS:
+        return "heif"
+    for magic, image_format in MAGIC_BYTES:
+        if head.startswith(magic):
+            return image_format
+    return None
+
+
+def _heif_supported():
+    try:
+        from pillow_heif import register_heif_opener
+    except ImportError:
+        return False
+    register_heif_opener()
+    return True
+
+
+def _output_format():
+    from PIL import features
+
+    if Config.IMAGE_OUTPUT_FORMAT == "WEBP" and features.check("webp"):
+        return "WEBP", "webp", "image/webp"
+    return "JPEG", "jpg", "image/jpeg"
+
+
+def processing_profile():
+    """Identify the settings images are currently processed with"""
+    _, extension, _ = _output_format()
+    sizes = "-".join(str(size) for _, size in VARIANTS)
+    return f"{extension}-q{Config.IMAGE_QUALITY}-{sizes}"
+
+
+def process_image(path):
+    """Re-encode the image at path into resized variants next to it.
+
+    Metadata (including EXIF location) is dropped after applying the EXIF
+    orientation, only the first frame of animations is kept, and every
+    variant is fitted within its longest side. Returns {variant: {"path",
+    "extension", "mimetype"}}; raises ImageProcessingError when the file
+    is not an image we can decode.
+    """
+    from PIL import Image, ImageOps
+
+    with open(path, "rb") as file:
+        image_format = sniff_image_format(file.read(SNIFF_BYTES))
+    if image_format is None or (image_format == "heif" and not _heif_supported()):
+        raise ImageProcessingError("Unsupported image format")
+
+    pil_format, extension, mimetype = _output_format()
+    largest = max(size for _, size in VARIANTS)
+    stem = os.path.splitext(path)[0]
+    variants = {}
+    try:
+        with Image.open(path, formats=PIL_FORMATS[image_format]) as image:
+            if image.width * image.height > Config.IMAGE_MAX_PIXELS:
+                raise ImageProcessingError("Image dimensions are too large")
+            # Let the JPEG decoder downscale while decoding large photos
+            image.draft("RGB", (largest, largest))
+            image = ImageOps.exif_transpose(image)
+            has_alpha = image.mode in ("RGBA", "LA") or (
+                image.mode == "P" and "transparency" in image.info
+            )
+            if pil_format == "JPEG" or not has_alpha:
+                if has_alpha:
+                    # JPEG has no transparency; flatten onto white
+                    rgba = image.convert("RGBA")
+                    image = Image.new("RGB", rgba.size, "white")
+                    image.paste(rgba, mask=rgba)
+                else:
+                    image = image.convert("RGB")
+            else:
+                image = image.convert("RGBA")
+
+            # Largest first, so each smaller variant is resized from the last
+            for name, size in VARIANTS:
+                image.thumbnail((size, size), Image.LANCZOS)
+                variant_path = f"{stem}-{name}.{extension}"
+                image.save(
+                    variant_path,
+                    pil_format,
+                    quality=Config.IMAGE_QUALITY,
+                    optimize=pil_format == "JPEG",
+                    method=4 if pil_format == "WEBP" else 0,
+                    progressive=pil_format == "JPEG",
+                )
+                variants[name] = {
+                    "path": variant_path,
+                    "extension": extension,
+                    "mimetype": mimetype,
+                }
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        remove_variants(variants)
+        raise ImageProcessingError(str(e))
+    return variants
+
+
+def remove_variants(variants):
+    for variant in variants.values():
+        try:
+            os.remove(variant["path"])
+        except OSError:
+            pass
@@ -0,0 +1,182 @@
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from bson import ObjectId
+
+from app.models.image import ImageStore
+from app.utils.concurrency import run_blocking
+from app.utils.image_processing import (
+    ImageProcessingError,
+    process_image,
+    processing_profile,
+    remove_variants,
+)
+from app.utils.storage import get_storage
+from config import Config
+
+PENDING = "pending"
+READY = "ready"
+FAILED = "failed"
+
+# A pending upload not finished within this time is considered abandoned
+# (e.g. the worker died) and may be picked up again
+CLAIM_TIMEOUT = timedelta(minutes=10)
+
+# Event fields holding the URL of each processed variant
+VARIANT_FIELDS = {
+    "full": "image_url",
+    "detail": "image_detail_url",
+    "list": "image_thumbnail_url",
+}
+
+
+class ImageUploader:
+    """Upload spooled event images to storage in the background.
+
+    The event keeps its placeholder image_url with image_status "pending"
+    while the image is resized and re-encoded (see process_image) and its
+    variants are uploaded; the URLs are patched in once storage accepted
+    all of them. Images whose content was uploaded before reuse the stored
+    URLs straight away (see ImageStore). Each upload carries an id stored
+    on the event, so when an image is replaced before the previous upload
+    finished, the older upload cannot overwrite the newer image.
+    """
+
+    def __init__(self, mongo, workers=None):
+        self.mongo = mongo
+        self.images = ImageStore(mongo)
+        self.storage = get_storage()
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers or Config.IMAGE_UPLOAD_WORKERS,
+            thread_name_prefix="image-upload",
+        )
+
+    def submit(self, event_id, spool):
+        """Mark the event's image as pending and upload spool in the background.
+
+        Returns the image status: "ready" when the same content had been
+        uploaded before, otherwise "pending".
+        """
+        urls = self.images.find(spool["digest"], processing_profile())
+        if urls:
+            self.mongo.db.events.update_one(
+                {"_id": ObjectId(event_id)},
+                {
+                    "$set": dict(urls, image_status=READY),
+                    "$unset": {"image_upload": ""},
+                },
+            )
+            os.remove(spool["path"])
+            return READY
+
+        upload_id = uuid.uuid4().hex
+        self.mongo.db.events.update_one(
+            {"_id": ObjectId(event_id)},
+            {
+                "$set": {
+                    "image_status": PENDING,
+                    "image_upload": dict(
+                        spool, id=upload_id, claimed_at=datetime.now(timezone.utc)
+                    ),
+                }
+            },
+        )
+        self._executor.submit(self._run, str(event_id), upload_id, spool)
+        return PENDING
+
+    def resume_pending(self):
+        """Restart abandoned uploads whose spooled file is on this machine"""
+        try:
+            self._resume_pending()
+        except Exception as e:
+            print(f"Error resuming pending image uploads: {str(e)}")
+
+    def _resume_pending(self):
+        stale = datetime.now(timezone.utc) - CLAIM_TIMEOUT
+        events = self.mongo.db.events.find(
+            {"image_status": PENDING, "image_upload.claimed_at": {"$lt": stale}},
+            {"image_upload": 1},
+        )
+        for event in events:
+            upload = event["image_upload"]
+            if not os.path.exists(upload["path"]):
+                continue
+            # Claim atomically so only one worker resumes each upload
+            claimed = self.mongo.db.events.update_one(
+                {
+                    "_id": event["_id"],
+                    "image_upload.id": upload["id"],
+                    "image_upload.claimed_at": upload["claimed_at"],
+                },
+                {"$set": {"image_upload.claimed_at": datetime.now(timezone.utc)}},
+            )
+            if claimed.modified_count:
+                spool = {
+                    key: upload.get(key)
+                    for key in ("path", "filename", "mimetype", "digest", "size")
+                }
+                self._executor.submit(self._run, str(event["_id"]), upload["id"], spool)
+
+    def _run(self, event_id, upload_id, spool):
+        variants = {}
+        try:
+            urls = {}
+            profile = processing_profile()
+            try:
+                variants = run_blocking(process_image, spool["path"])
+            except ImageProcessingError as e:
+                print(f"Error processing image for event {event_id}: {str(e)}")
+            stem = os.path.splitext(spool["filename"])[0]
+            for name, variant in variants.items():
+                filename = f"{stem}-{name}.{variant['extension']}"
+                url = self._upload_with_retries(
+                    variant["path"], filename, variant["mimetype"]
+                )
+                if not url:
+                    break
+                urls[VARIANT_FIELDS[name]] = url
+
+            current = {"_id": ObjectId(event_id), "image_upload.id": upload_id}
+            if variants and len(urls) == len(variants):
+                if spool.get("digest"):
+                    self.images.save(spool["digest"], profile, urls, spool.get("size"))
+                self.mongo.db.events.update_one(
+                    current,
+                    {
+                        "$set": dict(urls, image_status=READY),
+                        "$unset": {"image_upload": ""},
+                    },
+                )
+            else:
+                # Keep the placeholder image; the organizer can upload again
+                self.mongo.db.events.update_one(
+                    current,
+                    {"$set": {"image_status": FAILED}, "$unset": {"image_upload": ""}},
+                )
+        except Exception as e:
+            print(f"Error finishing image upload for event {event_id}: {str(e)}")
+        finally:
+            remove_variants(variants)
+            try:
+                os.remove(spool["path"])
+            except OSError:
+                pass
+
+    def _upload_with_retries(self, path, filename, mimetype):
+        retries = Config.IMAGE_UPLOAD_RETRIES
+        for attempt in range(retries):
+            try:
+                with open(path, "rb") as file:
+                    url = self.storage.save(file, filename, mimetype)
+                if url:
+                    return url
+            except FileNotFoundError:
+                return None
+            except Exception as e:
+                print(f"Error storing image (attempt {attempt + 1}): {str(e)}")
+            if attempt < retries - 1:
+                time.sleep(Config.IMAGE_UPLOAD_BACKOFF * 2**attempt)
+        return None
@@ -0,0 +1,24 @@
+from app.utils.id_allocator import ensure_id_indexes
+
+
+def ensure_indexes(mongo):
+    """Create the indexes the app relies on (idempotent)"""
+    ensure_id_indexes(mongo)
+    # Participant reports join event participants to users by enrollment number
+    mongo.db.users.create_index("enrollment_number")
+    # Offline check-in uploads are looked up per event
+    mongo.db.checkin_log.create_index("event_id")
+    # Student import jobs (and their reports) are kept for a week
+    mongo.db.import_jobs.create_index("created_at", expireAfterSeconds=7 * 24 * 3600)
+
+
+def bootstrap_database(mongo):
+    """One-time database setup, kept out of app startup (idempotent).
+
+    Run by scripts/bootstrap_db.py (which gunicorn runs once before starting
+    workers, see gunicorn.conf.py) and by the development server in run.py.
+    """
+    # Create MongoDB collection for deeplinks if it doesn't exist
+    if "deeplinks" not in mongo.db.list_collection_names():
+        mongo.db.create_collection("deeplinks")
+    ensure_indexes(mongo)
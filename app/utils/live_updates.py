@@ -0,0 +1,134 @@
+import os
+import time
+from threading import Condition, Lock, Thread
+
+from bson import ObjectId
+
+from config import Config
+
+
+class Subscription:
+    """One stream's view of an event; only the latest snapshot is kept"""
+
+    def __init__(self, event_id):
+        self.event_id = event_id
+        self.closed = False
+        self._snapshot = None
+        self._condition = Condition()
+
+    def push(self, snapshot):
+        with self._condition:
+            self._snapshot = snapshot
+            self._condition.notify()
+
+    def wait(self, timeout):
+        """Return the next snapshot, or None if nothing changed within timeout"""
+        with self._condition:
+            if self._snapshot is None:
+                self._condition.wait(timeout)
+            snapshot, self._snapshot = self._snapshot, None
+            return snapshot
+
+
+class EventBroker:
+    """In-process pub/sub of per-event registration and attendance counts.
+
+    Writes made by this worker are published directly by EventAnalytics.
+    Writes made by other workers are picked up by a poller thread that
+    reads the version of every event with local subscribers from the
+    event_analytics collection every SSE_POLL_INTERVAL seconds. Snapshots
+    carry that version, so each one reaches a subscriber at most once
+    whichever path delivers it first.
+    """
+
+    def __init__(self, max_connections=None, poll_interval=None):
+        self.max_connections = max_connections or Config.SSE_MAX_CONNECTIONS
+        self.poll_interval = poll_interval or Config.SSE_POLL_INTERVAL
+        self.mongo = None
+        self._subscribers = {}
+        self._versions = {}
+        self._connections = 0
+        self._lock = Lock()
+        self._poller = None
+        self._pid = None
+
+    def start(self, mongo):
+        self.mongo = mongo
+
+    def subscribe(self, event_id, snapshot):
+        """Register a stream starting from snapshot; None when the worker is full"""
+        with self._lock:
+            if self._connections >= self.max_connections:
+                return None
+            self._connections += 1
+            subscription = Subscription(event_id)
+            self._subscribers.setdefault(event_id, set()).add(subscription)
+            if snapshot["version"] > self._versions.get(event_id, -1):
+                self._versions[event_id] = snapshot["version"]
+        self._ensure_poller()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Release the stream's connection slot (safe to call more than once)"""
+        with self._lock:
+            if subscription.closed:
+                return
+            subscription.closed = True
+            self._connections -= 1
+            subscribers = self._subscribers.get(subscription.event_id, set())
+            subscribers.discard(subscription)
+            if not subscribers:
+                self._subscribers.pop(subscription.event_id, None)
+                self._versions.pop(subscription.event_id, None)
+
+    def publish(self, event_id, snapshot):
+        """Deliver a snapshot to local subscribers unless it is not newer"""
+        with self._lock:
+            subscribers = self._subscribers.get(event_id)
+            if not subscribers or snapshot["version"] <= self._versions.get(
+                event_id, -1
+            ):
+                return
+            self._versions[event_id] = snapshot["version"]
+            subscribers = list(subscribers)
+        for subscription in subscribers:
+            subscription.push(snapshot)
+
+    def _ensure_poller(self):
+        # Threads do not survive fork, so each worker starts its own poller
+        with self._lock:
+            if self.mongo is None or (
+                self._poller is not None and self._pid == os.getpid()
+            ):
+                return
+            self._pid = os.getpid()
+            self._poller = Thread(target=self._poll, name="live-poller", daemon=True)
+            self._poller.start()
+
+    def _poll(self):
+        while True:
+            time.sleep(self.poll_interval)
+            with self._lock:
+                event_ids = list(self._subscribers)
+            if not event_ids:
+                continue
+            try:
+                rollups = self.mongo.db.event_analytics.find(
+                    {"_id": {"$in": [ObjectId(event_id) for event_id in event_ids]}},
+                    {"registrations": 1, "attended": 1, "version": 1},
+                )
+                for rollup in rollups:
+                    self.publish(str(rollup["_id"]), snapshot_from(rollup))
+            except Exception as e:
+                print(f"Error polling live event updates: {str(e)}")
+
+
+def snapshot_from(rollup):
+    return {
+        "registrations": rollup.get("registrations", 0),
+        "attended": rollup.get("attended", 0),
+        "version": rollup.get("version", 0),
+    }
+
+
+broker = EventBroker()
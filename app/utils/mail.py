@@ -1,3 +1,4 @@
+import json
 import requests
 from config import Config
 from datetime import datetime, timezone
@@ -8,16 +9,29 @@ class MailgunMailer:
         self.api_key = Config.MAILGUN_API_KEY
         self.domain = Config.MAILGUN_DOMAIN
         self.from_email = Config.MAILGUN_FROM_EMAIL
-        self.base_url = f"https://api.mailgun.net/v3/{self.domain}"
-
-    def send_email(self, to_email, subject, text=None, html=None):
+        self.base_url = f"{Config.MAILGUN_API_BASE.rstrip('/')}/{self.domain}"
+
+    def send_email(
+        self,
+        to_email,
+        subject,
+        text=None,
+        html=None,
+        recipient_variables=None,
+        inline=None,
+    ):
         """
         Send an email using Mailgun API
+
+        to_email may be a list of addresses; pass recipient_variables to have
+        Mailgun personalise one message per recipient (batch sending).
+        inline is a list of (filename, bytes, mimetype) images that the html
+        can reference as cid:<filename>.
         """
         try:
             data = {
                 "from": f"AUP Events <{self.from_email}>",
-                "to": [to_email],
+                "to": to_email if isinstance(to_email, list) else [to_email],
                 "subject": subject,
                 "text": text,
                 "date": datetime.now(timezone.utc).strftime("%a, %d %b %Y %H:%M:%S %z"),
@@ -35,9 +49,20 @@ class MailgunMailer:
                 data["text"] = text
             if html:
                 data["html"] = html
+            if recipient_variables:
+                data["recipient-variables"] = json.dumps(recipient_variables)
+
+            files = [
+                ("inline", (filename, content, mimetype))
+                for filename, content, mimetype in inline or []
+            ]
 
             response = requests.post(
-                f"{self.base_url}/messages", auth=("api", self.api_key), data=data
+                f"{self.base_url}/messages",
+                auth=("api", self.api_key),
+                data=data,
+                files=files or None,
+                timeout=Config.MAIL_TIMEOUT,
             )
 
             response.raise_for_status()
@@ -101,10 +126,7 @@ class MailgunMailer:
 
         return self.send_email(to_email, subject, text=text, html=html)
 
-    def send_external_credentials(self, to_email, name, event_name, credentials):
-        """
-        Send credentials to external participant
-        """
+    def _external_credentials_content(self, name, event_name, enrollment, password):
         subject = f"Your Login Credentials for {event_name}"
 
         text = f"""
@@ -112,8 +134,8 @@ class MailgunMailer:
 
         Thank you for registering for {event_name}. Here are your login credentials:
 
-        Enrollment Number: {credentials["enrollment_number"]}
-        Password: {credentials["password"]}
+        Enrollment Number: {enrollment}
+        Password: {password}
 
         Please save these credentials as they cannot be recovered later.
         You can use these credentials to login and view event details.
@@ -129,8 +151,8 @@ class MailgunMailer:
             <p>Thank you for registering for <strong>{event_name}</strong>. Here are your login credentials:</p>
             <div style="background-color: #F3F4F6; padding: 20px; border-radius: 8px; margin: 20px 0;">
                 <p style="margin: 0; font-family: monospace; font-size: 16px;">
-                    <strong>Enrollment Number:</strong> {credentials["enrollment_number"]}<br>
-                    <strong>Password:</strong> {credentials["password"]}
+                    <strong>Enrollment Number:</strong> {enrollment}<br>
+                    <strong>Password:</strong> {password}
                 </p>
             </div>
             <p style="color: #DC2626; font-weight: bold;">
@@ -141,8 +163,59 @@ class MailgunMailer:
         </div>
         """
 
+        return subject, text, html
+
+    def send_external_credentials(self, to_email, name, event_name, credentials):
+        """
+        Send credentials to external participant
+        """
+        subject, text, html = self._external_credentials_content(
+            name,
+            event_name,
+            credentials["enrollment_number"],
+            credentials["password"],
+        )
+
         return self.send_email(to_email, subject, text=text, html=html)
 
+    def send_external_credentials_batch(self, event_name, recipients):
+        """
+        Send credentials to a whole team with Mailgun batch sending.
+
+        recipients is a list of dicts with email, name, enrollment_number and
+        password; each member only receives their own credentials.
+        """
+        subject, text, html = self._external_credentials_content(
+            "%recipient.name%",
+            event_name,
+            "%recipient.enrollment_number%",
+            "%recipient.password%",
+        )
+
+        success = True
+        # Mailgun accepts at most 1000 recipients per batch message
+        for start in range(0, len(recipients), 1000):
+            chunk = recipients[start : start + 1000]
+            recipient_variables = {
+                r["email"]: {
+                    "name": r["name"],
+                    "enrollment_number": r["enrollment_number"],
+                    "password": r["password"],
+                }
+                for r in chunk
+            }
+            success = (
+                self.send_email(
+                    [r["email"] for r in chunk],
+                    subject,
+                    text=text,
+                    html=html,
+                    recipient_variables=recipient_variables,
+                )
+                and success
+            )
+        return success
+
     def send_password_reset_email(self, to_email, otp):
         """Send password reset email with OTP"""
         subject = "Reset Your AUP Events Password"
@@ -180,9 +253,20 @@ class MailgunMailer:
         return self.send_email(to_email, subject, text=text, html=html)
 
     def send_event_registration_confirmation(
-        self, to_email, name, event_name, event_date, venue, organizer_email
+        self,
+        to_email,
+        name,
+        event_name,
+        event_date,
+        venue,
+        organizer_email,
+        checkin_qr=None,
     ):
-        """Send a professional event registration confirmation email to the participant."""
+        """Send a professional event registration confirmation email to the participant.
+
+        checkin_qr is the PNG of the participant's check-in QR code, shown
+        inline so it can be scanned at the entry gate.
+        """
         subject = f"🎉 Registration Confirmed: {event_name}"
 
         text = f"""
@@ -206,6 +290,18 @@ class MailgunMailer:
         AUP Events Team
         """
 
+        checkin_html = (
+            """
+            <div style="text-align: center; margin: 20px 0;">
+                <p><strong>Your check-in code</strong></p>
+                <img src="cid:checkin.png" alt="Check-in QR code" width="200" height="200">
+                <p style="font-size: 12px; color: #666;">Show this QR code at the entry gate.</p>
+            </div>
+            """
+            if checkin_qr
+            else ""
+        )
+
         html = f"""
         <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto; color: #333;">
             <h2 style="color: #4F46E5; text-align: center;">🎉 Registration Confirmed</h2>
@@ -218,6 +314,7 @@ class MailgunMailer:
                 <p><strong>🏢 Venue:</strong> {venue}</p>
             </div>
 
+            {checkin_html}
             <p>Stay tuned for more details, and if you have any questions, feel free to contact the organiser at <a href="mailto:{organizer_email}" style="color: #4F46E5;">{organizer_email}</a>.</p>
             <p>Looking forward to your participation!</p>
 
@@ -226,7 +323,8 @@ class MailgunMailer:
         </div>
         """
 
-        return self.send_email(to_email, subject, text=text, html=html)
+        inline = [("checkin.png", checkin_qr, "image/png")] if checkin_qr else None
+        return self.send_email(to_email, subject, text=text, html=html, inline=inline)
 
     def send_event_registration_notification(self, to_email, name, event_name):
         """Send a notification email to the event organizer about a new registration"""
@@ -0,0 +1,47 @@
+from pymongo.read_preferences import SecondaryPreferred
+from pymongo.write_concern import WriteConcern
+from config import Config
+
+
+def client_options():
+    """MongoClient/AsyncMongoClient keyword arguments from the MONGO_* settings"""
+    options = {
+        "maxPoolSize": Config.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": Config.MONGO_MIN_POOL_SIZE,
+        "appname": Config.MONGO_APP_NAME,
+    }
+    # 0 leaves a timeout unlimited
+    timeouts = {
+        "maxIdleTimeMS": Config.MONGO_MAX_IDLE_TIME_MS,
+        "waitQueueTimeoutMS": Config.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "connectTimeoutMS": Config.MONGO_CONNECT_TIMEOUT_MS,
+        "socketTimeoutMS": Config.MONGO_SOCKET_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": Config.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    }
+    options.update({name: value or None for name, value in timeouts.items()})
+    if Config.MONGO_COMPRESSORS:
+        options["compressors"] = Config.MONGO_COMPRESSORS
+    return options
+
+
+def secondary_reads(collection):
+    """collection for reads that may be served by a lagging secondary.
+
+    Members further than MONGO_SECONDARY_MAX_STALENESS seconds behind the
+    primary are skipped, and the primary answers when no secondary is
+    available (or on a standalone server).
+    """
+    if not Config.MONGO_SECONDARY_MAX_STALENESS:
+        return collection
+    return collection.with_options(
+        read_preference=SecondaryPreferred(
+            max_staleness=Config.MONGO_SECONDARY_MAX_STALENESS
+        )
+    )
+
+
+def majority_writes(collection):
+    """collection for writes acknowledged only once a majority has them"""
+    return collection.with_options(
+        write_concern=WriteConcern("majority", wtimeout=Config.MONGO_WRITE_TIMEOUT_MS)
+    )
@@ -0,0 +1,133 @@
+from flask import request
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.http import parse_options_header
+from werkzeug.sansio.multipart import (
+    Data,
+    Epilogue,
+    Field,
+    File,
+    MultipartDecoder,
+    NeedData,
+)
+
+from app.utils.file_upload import ImageSpool, discard_spool
+from config import Config
+
+# Bytes read from the request body at a time
+READ_CHUNK_SIZE = 64 * 1024
+DECODER_BUFFER_LIMIT = 1024 * 1024
+
+
+class UploadTooLarge(Exception):
+    """The request body, a form field or a file is over its size limit"""
+
+
+class InvalidUpload(Exception):
+    """The request body is not valid multipart/form-data"""
+
+
+def parse_image_form(image_fields, max_file_size=None, max_total=None):
+    """Read the current multipart request as a stream of form fields and images.
+
+    Files named in image_fields are streamed into the image spool (see
+    ImageSpool), so their content is validated and hashed while it is read
+    and never held in memory; any other file is read and dropped. Limits
+    are enforced on the bytes actually received, so the body is rejected
+    as soon as it goes over a limit (or before reading when Content-Length
+    already does).
+
+    Returns (form, images): form maps field names to strings and images
+    maps each image field to its spool dict, or None when the upload is
+    not an image. Raises UploadTooLarge or InvalidUpload; spooled files
+    are removed in that case.
+    """
+    max_file_size = max_file_size or Config.IMAGE_MAX_UPLOAD_BYTES
+    max_total = max_total or Config.MAX_CONTENT_LENGTH
+    max_field = Config.FORM_FIELD_MAX_BYTES
+
+    content_type, options = parse_options_header(request.headers.get("Content-Type"))
+    if content_type != "multipart/form-data":
+        # Plain forms have no files; MAX_CONTENT_LENGTH limits them
+        return request.form.to_dict(), {}
+    if request.content_length is not None and request.content_length > max_total:
+        raise UploadTooLarge(f"Request body is larger than {max_total} bytes")
+    boundary = options.get("boundary", "").encode("latin-1")
+    if not boundary:
+        raise InvalidUpload("Missing multipart boundary")
+
+    # The decoder buffers at most what follows the last line break of the
+    # data received so far; binary files have line breaks every few hundred
+    # bytes, so a larger buffer means a crafted body
+    decoder = MultipartDecoder(boundary, max_form_memory_size=DECODER_BUFFER_LIMIT)
+    form = {}
+    images = {}
+    spools = []
+    part = None
+    spool = None
+    value = bytearray()
+    size = 0
+    received = 0
+    try:
+        while True:
+            event = decoder.next_event()
+            if isinstance(event, NeedData):
+                chunk = request.stream.read(READ_CHUNK_SIZE)
+                received += len(chunk)
+                if received > max_total:
+                    raise UploadTooLarge(
+                        f"Request body is larger than {max_total} bytes"
+                    )
+                decoder.receive_data(chunk or None)
+            elif isinstance(event, (Field, File)):
+                part = event
+                spool = None
+                value = bytearray()
+                size = 0
+                if (
+                    isinstance(event, File)
+                    and event.name in image_fields
+                    and event.name not in images
+                ):
+                    spool = ImageSpool(
+                        event.filename, event.headers.get("Content-Type")
+                    )
+                    spools.append(spool)
+            elif isinstance(event, Data):
+                size += len(event.data)
+                if isinstance(part, Field):
+                    if size > max_field:
+                        raise UploadTooLarge(
+                            f"Form field {part.name} is larger than {max_field} bytes"
+                        )
+                    value += event.data
+                    if not event.more_data:
+                        form[part.name] = value.decode("utf-8", "replace")
+                else:
+                    if size > max_file_size:
+                        raise UploadTooLarge(
+                            f"Uploaded file is larger than {max_file_size} bytes"
+                        )
+                    if spool is not None:
+                        spool.write(event.data)
+                        if not event.more_data:
+                            images[part.name] = spool.close()
+            elif isinstance(event, Epilogue):
+                break
+    except Exception as e:
+        _discard(spools)
+        # e.g. a truncated body or a part without Content-Disposition
+        if isinstance(e, (RequestEntityTooLarge, ValueError)):
+            raise InvalidUpload("Malformed multipart body")
+        raise
+    return form, images
+
+
+def _discard(spools):
+    for spool in spools:
+        spool.discard()
+
+
+def discard_images(images):
+    """Remove spooled images that were not handed to the uploader"""
+    for spool in images.values():
+        discard_spool(spool)
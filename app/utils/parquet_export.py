@@ -0,0 +1,284 @@
+import os
+import uuid
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+from config import Config
+
+# Column dtypes of the exported tables; pandas nullable types keep missing
+# values as nulls in Parquet instead of turning ints into floats
+EVENT_DTYPES = {
+    "event_id": "string",
+    "name": "string",
+    "event_code": "string",
+    "creator_id": "string",
+    "venue": "string",
+    "date": "datetime64[ns, UTC]",
+    "created_at": "datetime64[ns, UTC]",
+    "max_participants": "Int32",
+    "participant_count": "Int32",
+    "is_approved": "boolean",
+    "allow_external": "boolean",
+    "version": "Int64",
+}
+PARTICIPANT_DTYPES = {
+    "event_id": "string",
+    "enrollment_number": "string",
+    "is_external": "boolean",
+    "branch": "string",
+    "year": "string",
+    "registered_at": "datetime64[ns, UTC]",
+    "attendance": "boolean",
+}
+
+# Partition used for rows without a timestamp (e.g. very old registrations)
+UNKNOWN_MONTH = "unknown"
+WATERMARK_ID = "parquet_export"
+
+
+def _month(value):
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m")
+    return UNKNOWN_MONTH
+
+
+def _int_or_none(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _local_zone():
+    # None makes astimezone() use the server's own time zone
+    return ZoneInfo(Config.APP_TIMEZONE) if Config.APP_TIMEZONE else None
+
+
+def _from_utc(value):
+    """A stored UTC datetime (e.g. registered_at) as an aware UTC datetime"""
+    if not isinstance(value, datetime):
+        return None
+    return value.replace(tzinfo=timezone.utc)
+
+
+def _from_local(value):
+    """A datetime stored as naive local time, as written by datetime.now()
+    (events' created_at and date), as an aware UTC datetime"""
+    if not isinstance(value, datetime):
+        return None
+    zone = _local_zone()
+    local = value.replace(tzinfo=zone) if zone else value.astimezone()
+    return local.astimezone(timezone.utc)
+
+
+def _to_local(value):
+    """Naive UTC bound as the naive local time it is stored as"""
+    return (
+        value.replace(tzinfo=timezone.utc)
+        .astimezone(_local_zone())
+        .replace(tzinfo=None)
+    )
+
+
+class ParquetExporter:
+    """Export events and participants to month-partitioned Parquet files.
+
+    Documents are read with batched cursors and written batch by batch, so
+    memory is bounded by batch_size rather than by the size of the
+    collections. Output follows the hive layout understood by pandas,
+    pyarrow and Spark:
+
+        <output_dir>/events/month=2024-03/part-<run>-<n>.parquet
+        <output_dir>/participants/month=2024-03/part-<run>-<n>.parquet
+
+    Events are partitioned by created_at and participants by registered_at,
+    by UTC month. Events store created_at and date in the app's local time
+    (APP_TIMEZONE, or the server's zone); both are exported as UTC.
+    Incremental runs export rows created after the previous run's watermark
+    and append new part files; rows changed after they were exported (e.g.
+    attendance) are picked up by a full export, which should be written to
+    a fresh output directory.
+    """
+
+    def __init__(self, mongo, output_dir, batch_size=5000):
+        self.mongo = mongo
+        self.output_dir = output_dir
+        self.batch_size = batch_size
+        self.run_id = uuid.uuid4().hex[:12]
+        self._parts = 0
+
+    def get_watermark(self):
+        state = self.mongo.db.export_state.find_one({"_id": WATERMARK_ID})
+        return state["watermark"] if state else None
+
+    def export(self, full=False):
+        """Run an export and return a summary with row counts and the new watermark"""
+        since = None if full else self.get_watermark()
+        # Fixed upper bound, so rows written during the export are left for
+        # the next run instead of being split across two
+        until = datetime.now(timezone.utc).replace(tzinfo=None)
+        # MongoDB keeps milliseconds; truncate so the stored watermark is exact
+        until = until.replace(microsecond=until.microsecond // 1000 * 1000)
+
+        events = self._export_events(since, until)
+        participants = self._export_participants(since, until)
+
+        # Only move the watermark once every batch has been written
+        self.mongo.db.export_state.update_one(
+            {"_id": WATERMARK_ID},
+            {"$set": {"watermark": until, "run_id": self.run_id}},
+            upsert=True,
+        )
+        return {
+            "since": since.isoformat() if since else None,
+            "watermark": until.isoformat(),
+            "events": events,
+            "participants": participants,
+        }
+
+    def _window(self, field, since, until):
+        window = {"$lte": until}
+        if since:
+            window["$gt"] = since
+        return {field: window}
+
+    def _export_events(self, since, until):
+        # created_at is stored in local time, the watermark in UTC
+        query = self._window("created_at", since and _to_local(since), _to_local(until))
+        if since is None:
+            # Old events without created_at only go out with full exports
+            query = {"$or": [query, {"created_at": {"$exists": False}}]}
+        cursor = self.mongo.db.events.aggregate(
+            [
+                {"$match": query},
+                {
+                    "$project": {
+                        "name": 1,
+                        "event_code": 1,
+                        "creator_id": 1,
+                        "venue": 1,
+                        "date": 1,
+                        "created_at": 1,
+                        "max_participants": 1,
+                        "is_approved": 1,
+                        "allow_external": 1,
+                        "version": 1,
+                        "participant_count": {
+                            "$size": {"$ifNull": ["$participants", []]}
+                        },
+                    }
+                },
+            ],
+            allowDiskUse=True,
+            batchSize=self.batch_size,
+        )
+        rows = (
+            {
+                "event_id": str(event["_id"]),
+                "name": event.get("name"),
+                "event_code": event.get("event_code"),
+                "creator_id": (
+                    str(event["creator_id"]) if event.get("creator_id") else None
+                ),
+                "venue": event.get("venue"),
+                "date": _from_local(event.get("date")),
+                "created_at": _from_local(event.get("created_at")),
+                "max_participants": _int_or_none(event.get("max_participants")),
+                "participant_count": event.get("participant_count", 0),
+                "is_approved": event.get("is_approved"),
+                "allow_external": event.get("allow_external"),
+                "version": _int_or_none(event.get("version")),
+            }
+            for event in cursor
+        )
+        return self._write("events", rows, EVENT_DTYPES, "created_at")
+
+    def _export_participants(self, since, until):
+        window = self._window("registered_at", since, until)
+        if since is None:
+            # Old registrations without registered_at only go out with full exports
+            window = {"$or": [window, {"registered_at": {"$exists": False}}]}
+        pipeline = [
+            {"$project": {"participant": "$participants"}},
+            {"$unwind": "$participant"},
+            {
+                "$project": {
+                    # Old events stored bare enrollment numbers
+                    "enrollment_number": {
+                        "$ifNull": ["$participant.enrollment_number", "$participant"]
+                    },
+                    "branch": "$participant.branch",
+                    "year": "$participant.year",
+                    "registered_at": "$participant.registered_at",
+                    "attendance": "$participant.attendance",
+                }
+            },
+            {"$match": window},
+        ]
+        if since is not None:
+            # Skip events without new registrations before unwinding
+            pipeline.insert(
+                0, {"$match": {"participants.registered_at": {"$gt": since}}}
+            )
+        cursor = self.mongo.db.events.aggregate(
+            pipeline, allowDiskUse=True, batchSize=self.batch_size
+        )
+        rows = (
+            {
+                "event_id": str(participant["_id"]),
+                "enrollment_number": str(participant["enrollment_number"]),
+                "is_external": str(participant["enrollment_number"]).startswith("EXT"),
+                "branch": participant.get("branch"),
+                "year": (
+                    str(participant["year"])
+                    if participant.get("year") not in (None, "")
+                    else None
+                ),
+                "registered_at": _from_utc(participant.get("registered_at")),
+                "attendance": participant.get("attendance"),
+            }
+            for participant in cursor
+        )
+        return self._write("participants", rows, PARTICIPANT_DTYPES, "registered_at")
+
+    def _write(self, table, rows, dtypes, month_field):
+        """Write rows in batch_size chunks, one Parquet file per month per chunk"""
+        total = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                total += self._write_batch(table, batch, dtypes, month_field)
+                batch = []
+        if batch:
+            total += self._write_batch(table, batch, dtypes, month_field)
+        return total
+
+    def _write_batch(self, table, batch, dtypes, month_field):
+        months = {}
+        for row in batch:
+            months.setdefault(_month(row[month_field]), []).append(row)
+
+        for month, rows in months.items():
+            frame = pd.DataFrame.from_records(rows, columns=list(dtypes))
+            for column, dtype in dtypes.items():
+                if dtype.startswith("datetime64"):
+                    # Rows carry aware UTC datetimes (see _from_local/_from_utc)
+                    frame[column] = pd.to_datetime(frame[column], utc=True)
+                else:
+                    frame[column] = frame[column].astype(dtype)
+
+            directory = os.path.join(self.output_dir, table, f"month={month}")
+            os.makedirs(directory, exist_ok=True)
+            self._parts += 1
+            path = os.path.join(
+                directory, f"part-{self.run_id}-{self._parts:05d}.parquet"
+            )
+            # Write next to the final name first so readers never see a
+            # partially written file
+            tmp_path = path + ".tmp"
+            frame.to_parquet(tmp_path, engine="pyarrow", index=False)
+            os.replace(tmp_path, path)
+        return len(batch)
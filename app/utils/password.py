@@ -1,9 +1,57 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from threading import Lock
+
 import bcrypt
 
+from app.utils.concurrency import run_blocking
+from config import Config
 
-def generate_password_hash(password):
+_executor = None
+_executor_pid = None
+_executor_lock = Lock()
+
+
+def _hash(password):
     return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
 
 
+def generate_password_hash(password):
+    # bcrypt is deliberately slow; keep it off the event loop of green workers
+    return run_blocking(_hash, password)
+
+
 def check_password_hash(password, password_hash):
-    return bcrypt.checkpw(password.encode("utf-8"), password_hash)
+    return run_blocking(bcrypt.checkpw, password.encode("utf-8"), password_hash)
+
+
+def _get_executor():
+    global _executor, _executor_pid
+    with _executor_lock:
+        # A pool inherited through fork belongs to the parent process
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ProcessPoolExecutor(
+                max_workers=Config.PASSWORD_HASH_PROCESSES,
+                # Spawned workers do not inherit the web worker's threads/sockets
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def generate_password_hashes(passwords):
+    """Hash many passwords, spreading the bcrypt work across CPU cores.
+
+    Uses a pool of PASSWORD_HASH_PROCESSES spawned processes, started on
+    first use and kept for the life of the web worker.
+    """
+    passwords = list(passwords)
+    if len(passwords) < 2:
+        return [generate_password_hash(password) for password in passwords]
+
+    executor = _get_executor()
+    chunksize = max(1, len(passwords) // (Config.PASSWORD_HASH_PROCESSES * 4))
+    return run_blocking(
+        lambda: list(executor.map(_hash, passwords, chunksize=chunksize))
+    )
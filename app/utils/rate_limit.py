@@ -0,0 +1,137 @@
+import math
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+from threading import Lock
+
+from flask import jsonify, request
+from pymongo import ReturnDocument
+
+from config import Config
+
+
+class SlidingWindowLimiter:
+    """Allow at most `limit` hits per key in any `window` seconds.
+
+    Hits are always counted in process memory, which rejects abusive clients
+    without touching the database. With the "mongo" storage backend the
+    in-memory count is only a fast path; the decision is made against a
+    counter shared by every worker, approximating a sliding window from the
+    current and previous fixed windows.
+    """
+
+    def __init__(self, mongo, name, limit, window, storage=None):
+        self.mongo = mongo
+        self.name = name
+        self.limit = limit
+        self.window = window
+        self.storage = storage or Config.RATE_LIMIT_STORAGE
+        self._hits = defaultdict(deque)
+        self._lock = Lock()
+        self._last_sweep = time.time()
+        self._index_ready = False
+
+    def hit(self, key):
+        """Record a hit for key, returning (allowed, retry_after_seconds)"""
+        now = time.time()
+        allowed, retry_after = self._hit_local(key, now)
+        if not allowed or self.storage != "mongo":
+            return allowed, retry_after
+        return self._hit_shared(key, now)
+
+    def _hit_local(self, key, now):
+        with self._lock:
+            if now - self._last_sweep >= self.window:
+                self._sweep(now)
+            hits = self._hits[key]
+            while hits and hits[0] <= now - self.window:
+                hits.popleft()
+            if len(hits) >= self.limit:
+                return False, hits[0] + self.window - now
+            hits.append(now)
+            return True, 0
+
+    def _sweep(self, now):
+        """Forget keys with no hits left in the window (called with the lock held)"""
+        for key in list(self._hits):
+            hits = self._hits[key]
+            while hits and hits[0] <= now - self.window:
+                hits.popleft()
+            if not hits:
+                del self._hits[key]
+        self._last_sweep = now
+
+    def _hit_shared(self, key, now):
+        collection = self.mongo.db.rate_limits
+        if not self._index_ready:
+            collection.create_index("expires_at", expireAfterSeconds=0)
+            self._index_ready = True
+
+        window_index = int(now // self.window)
+        elapsed = now - window_index * self.window
+        current = collection.find_one_and_update(
+            {"_id": f"{self.name}:{key}:{window_index}"},
+            {
+                "$inc": {"count": 1},
+                "$setOnInsert": {
+                    "expires_at": datetime.now(timezone.utc)
+                    + timedelta(seconds=2 * self.window)
+                },
+            },
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        previous = collection.find_one(
+            {"_id": f"{self.name}:{key}:{window_index - 1}"}, {"count": 1}
+        )
+        previous_count = previous["count"] if previous else 0
+
+        estimate = previous_count * (1 - elapsed / self.window) + current["count"]
+        if estimate > self.limit:
+            return False, self.window - elapsed
+        return True, 0
+
+
+def client_ip():
+    # X-Forwarded-For is resolved by ProxyFix (see create_app), trusting only
+    # the PROXY_HOPS entries appended by our own proxies
+    return request.remote_addr or "unknown"
+
+
+def json_field(name):
+    """Key function reading a (case-insensitive) field from the JSON body"""
+
+    def key():
+        data = request.get_json(silent=True)
+        value = data.get(name) if isinstance(data, dict) else None
+        return str(value).strip().lower() if value else None
+
+    return key
+
+
+def rate_limited(*rules):
+    """Reject the request with 429 once any (limiter, key_func) rule is exhausted"""
+
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            for limiter, key_func in rules:
+                key = key_func()
+                if not key:
+                    continue
+                allowed, retry_after = limiter.hit(key)
+                if not allowed:
+                    response = jsonify(
+                        {"error": "Too many requests. Please try again later."}
+                    )
+                    response.status_code = 429
+                    response.headers["Retry-After"] = str(
+                        max(1, math.ceil(retry_after))
+                    )
+                    return response
+            return f(*args, **kwargs)
+
+        return decorated
+
+    return decorator
@@ -0,0 +1,182 @@
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# <format>-<event id>-<sha256>, see ReportCache.key
+KEY_PATTERN = re.compile(r"^([a-z]+)-([0-9a-f]{24})-[0-9a-f]{64}$")
+
+
+class ReportCache:
+    """Rendered report files on local disk, evicted by age and total size.
+
+    Job state is kept next to the artifacts as empty marker files named
+    <key>.<state>, so every worker process on the machine sees it.
+    """
+
+    def __init__(self, directory, max_bytes, max_age):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(event_id, version, report_format, fields_printed=None):
+        """Artifact key; the format and event prefixes let pollers know what
+        they will get and let the routes check that a job belongs to the event
+        """
+        raw = f"{event_id}:{version or 0}:{report_format}:{fields_printed or ''}"
+        digest = hashlib.sha256(raw.encode("utf-8")).hexdigest()
+        return f"{report_format}-{event_id}-{digest}"
+
+    @staticmethod
+    def parse_key(key):
+        """Return (report_format, event_id) for a well-formed key, else None"""
+        match = KEY_PATTERN.match(key)
+        return match.groups() if match else None
+
+    def path(self, key):
+        return os.path.join(self.directory, key)
+
+    def get(self, key):
+        """Return the artifact path if it exists and is fresh, else None"""
+        path = self.path(key)
+        try:
+            if time.time() - os.path.getmtime(path) <= self.max_age:
+                return path
+        except OSError:
+            pass
+        return None
+
+    def marker_age(self, key, state):
+        """Seconds since the state marker was written, or None if there is none"""
+        try:
+            return time.time() - os.path.getmtime(f"{self.path(key)}.{state}")
+        except OSError:
+            return None
+
+    def mark(self, key, state):
+        with open(f"{self.path(key)}.{state}", "w"):
+            pass
+
+    def claim(self, key, state, stale_after):
+        """Create the state marker unless a fresher one exists; True if created"""
+        path = f"{self.path(key)}.{state}"
+        for _ in range(2):
+            try:
+                os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return True
+            except FileExistsError:
+                age = self.marker_age(key, state)
+                if age is not None and age <= stale_after:
+                    return False
+                # Left behind by a worker that died mid-job
+                self._remove(path)
+        return False
+
+    def unmark(self, key, state):
+        self._remove(f"{self.path(key)}.{state}")
+
+    def put(self, key, fileobj):
+        # Write to a temp file first so readers never see a partial artifact
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as tmp:
+            shutil.copyfileobj(fileobj, tmp)
+        os.replace(tmp_path, self.path(key))
+        self.evict()
+
+    def evict(self):
+        now = time.time()
+        artifacts = []
+        for entry in os.scandir(self.directory):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            if entry.name.endswith(".tmp"):
+                continue
+            if "." in entry.name:
+                # State markers take no space; they only expire with age
+                if now - stat.st_mtime > self.max_age:
+                    self._remove(entry.path)
+                continue
+            if now - stat.st_mtime > self.max_age:
+                self._remove(entry.path)
+            else:
+                artifacts.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in artifacts)
+        # Drop the oldest artifacts until the cache fits its size budget
+        for _, size, path in sorted(artifacts):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class ReportJobs:
+    """Render reports on background workers and store them in a ReportCache.
+
+    Jobs are identified by their cache key, so requesting the same report
+    while it is rendering joins the running job instead of starting another,
+    whichever worker process receives the request. A job still pending after
+    stale_after seconds is taken to have died with its worker.
+    """
+
+    PENDING = "pending"
+    READY = "ready"
+    EMPTY = "empty"
+    FAILED = "failed"
+
+    def __init__(self, cache, workers, stale_after):
+        self.cache = cache
+        self.stale_after = stale_after
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="report"
+        )
+
+    def submit(self, key, render):
+        """Start rendering unless the job is already running; returns the job id"""
+        if not self.cache.claim(key, self.PENDING, self.stale_after):
+            return key
+        self.cache.unmark(key, self.EMPTY)
+        self.cache.unmark(key, self.FAILED)
+        self._executor.submit(self._run, key, render)
+        return key
+
+    def status(self, key):
+        if self.cache.get(key):
+            return self.READY
+        age = self.cache.marker_age(key, self.PENDING)
+        if age is not None and age <= self.stale_after:
+            return self.PENDING
+        # Outcomes that leave no artifact behind are kept for polling
+        for state in (self.EMPTY, self.FAILED):
+            age = self.cache.marker_age(key, state)
+            if age is not None and age <= self.cache.max_age:
+                return state
+        return None
+
+    def _run(self, key, render):
+        try:
+            output = render()
+            if output is None:
+                self.cache.mark(key, self.EMPTY)
+                return
+            with output:
+                self.cache.put(key, output)
+        except Exception as e:
+            print(f"Error rendering report {key}: {str(e)}")
+            self.cache.mark(key, self.FAILED)
+        finally:
+            self.cache.unmark(key, self.PENDING)
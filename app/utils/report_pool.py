@@ -0,0 +1,143 @@
+import json
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import datetime
+from threading import BoundedSemaphore, Lock
+
+from config import Config
+
+
+class ReportBusyError(Exception):
+    """Raised when every report rendering slot stays busy past the timeout"""
+
+
+class ReportTimeoutError(Exception):
+    """Raised when a report takes longer than REPORT_TIMEOUT_SECONDS to render"""
+
+
+_executor = None
+_executor_pid = None
+_executor_lock = Lock()
+_slots = BoundedSemaphore(Config.REPORT_PROCESSES)
+
+
+def _get_executor():
+    global _executor, _executor_pid
+    with _executor_lock:
+        # A pool inherited through fork belongs to the parent process
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ProcessPoolExecutor(
+                max_workers=Config.REPORT_PROCESSES,
+                # Spawned workers do not inherit the web worker's threads/sockets
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def run_in_pool(func, *args, suffix, timeout=None):
+    """Run func(*args, output_path) in the report process pool.
+
+    output_path is a new temp file ending in suffix for func to write the
+    report to; it is returned once the render succeeds and removed if it
+    fails. At most REPORT_PROCESSES renders run at once per web worker;
+    callers wait for a free slot for up to the same timeout as the render
+    itself.
+    """
+    timeout = timeout or Config.REPORT_TIMEOUT_SECONDS
+    if not _slots.acquire(timeout=timeout):
+        raise ReportBusyError("Report rendering is busy, please try again later")
+    fd, output_path = tempfile.mkstemp(suffix=suffix)
+    os.close(fd)
+    try:
+        executor = _get_executor()
+        future = executor.submit(func, *args, output_path)
+        try:
+            future.result(timeout=timeout)
+        except FutureTimeoutError:
+            # A running task cannot be cancelled: stop it by killing the pool,
+            # so the slot is only freed once the render is really over
+            _recycle(executor)
+            raise ReportTimeoutError("Report rendering timed out")
+    except BaseException:
+        _remove(output_path)
+        raise
+    finally:
+        _slots.release()
+    return output_path
+
+
+def _recycle(executor):
+    """Terminate the pool's processes; the next render starts a fresh pool.
+
+    Other renders running in the same pool fail with BrokenProcessPool.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    # ProcessPoolExecutor has no public way to stop a running task
+    processes = list((executor._processes or {}).values())
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        process.join()
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def write_rows(rows):
+    """Spool plain participant rows to a JSON-lines file and return its path"""
+    fd, path = tempfile.mkstemp(suffix=".jsonl")
+    with os.fdopen(fd, "w") as file:
+        for row in rows:
+            file.write(json.dumps(row, default=_encode_value))
+            file.write("\n")
+    return path
+
+
+def read_rows(path):
+    with open(path) as file:
+        for line in file:
+            yield json.loads(line)
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def render_pdf_file(event, participant_count, labels, fields, rows_path, output_path):
+    """Process pool task: render the PDF report to output_path"""
+    from app.utils.pdf_report import render_participants_pdf
+
+    data = render_participants_pdf(
+        event, participant_count, labels, fields, read_rows(rows_path)
+    )
+    with open(output_path, "wb") as file:
+        file.write(data)
+
+
+def render_excel_file(headers, rows_path, output_path):
+    """Process pool task: render the Excel report to output_path"""
+    from app.utils.excel_report import render_participants_excel
+
+    render_participants_excel(headers, read_rows(rows_path), output_path)
+
+
+def open_and_unlink(path):
+    """Open a rendered report and drop its directory entry; the data lives
+    until the returned file object is closed"""
+    file = open(path, "rb")
+    os.remove(path)
+    return file
@@ -0,0 +1,106 @@
+import hashlib
+import os
+import re
+import tempfile
+
+import requests
+from werkzeug.security import safe_join
+
+from app.models.image import HASH_CHUNK_SIZE
+from config import Config
+
+# Keys of files written by LocalStorage: <ab>/<cd>/<sha256>.<ext>
+CONTENT_KEY = re.compile(r"^[0-9a-f]{2}/[0-9a-f]{2}/([0-9a-f]{64})\.[a-z0-9]+$")
+
+
+class FivemerrStorage:
+    """Store files on the Fivemerr CDN"""
+
+    def save(self, file, filename, mimetype):
+        """Store a file object; returns its public URL, or None on failure"""
+        # Prepare the file upload to Fivemerr
+        files = {"file": (filename, file, mimetype)}
+        headers = {"Authorization": Config.FIVEMERR_API_KEY}
+
+        # Make the POST request to Fivemerr
+        response = requests.post(
+            "https://api.fivemerr.com/v1/media/images",
+            files=files,
+            headers=headers,
+            timeout=Config.IMAGE_UPLOAD_TIMEOUT,
+        )
+
+        # Check if upload was successful
+        if response.status_code == 200:
+            data = response.json()
+            return data["url"]  # Return the CDN URL
+        print(f"Fivemerr upload failed: {response.text}")
+        return None
+
+
+class LocalStorage:
+    """Store files on local disk, named by the SHA-256 of their content.
+
+    Files are sharded into directories by the first two pairs of hex
+    digits (e.g. 3f/a2/3fa2...c1.webp) so no directory grows too large,
+    and saving the same content twice keeps one copy. Files are served by
+    the media blueprint; since a name never changes content they can be
+    cached forever.
+    """
+
+    def __init__(self, root=None, base_url=None):
+        self.root = root or Config.LOCAL_STORAGE_DIR
+        self.base_url = (base_url or Config.LOCAL_STORAGE_URL).rstrip("/")
+
+    def save(self, file, filename, mimetype):
+        extension = filename.rsplit(".", 1)[1].lower() if "." in filename else "bin"
+        os.makedirs(self.root, exist_ok=True)
+        # Stream into a temporary file next to the shards, then move it
+        # into place so readers never see a partially written file
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        digest = hashlib.sha256()
+        try:
+            with os.fdopen(fd, "wb") as stored:
+                for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+                    stored.write(chunk)
+            key = self.key_for(digest.hexdigest(), extension)
+            path = os.path.join(self.root, key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return f"{self.base_url}/{key}"
+
+    @staticmethod
+    def key_for(digest, extension):
+        return f"{digest[:2]}/{digest[2:4]}/{digest}.{extension}"
+
+    def path_for(self, key):
+        """Return the path of a stored file, or None if key does not name one.
+
+        Only finished content-addressed files are served: in-flight .tmp
+        files and anything else under the root are not.
+        """
+        digest = self.etag_for(key)
+        if digest is None or not key.startswith(f"{digest[:2]}/{digest[2:4]}/"):
+            return None
+        path = safe_join(self.root, key)
+        if path is None or not os.path.isfile(path):
+            return None
+        return path
+
+    @staticmethod
+    def etag_for(key):
+        """Content digest of a content-addressed key, None for other keys"""
+        match = CONTENT_KEY.match(key)
+        return match.group(1) if match else None
+
+
+def get_storage():
+    """Return the storage backend selected by STORAGE_BACKEND"""
+    if Config.STORAGE_BACKEND == "local":
+        return LocalStorage()
+    return FivemerrStorage()
@@ -0,0 +1,129 @@
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from app.models.user import AMITY_EMAIL_PATTERN
+from app.utils.password import generate_password_hashes
+
+REQUIRED_COLUMNS = [
+    "name",
+    "amity_email",
+    "enrollment_number",
+    "password",
+    "branch",
+    "year",
+    "phone_number",
+]
+
+
+def read_students(file, filename):
+    """Read a CSV or XLSX upload into a frame of stripped strings"""
+    extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    if extension == "csv":
+        reader = pd.read_csv
+    elif extension == "xlsx":
+        reader = pd.read_excel
+    else:
+        raise ValueError("Only CSV and XLSX files are supported")
+    try:
+        df = reader(file, dtype=str, keep_default_na=False)
+    except Exception as e:
+        # Malformed CSV, corrupt or mislabelled workbook
+        raise ValueError(f"Could not read {extension.upper()} file: {str(e)}")
+
+    df.columns = [str(column).strip().lower() for column in df.columns]
+    missing = [column for column in REQUIRED_COLUMNS if column not in df.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+    df = df[REQUIRED_COLUMNS].fillna("")
+    return df.apply(lambda column: column.astype(str).str.strip())
+
+
+def validate_students(df):
+    """Return a Series with the first validation error for each row ("" if valid)"""
+    errors = pd.Series("", index=df.index)
+    years = pd.to_numeric(df["year"], errors="coerce")
+    checks = [
+        (df.eq("").any(axis=1), "Missing required fields"),
+        (~df["amity_email"].str.match(AMITY_EMAIL_PATTERN), "Invalid Amity email"),
+        (years.isna() | (years < 1), "Invalid year"),
+        (df["amity_email"].duplicated(), "Duplicate email in file"),
+        (df["enrollment_number"].duplicated(), "Duplicate enrollment number in file"),
+    ]
+    for failed, message in checks:
+        errors = errors.mask(errors.eq("") & failed, message)
+    return errors
+
+
+def run_import_job(jobs_collection, job_id, user_model, df):
+    """Background task: import df and store the report on the job document"""
+    try:
+        report = import_students(user_model, df)
+        update = {"status": "done", "report": report}
+    except Exception as e:
+        print(f"Student import {job_id} failed: {str(e)}")
+        update = {"status": "failed", "error": "Import failed"}
+    update["finished_at"] = datetime.now(timezone.utc)
+    jobs_collection.update_one({"_id": job_id}, {"$set": update})
+
+
+def import_students(user_model, df):
+    """Validate, hash and insert students, returning a per-row report"""
+    errors = validate_students(df)
+
+    candidates = df[errors.eq("")]
+    existing_emails, existing_enrollments = user_model.find_existing(
+        candidates["amity_email"], candidates["enrollment_number"]
+    )
+    errors = errors.mask(
+        errors.eq("") & df["amity_email"].isin(existing_emails),
+        "Email already registered",
+    )
+    errors = errors.mask(
+        errors.eq("") & df["enrollment_number"].isin(existing_enrollments),
+        "Enrollment number already registered",
+    )
+
+    to_insert = df[errors.eq("")]
+    password_hashes = generate_password_hashes(to_insert["password"])
+    created_at = datetime.now(timezone.utc)
+    users = [
+        {
+            "name": row.name,
+            "amity_email": row.amity_email,
+            "enrollment_number": row.enrollment_number,
+            "password": password_hash,
+            "branch": row.branch,
+            "year": int(float(row.year)),
+            "phone_number": row.phone_number,
+            "email_verified": True,
+            "created_at": created_at,
+        }
+        for row, password_hash in zip(
+            to_insert.itertuples(index=False), password_hashes
+        )
+    ]
+    failed = user_model.bulk_create_users(users)
+    for position, message in failed.items():
+        errors.loc[to_insert.index[position]] = message
+
+    rows = [
+        {
+            # Spreadsheet row number, counting the header as row 1
+            "row": int(index) + 2,
+            "enrollment_number": enrollment_number,
+            "status": "error" if error else "created",
+            "error": error or None,
+        }
+        for index, enrollment_number, error in zip(
+            df.index, df["enrollment_number"], errors
+        )
+    ]
+    created = int(errors.eq("").sum())
+    return {
+        "total": len(rows),
+        "created": created,
+        "failed": len(rows) - created,
+        "rows": rows,
+    }
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -6,6 +7,30 @@ load_dotenv()
 
 class Config:
     MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017/event_management")
+    # MongoDB client: connections per process, timeouts (milliseconds, 0 for
+    # none) and wire compression ("zstd", "snappy" and/or "zlib", comma
+    # separated by preference; zstd and snappy need the zstandard and
+    # python-snappy packages). These override the same options in MONGO_URI
+    MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+    MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+    MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "0"))
+    MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "0"))
+    MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "10000"))
+    MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "0"))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(
+        os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "30000")
+    )
+    MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS", "")
+    MONGO_APP_NAME = os.getenv("MONGO_APP_NAME", "amity-events-service")
+    # Event lists and participant reports may be read from secondaries at
+    # most this many seconds behind the primary (90 or more; 0 keeps them on
+    # the primary). Registration and attendance writes wait for a majority
+    # of the replica set for up to MONGO_WRITE_TIMEOUT_MS
+    MONGO_SECONDARY_MAX_STALENESS = int(
+        os.getenv("MONGO_SECONDARY_MAX_STALENESS", "90")
+    )
+    MONGO_WRITE_TIMEOUT_MS = int(os.getenv("MONGO_WRITE_TIMEOUT_MS", "10000"))
+
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key")
     JWT_ACCESS_TOKEN_EXPIRES = 24 * 60 * 60  # 24 hours
     FIVEMERR_API_KEY = os.getenv("FIVEMERR_API_KEY", "")
@@ -14,8 +39,134 @@ class Config:
     MAILGUN_API_KEY = os.getenv("MAILGUN_API_KEY")
     MAILGUN_DOMAIN = os.getenv("MAILGUN_DOMAIN")
     MAILGUN_FROM_EMAIL = os.getenv("MAILGUN_FROM_EMAIL", "noreply@aup.events")
+    # e.g. https://api.eu.mailgun.net/v3 for domains in the EU region
+    MAILGUN_API_BASE = os.getenv("MAILGUN_API_BASE", "https://api.mailgun.net/v3")
+
+    # Seconds a user profile stays in the in-process cache
+    USER_CACHE_TTL_SECONDS = int(os.getenv("USER_CACHE_TTL_SECONDS", "30"))
+
+    # Rate limiting: "memory" (per worker) or "mongo" (shared across workers)
+    RATE_LIMIT_STORAGE = os.getenv("RATE_LIMIT_STORAGE", "memory")
+    # Reverse proxies in front of the app (load balancer, nginx). The client
+    # address is taken from X-Forwarded-For this many entries from the right;
+    # 0 ignores the header and uses the connecting address
+    PROXY_HOPS = int(os.getenv("PROXY_HOPS", "1"))
+    # (max hits, window in seconds) per limited endpoint and key
+    RATE_LIMITS = {
+        "otp_email": (3, 600),
+        "otp_ip": (20, 600),
+        "login_enrollment": (10, 300),
+        "login_ip": (50, 300),
+        "external_team_ip": (10, 3600),
+    }
+    # Most members one external team registration may list
+    EXTERNAL_TEAM_MAX_MEMBERS = int(os.getenv("EXTERNAL_TEAM_MAX_MEMBERS", "10"))
+
+    # Ids each worker reserves per counter round trip (temp enrollments, event codes)
+    ID_BLOCK_SIZE = int(os.getenv("ID_BLOCK_SIZE", "100"))
+
+    # Background report rendering and the on-disk artifact cache
+    REPORT_WORKERS = int(os.getenv("REPORT_WORKERS", "2"))
+    REPORT_CACHE_DIR = os.getenv(
+        "REPORT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "aup-reports")
+    )
+    REPORT_CACHE_MAX_BYTES = int(os.getenv("REPORT_CACHE_MAX_BYTES", str(500 << 20)))
+    REPORT_CACHE_MAX_AGE = int(os.getenv("REPORT_CACHE_MAX_AGE", "3600"))
+
+    # Processes rendering PDF/Excel reports per web worker, and how long a
+    # render (or the wait for a free process) may take before it is abandoned
+    REPORT_PROCESSES = int(os.getenv("REPORT_PROCESSES", "2"))
+    REPORT_TIMEOUT_SECONDS = int(os.getenv("REPORT_TIMEOUT_SECONDS", "300"))
+
+    # Processes hashing passwords for student imports and team registrations,
+    # per web worker
+    PASSWORD_HASH_PROCESSES = int(
+        os.getenv("PASSWORD_HASH_PROCESSES", str(os.cpu_count() or 1))
+    )
+
+    # QR check-in: HMAC key for check-in tokens (defaults to the JWT secret),
+    # how often / how many scans are flushed to the database at once, and
+    # how long and how many scans a worker remembers for de-duplication
+    CHECKIN_SECRET = os.getenv("CHECKIN_SECRET") or JWT_SECRET_KEY
+    CHECKIN_FLUSH_INTERVAL = float(os.getenv("CHECKIN_FLUSH_INTERVAL", "1.0"))
+    CHECKIN_FLUSH_SIZE = int(os.getenv("CHECKIN_FLUSH_SIZE", "200"))
+    CHECKIN_DEDUPE_TTL = int(os.getenv("CHECKIN_DEDUPE_TTL", str(24 * 60 * 60)))
+    CHECKIN_DEDUPE_MAX_ENTRIES = int(os.getenv("CHECKIN_DEDUPE_MAX_ENTRIES", "10000"))
+    # Most scans accepted in one offline check-in upload
+    CHECKIN_SYNC_MAX_RECORDS = int(os.getenv("CHECKIN_SYNC_MAX_RECORDS", "10000"))
+
+    # Live event streams (SSE): open streams allowed per worker, how often
+    # other workers' changes are polled, keep-alive interval and how long a
+    # stream stays open before the client is asked to reconnect (seconds)
+    SSE_MAX_CONNECTIONS = int(os.getenv("SSE_MAX_CONNECTIONS", "100"))
+    SSE_POLL_INTERVAL = float(os.getenv("SSE_POLL_INTERVAL", "2.0"))
+    SSE_HEARTBEAT_SECONDS = int(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+    SSE_MAX_DURATION = int(os.getenv("SSE_MAX_DURATION", "300"))
+
+    # Event images are spooled to local disk and uploaded to the CDN in the
+    # background, retrying with exponential backoff (seconds)
+    IMAGE_SPOOL_DIR = os.getenv(
+        "IMAGE_SPOOL_DIR", os.path.join(tempfile.gettempdir(), "aup-image-spool")
+    )
+    IMAGE_UPLOAD_WORKERS = int(os.getenv("IMAGE_UPLOAD_WORKERS", "2"))
+    IMAGE_UPLOAD_RETRIES = int(os.getenv("IMAGE_UPLOAD_RETRIES", "5"))
+    IMAGE_UPLOAD_BACKOFF = float(os.getenv("IMAGE_UPLOAD_BACKOFF", "2.0"))
+    IMAGE_UPLOAD_TIMEOUT = int(os.getenv("IMAGE_UPLOAD_TIMEOUT", "30"))
+
+    # Uploaded images are re-encoded before upload: the full image and the
+    # detail and list thumbnails are fitted within these sizes (pixels)
+    IMAGE_MAX_DIMENSION = int(os.getenv("IMAGE_MAX_DIMENSION", "1920"))
+    IMAGE_DETAIL_DIMENSION = int(os.getenv("IMAGE_DETAIL_DIMENSION", "1080"))
+    IMAGE_LIST_DIMENSION = int(os.getenv("IMAGE_LIST_DIMENSION", "480"))
+    IMAGE_MAX_PIXELS = int(os.getenv("IMAGE_MAX_PIXELS", "50000000"))
+    IMAGE_OUTPUT_FORMAT = os.getenv("IMAGE_OUTPUT_FORMAT", "WEBP").upper()
+    IMAGE_QUALITY = int(os.getenv("IMAGE_QUALITY", "80"))
+
+    # Outgoing HTTP calls and background work. Fire-and-forget tasks such as
+    # notification emails share BACKGROUND_WORKERS threads on sync workers
+    # (on gevent/eventlet workers they run as greenlets)
+    MAIL_TIMEOUT = int(os.getenv("MAIL_TIMEOUT", "15"))
+    BACKGROUND_WORKERS = int(os.getenv("BACKGROUND_WORKERS", "4"))
+
+    # Request size limits (bytes). Flask rejects larger bodies with 413;
+    # event forms are parsed as a stream and rejected as soon as the body,
+    # the image or a single text field goes over its limit
+    MAX_CONTENT_LENGTH = int(os.getenv("MAX_CONTENT_LENGTH", str(16 * 1024 * 1024)))
+    IMAGE_MAX_UPLOAD_BYTES = int(
+        os.getenv("IMAGE_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024))
+    )
+    FORM_FIELD_MAX_BYTES = int(os.getenv("FORM_FIELD_MAX_BYTES", str(64 * 1024)))
+
+    # Where uploads are stored: "fivemerr" (CDN) or "local" (disk, served
+    # from /media). MEDIA_OFFLOAD hands serving to the front web server:
+    # "x-sendfile" (Apache, lighttpd) or "x-accel-redirect" (nginx, with an
+    # internal location at MEDIA_ACCEL_PREFIX aliased to LOCAL_STORAGE_DIR)
+    STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "fivemerr").lower()
+    LOCAL_STORAGE_DIR = os.getenv(
+        "LOCAL_STORAGE_DIR",
+        os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), "app", "static", "uploads"
+        ),
+    )
+    LOCAL_STORAGE_URL = os.getenv(
+        "LOCAL_STORAGE_URL", os.environ.get("API_BASE_URL", "") + "/media"
+    )
+    MEDIA_OFFLOAD = os.getenv("MEDIA_OFFLOAD", "").lower()
+    MEDIA_ACCEL_PREFIX = os.getenv("MEDIA_ACCEL_PREFIX", "/protected-media")
+    MEDIA_MAX_AGE = int(os.getenv("MEDIA_MAX_AGE", str(365 * 24 * 3600)))
 
     FLASK_ENV = os.getenv("FLASK_ENV", "development")
+    # Time zone of the naive local times the app stores (events' created_at
+    # and date), e.g. "Asia/Kolkata"; empty means the server's own zone
+    APP_TIMEZONE = os.getenv("APP_TIMEZONE", "")
+
+    # Whether gunicorn runs scripts/bootstrap_db.py (collections and indexes)
+    # once when it starts; turn off when the script runs on deploy instead
+    DB_BOOTSTRAP_ON_START = os.getenv("DB_BOOTSTRAP_ON_START", "True").lower() in (
+        "true",
+        "1",
+        "t",
+    )
 
     # Event approval configuration
     EVENT_APPROVAL_REQUIRED = os.getenv("EVENT_APPROVAL_REQUIRED", "True").lower() in (
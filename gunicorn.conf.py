@@ -0,0 +1,108 @@
+"""Gunicorn settings, read automatically from the working directory.
+
+    gunicorn run:app                                # sync workers
+    GUNICORN_WORKER_CLASS=gevent gunicorn run:app   # cooperative workers
+
+The service mostly waits on Mongo, Mailgun and Fivemerr. A sync worker
+serves one request at a time, so every call that waits pins a worker (and
+each open /live stream holds one for its whole duration). gevent workers
+serve up to GUNICORN_WORKER_CONNECTIONS requests per process as greenlets
+that yield whenever they wait on the network. eventlet works the same way.
+
+The app is safe to run under either:
+- the standard library is patched below, before the app is imported, so
+  every lock, thread and socket it creates at import time is cooperative;
+- CPU-heavy steps (bcrypt, image resizing, QR codes) run in native threads
+  through app.utils.concurrency.run_blocking and reports are rendered in a
+  separate process pool, so neither stalls the other greenlets;
+- background work (emails, image uploads, check-in flushes, the live
+  update poller) runs as greenlets and every outgoing HTTP call has a
+  timeout.
+
+Scale sync workers with CPU cores; with green workers a few processes per
+host are enough, as concurrency comes from worker_connections.
+
+The ASGI app (asgi.py) serves the busiest read routes on asyncio and the
+rest through Flask; run it with uvicorn workers:
+
+    GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker gunicorn asgi:app
+"""
+import multiprocessing
+import os
+
+from dotenv import load_dotenv
+
+# Load environment variables, so the GUNICORN_* settings in .env apply too.
+# An empty value falls back to the default below
+load_dotenv()
+
+worker_class = os.getenv("GUNICORN_WORKER_CLASS") or "sync"
+
+if worker_class == "gevent":
+    from gevent import monkey
+
+    monkey.patch_all()
+elif worker_class == "eventlet":
+    import eventlet
+
+    eventlet.monkey_patch()
+
+bind = os.getenv("GUNICORN_BIND") or f"0.0.0.0:{os.getenv('PORT') or '5005'}"
+
+# Green and asyncio (uvicorn) workers each serve many requests at once
+cooperative = worker_class in ("gevent", "eventlet") or worker_class.startswith(
+    "uvicorn."
+)
+workers = int(
+    os.getenv("GUNICORN_WORKERS")
+    or (
+        multiprocessing.cpu_count()
+        if cooperative
+        else multiprocessing.cpu_count() * 2 + 1
+    )
+)
+# Concurrent requests per green worker
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS") or "500")
+
+# Reports can take a while to render on a cold cache
+timeout = int(os.getenv("GUNICORN_TIMEOUT") or "120")
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT") or "30")
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE") or "5")
+
+# Set GUNICORN_ACCESS_LOG to an empty value to turn the access log off
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-") or None
+errorlog = "-"
+
+# Load the app once in the master and fork workers from it: workers boot
+# faster and share its memory. Safe because creating the app starts no
+# threads and opens no database connections; workers connect on first use
+preload_app = (os.getenv("GUNICORN_PRELOAD") or "false").lower() in ("true", "1", "t")
+
+
+def on_starting(server):
+    """One-time database setup, before any worker starts.
+
+    Runs scripts/bootstrap_db.py in a separate interpreter, so the master
+    never opens a MongoClient. With gevent/eventlet the master is already
+    monkey-patched at this point (see above): a client's monitor threads
+    would be greenlets, inherited by every forked worker.
+    """
+    import subprocess
+    import sys
+
+    from config import Config
+
+    if not Config.DB_BOOTSTRAP_ON_START:
+        return
+    script = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "scripts", "bootstrap_db.py"
+    )
+    result = subprocess.run(
+        [sys.executable, script], capture_output=True, text=True, check=False
+    )
+    if result.returncode:
+        # The error is the last line the script printed (or its traceback's)
+        output = (result.stdout + result.stderr).strip().splitlines()
+        server.log.error(
+            f"Database bootstrap failed: {output[-1] if output else result.returncode}"
+        )
@@ -1,6 +1,8 @@
-from app import create_app
+from app import create_app, mongo
+from app.utils.indexes import bootstrap_database
 
 app = create_app()
 
 if __name__ == "__main__":
+    bootstrap_database(mongo)
     app.run(host="0.0.0.0", port=5005, debug=True)
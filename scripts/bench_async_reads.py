@@ -0,0 +1,205 @@
+"""Compare the Flask and asyncio read paths under concurrent load.
+
+Seeds --events approved events (each with --participants registrations)
+in the database at MONGO_URI (use a scratch database), then serves the app
+with gunicorn in each --servers mode with the same number of processes:
+
+    flask-sync    run:app, sync workers
+    flask-gevent  run:app, gevent workers
+    async         asgi:app, uvicorn workers (reads served on asyncio)
+
+and has --concurrency clients request GET /api/events, /api/events/<id>,
+/api/events/registered and /api/events/created for --duration seconds
+each, reporting throughput, latency and throughput per process.
+
+    MONGO_URI=mongodb://localhost:27017/bench python scripts/bench_async_reads.py \\
+        --workers 2 --concurrency 200
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import jwt
+import requests
+from dotenv import load_dotenv
+from pymongo import MongoClient
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Load environment variables
+load_dotenv()
+
+BENCH_PREFIX = "ASYNCB"
+SERVERS = {
+    "flask-sync": ("sync", "run:app"),
+    "flask-gevent": ("gevent", "run:app"),
+    "async": ("uvicorn.workers.UvicornWorker", "asgi:app"),
+}
+
+
+def seed(db, events, participants):
+    """Create events organized by one student and joined by the others"""
+    cleanup(db)
+    organizer = f"{BENCH_PREFIX}ORG"
+    students = [f"{BENCH_PREFIX}{i:05d}" for i in range(participants)]
+    now = datetime.now()
+    result = db.events.insert_many(
+        [
+            {
+                "name": f"{BENCH_PREFIX} {i}",
+                "date": now + timedelta(days=i % 30),
+                "venue": "Benchmark",
+                "description": "x" * 500,
+                "max_participants": participants,
+                "creator_id": organizer,
+                "participants": [
+                    {
+                        "enrollment_number": student,
+                        "registered_at": now,
+                        "custom_field_values": {},
+                        "attendance": False,
+                    }
+                    for student in students
+                ],
+                "custom_fields": [],
+                "is_approved": True,
+                "approval_status": "approved",
+                "version": 1,
+                "created_at": now,
+            }
+            for i in range(events)
+        ]
+    )
+    return organizer, students[0], [str(_id) for _id in result.inserted_ids]
+
+
+def cleanup(db):
+    db.events.delete_many({"name": {"$regex": f"^{BENCH_PREFIX}"}})
+
+
+def token(enrollment):
+    return jwt.encode(
+        {
+            "enrollment_number": enrollment,
+            "exp": datetime.utcnow() + timedelta(hours=1),
+        },
+        os.getenv("JWT_SECRET_KEY", "your-secret-key"),
+    )
+
+
+def start_server(server, workers, port):
+    worker_class, app = SERVERS[server]
+    env = dict(
+        os.environ,
+        GUNICORN_WORKER_CLASS=worker_class,
+        GUNICORN_WORKERS=str(workers),
+        GUNICORN_BIND=f"127.0.0.1:{port}",
+        GUNICORN_ACCESS_LOG="",
+    )
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", app],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            requests.get(f"http://127.0.0.1:{port}/api/events", timeout=1)
+            return process
+        except requests.RequestException:
+            time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError(f"gunicorn ({server}) did not start")
+
+
+def run_load(concurrency, duration, url, headers):
+    """GET url from concurrency clients for duration seconds"""
+    deadline = time.perf_counter() + duration
+
+    def client(index):
+        session = requests.Session()
+        latencies = []
+        errors = 0
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                ok = session.get(url(index), headers=headers).status_code == 200
+            except requests.RequestException:
+                ok = False
+            latencies.append(time.perf_counter() - started)
+            errors += not ok
+        return latencies, errors
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(client, range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies = sorted(latency for client, _ in results for latency in client)
+    errors = sum(client_errors for _, client_errors in results)
+    return latencies, errors, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--servers", nargs="+", choices=list(SERVERS), default=list(SERVERS)
+    )
+    parser.add_argument("--workers", type=int, default=2, help="Processes per server")
+    parser.add_argument("--concurrency", type=int, default=100, help="Clients")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds per test")
+    parser.add_argument("--events", type=int, default=50, help="Events seeded")
+    parser.add_argument("--participants", type=int, default=100, help="Per event")
+    parser.add_argument("--port", type=int, default=5098)
+    args = parser.parse_args()
+
+    db = MongoClient(os.getenv("MONGO_URI")).get_default_database()
+    organizer, student, event_ids = seed(db, args.events, args.participants)
+    base_url = f"http://127.0.0.1:{args.port}/api/events"
+    tests = [
+        ("events", student, lambda index: base_url),
+        (
+            "event",
+            student,
+            lambda index: f"{base_url}/{event_ids[index % len(event_ids)]}",
+        ),
+        ("registered", student, lambda index: f"{base_url}/registered"),
+        ("created", organizer, lambda index: f"{base_url}/created"),
+    ]
+
+    try:
+        for server in args.servers:
+            process = start_server(server, args.workers, args.port)
+            print(f"{server} ({args.workers} processes):")
+            try:
+                for label, user, url in tests:
+                    headers = {"Authorization": f"Bearer {token(user)}"}
+                    latencies, errors, elapsed = run_load(
+                        args.concurrency, args.duration, url, headers
+                    )
+                    if not latencies:
+                        print(f"  {label:<12} no requests completed")
+                        continue
+                    throughput = len(latencies) / elapsed
+                    print(
+                        f"  {label:<12}{throughput:>8.1f} req/s "
+                        f"({throughput / args.workers:>7.1f} per process)   "
+                        f"p50 {statistics.median(latencies) * 1000:>7.1f} ms   "
+                        f"p95 {latencies[int(len(latencies) * 0.95)] * 1000:>7.1f} ms   "
+                        f"errors {errors}"
+                    )
+            finally:
+                process.terminate()
+                process.wait()
+    finally:
+        cleanup(db)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Benchmark batch attendance marking.
+
+Seeds a throwaway event with N participants in the database at MONGO_URI
+(use a scratch database) and marks attendance for all of them twice: once
+with the old one-update-per-participant loop and once with
+Event.mark_batch_attendance, which sends a single update with arrayFilters.
+
+    MONGO_URI=mongodb://localhost:27017/bench python scripts/benchmark_bulk_attendance.py
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+from bson import ObjectId
+from dotenv import load_dotenv
+from pymongo import MongoClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.models.event import Event  # noqa: E402
+
+# Load environment variables
+load_dotenv()
+
+BENCH_PREFIX = "BENCH"
+
+
+def seed(db, rows):
+    """Create one event holding `rows` participants, returning its id"""
+    db.events.delete_many({"name": f"{BENCH_PREFIX} attendance"})
+    now = datetime.now()
+    participants = [
+        {
+            "enrollment_number": f"{BENCH_PREFIX}{i:07d}",
+            "registered_at": now,
+            "attendance": False,
+            "custom_field_values": {},
+        }
+        for i in range(rows)
+    ]
+    result = db.events.insert_one(
+        {
+            "name": f"{BENCH_PREFIX} attendance",
+            "date": now,
+            "venue": "Benchmark",
+            "max_participants": rows,
+            "creator_id": BENCH_PREFIX,
+            "participants": participants,
+            "is_approved": True,
+            "created_at": now,
+            "version": 1,
+        }
+    )
+    return str(result.inserted_id)
+
+
+def mark_one_by_one(db, event_id, attendance_data):
+    """The previous implementation: one round trip per participant"""
+    for record in attendance_data:
+        db.events.update_one(
+            {
+                "_id": ObjectId(event_id),
+                "participants.enrollment_number": record["enrollment_number"],
+            },
+            {
+                "$set": {"participants.$.attendance": record["attendance"]},
+                "$inc": {"version": 1},
+            },
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batch attendance")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    db = MongoClient(os.getenv("MONGO_URI")).get_default_database()
+    event_model = Event(SimpleNamespace(db=db))
+
+    print(f"{'rows':>8} {'loop s':>8} {'bulk s':>8} {'speedup':>8}")
+    for rows in args.rows:
+        event_id = seed(db, rows)
+        loop_times, bulk_times = [], []
+        for attempt in range(args.repeat):
+            # Alternate the status so every run changes every participant
+            attendance_data = [
+                {
+                    "enrollment_number": f"{BENCH_PREFIX}{i:07d}",
+                    "attendance": attempt % 2 == 0,
+                }
+                for i in range(rows)
+            ]
+            started = time.perf_counter()
+            mark_one_by_one(db, event_id, attendance_data)
+            loop_times.append(time.perf_counter() - started)
+
+            for record in attendance_data:
+                record["attendance"] = not record["attendance"]
+            started = time.perf_counter()
+            success, message, results = event_model.mark_batch_attendance(
+                event_id, attendance_data
+            )
+            bulk_times.append(time.perf_counter() - started)
+            assert success and all(result["matched"] for result in results), message
+
+        loop, bulk = min(loop_times), min(bulk_times)
+        print(f"{rows:>8} {loop:>8.3f} {bulk:>8.3f} {loop / bulk:>7.1f}x")
+
+        db.events.delete_one({"_id": ObjectId(event_id)})
+        db.event_analytics.delete_one({"_id": ObjectId(event_id)})
+
+
+if __name__ == "__main__":
+    main()
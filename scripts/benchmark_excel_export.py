@@ -0,0 +1,120 @@
+"""Benchmark the participant Excel export.
+
+Seeds a throwaway event with N participants in the database at MONGO_URI
+(use a scratch database), exports it with Event.generate_excel_report and
+reports wall time and peak RSS. Every size runs in a fresh process so the
+peak RSS figures do not carry over between sizes.
+
+    MONGO_URI=mongodb://localhost:27017/bench python scripts/benchmark_excel_export.py
+"""
+import argparse
+import os
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from types import SimpleNamespace
+
+from dotenv import load_dotenv
+from pymongo import MongoClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.models.event import Event  # noqa: E402
+
+# Load environment variables
+load_dotenv()
+
+BENCH_PREFIX = "BENCH"
+
+
+def get_db():
+    return MongoClient(os.getenv("MONGO_URI")).get_default_database()
+
+
+def seed(db, rows):
+    """Create users and one event holding `rows` participants, returning its id"""
+    db.users.delete_many({"enrollment_number": {"$regex": f"^{BENCH_PREFIX}"}})
+    db.events.delete_many({"name": f"{BENCH_PREFIX} export"})
+    db.users.create_index("enrollment_number")
+
+    now = datetime.now()
+    enrollments = [f"{BENCH_PREFIX}{i:07d}" for i in range(rows)]
+    for start in range(0, rows, 10000):
+        db.users.insert_many(
+            [
+                {
+                    "name": f"Student {enrollment}",
+                    "amity_email": f"{enrollment.lower()}@s.amity.edu",
+                    "enrollment_number": enrollment,
+                    "branch": "CSE",
+                    "year": 2,
+                    "phone_number": "9999999999",
+                }
+                for enrollment in enrollments[start : start + 10000]
+            ]
+        )
+
+    # Keep entries compact so 100k participants fit in one event document
+    participants = [
+        {
+            "enrollment_number": enrollment,
+            "registered_at": now,
+            "attendance": i % 3 == 0,
+            "custom_field_values": {"team": f"T{i % 50}"},
+        }
+        for i, enrollment in enumerate(enrollments)
+    ]
+    result = db.events.insert_one(
+        {
+            "name": f"{BENCH_PREFIX} export",
+            "date": now,
+            "venue": "Benchmark",
+            "max_participants": rows,
+            "creator_id": BENCH_PREFIX,
+            "participants": participants,
+            "is_approved": True,
+            "created_at": now,
+        }
+    )
+    return str(result.inserted_id)
+
+
+def run_export(event_id):
+    """Export in this (fresh) process and return (seconds, peak RSS MB, bytes)"""
+    event_model = Event(SimpleNamespace(db=get_db()))
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    output = event_model.generate_excel_report(event_id)
+    output.seek(0, os.SEEK_END)
+    size = output.tell()
+    elapsed = time.perf_counter() - started
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return elapsed, peak / 1024, (peak - baseline) / 1024, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Excel export")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    db = get_db()
+    print(
+        f"{'rows':>8} {'seconds':>8} {'peak RSS MB':>12} {'growth MB':>10} {'xlsx MB':>8}"
+    )
+    for rows in args.rows:
+        event_id = seed(db, rows)
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            elapsed, peak, growth, size = executor.submit(run_export, event_id).result()
+        print(
+            f"{rows:>8} {elapsed:>8.2f} {peak:>12.1f} {growth:>10.1f} "
+            f"{size / 1024 / 1024:>8.2f}"
+        )
+
+    db.users.delete_many({"enrollment_number": {"$regex": f"^{BENCH_PREFIX}"}})
+    db.events.delete_many({"name": f"{BENCH_PREFIX} export"})
+
+
+if __name__ == "__main__":
+    main()
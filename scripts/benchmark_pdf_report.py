@@ -0,0 +1,139 @@
+"""Benchmark the participants PDF table against per-cell rendering.
+
+Renders the same synthetic participant rows with the previous approach (one
+bordered pdf.cell per value, header redraw checks inside the row loop) and
+with app.utils.pdf_report.render_participants_pdf. No database is needed.
+
+    python scripts/benchmark_pdf_report.py --rows 5000
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+from io import BytesIO
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.utils.pdf_report import PDF, render_participants_pdf  # noqa: E402
+
+FIELDS = [
+    "name",
+    "enrollment_number",
+    "amity_email",
+    "phone_number",
+    "branch",
+    "year",
+    "registered_at",
+    "attendance",
+    "custom_Team Name",
+]
+HEADERS = [
+    "Name",
+    "Enrollment Number",
+    "Amity Email",
+    "Phone Number",
+    "Branch",
+    "Year",
+    "Registration Date",
+    "Attendance Status",
+    "Team Name",
+]
+EVENT = {
+    "name": "Benchmark Fest",
+    "date": datetime(2025, 3, 1, 10, 0),
+    "venue": "Main Auditorium",
+    "max_participants": 10000,
+}
+
+
+def make_rows(count):
+    return [
+        [
+            f"Student Number {i}",
+            f"A{i:010d}",
+            f"student.number{i}@s.amity.edu",
+            "9999999999",
+            "CSE",
+            str(i % 4 + 1),
+            "01/03/2025 10:00 AM",
+            "Present" if i % 3 else "Absent",
+            f"A rather long custom team name that overflows its column {i}",
+        ]
+        for i in range(count)
+    ]
+
+
+def render_per_cell(rows):
+    """The previous table rendering: one bordered cell per value"""
+    pdf = PDF("P", "mm", "A4")
+    pdf.add_page()
+    pdf.set_font("Arial", "B", 10)
+    total_width = pdf.w - 30
+    col_widths = []
+    for field in FIELDS:
+        if field == "enrollment_number":
+            col_widths.append(total_width * 0.15)
+        elif field == "name":
+            col_widths.append(total_width * 0.2)
+        elif field == "amity_email":
+            col_widths.append(total_width * 0.25)
+        else:
+            col_widths.append(total_width * 0.15)
+
+    pdf.set_x(15)
+    for i, header in enumerate(HEADERS):
+        pdf.cell(col_widths[i], 10, header, 1, 0, "L", True)
+    pdf.ln()
+    pdf.set_font("Arial", "", 10)
+    for i, row in enumerate(rows):
+        if pdf.get_y() + 10 > pdf.page_break_trigger:
+            pdf.add_page()
+            pdf.set_font("Arial", "B", 10)
+            pdf.set_x(15)
+            for j, header in enumerate(HEADERS):
+                pdf.cell(col_widths[j], 10, header, 1, 0, "L", True)
+            pdf.ln()
+            pdf.set_font("Arial", "", 10)
+        pdf.set_x(15)
+        for j, value in enumerate(row):
+            pdf.cell(col_widths[j], 10, value, 1, 0, "L", i % 2 == 0)
+        pdf.ln()
+
+    buffer = BytesIO()
+    pdf.output(buffer)
+    return buffer.getvalue()
+
+
+def render_table(rows):
+    return render_participants_pdf(EVENT, len(rows), HEADERS, FIELDS, rows)
+
+
+def timed(render, rows, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        output = render(rows)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the PDF report")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    before, before_size = timed(render_per_cell, rows, args.repeat)
+    after, after_size = timed(render_table, rows, args.repeat)
+
+    print(f"Rows: {args.rows} (best of {args.repeat})")
+    print(f"Per-cell rendering:  {before:.2f}s  {before_size / 1024:.0f} KB")
+    print(f"Precomputed layout:  {after:.2f}s  {after_size / 1024:.0f} KB")
+    print(f"Speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
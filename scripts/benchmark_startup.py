@@ -0,0 +1,180 @@
+"""Benchmark application startup, from a cold import to the first request.
+
+Each run starts a fresh interpreter that imports the app, calls
+create_app() and serves GET /api/events through the test client, timing
+each step against the database at MONGO_URI. It also reports whether any
+heavy report library was imported and whether the Mongo client had opened
+before the first request (it must not, for gunicorn --preload to be safe).
+
+With --gunicorn, also times `gunicorn run:app` from process start until a
+worker answers, with and without --preload.
+
+    MONGO_URI=mongodb://localhost:27017/bench python scripts/benchmark_startup.py --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+import jwt
+import requests
+from dotenv import load_dotenv
+from pymongo import MongoClient
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Load environment variables
+load_dotenv()
+
+BENCH_PREFIX = "STARTUP"
+HEAVY_MODULES = ["fpdf", "xlsxwriter", "pandas", "pyarrow", "openpyxl", "PIL.Image"]
+
+# Runs in a fresh interpreter and prints its timings as JSON
+CHILD = """
+import json, sys, time
+started = time.perf_counter()
+from app import create_app, mongo
+imported = time.perf_counter()
+app = create_app()
+created = time.perf_counter()
+heavy = [name for name in {heavy!r} if name in sys.modules]
+opened = mongo.cx._topology._opened
+response = app.test_client().get(
+    "/api/events", headers={{"Authorization": "Bearer {token}"}}
+)
+served = time.perf_counter()
+print(json.dumps({{
+    "import": imported - started,
+    "create_app": created - imported,
+    "first_request": served - created,
+    "status": response.status_code,
+    "heavy": heavy,
+    "opened_before_request": opened,
+}}))
+"""
+
+
+def token():
+    return jwt.encode(
+        {
+            "enrollment_number": f"{BENCH_PREFIX}0",
+            "exp": datetime.utcnow() + timedelta(hours=1),
+        },
+        os.getenv("JWT_SECRET_KEY", "your-secret-key"),
+    )
+
+
+def seed(db):
+    """Create the user the first request is authenticated as"""
+    cleanup(db)
+    db.users.insert_one(
+        {
+            "name": "Startup benchmark",
+            "amity_email": f"{BENCH_PREFIX.lower()}0@s.amity.edu",
+            "enrollment_number": f"{BENCH_PREFIX}0",
+            "branch": "CSE",
+            "year": 2,
+            "phone_number": "9999999999",
+        }
+    )
+
+
+def cleanup(db):
+    db.users.delete_many({"enrollment_number": {"$regex": f"^{BENCH_PREFIX}"}})
+
+
+def in_process_run():
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD.format(heavy=HEAVY_MODULES, token=token())],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result["total"] = time.perf_counter() - started
+    return result
+
+
+def gunicorn_run(port, preload):
+    env = dict(
+        os.environ,
+        GUNICORN_WORKERS="1",
+        GUNICORN_BIND=f"127.0.0.1:{port}",
+        GUNICORN_ACCESS_LOG="",
+        GUNICORN_PRELOAD="true" if preload else "false",
+    )
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "run:app"],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < 60:
+            try:
+                requests.get(
+                    f"http://127.0.0.1:{port}/api/events",
+                    headers={"Authorization": f"Bearer {token()}"},
+                    timeout=5,
+                )
+                return time.perf_counter() - started
+            except requests.RequestException:
+                time.sleep(0.02)
+        raise RuntimeError("gunicorn did not answer within 60s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Runs per measurement")
+    parser.add_argument(
+        "--gunicorn", action="store_true", help="Also time gunicorn worker boot"
+    )
+    parser.add_argument("--port", type=int, default=5097)
+    args = parser.parse_args()
+
+    client = MongoClient(os.getenv("MONGO_URI"))
+    db = client.get_default_database()
+    seed(db)
+    try:
+        report(args)
+    finally:
+        cleanup(db)
+        client.close()
+
+
+def report(args):
+    runs = [in_process_run() for _ in range(args.runs)]
+    print(f"Cold start, median of {args.runs} runs:")
+    for step in ("import", "create_app", "first_request", "total"):
+        median = statistics.median(run[step] for run in runs)
+        print(f"  {step:<15}{median * 1000:>9.1f} ms")
+    print(f"  first response  HTTP {runs[-1]['status']}")
+    print(f"  heavy modules   {', '.join(runs[-1]['heavy']) or 'none'}")
+    print(
+        "  client opened before first request: "
+        f"{'yes' if runs[-1]['opened_before_request'] else 'no'}"
+    )
+
+    if args.gunicorn:
+        for preload in (False, True):
+            times = [gunicorn_run(args.port, preload) for _ in range(args.runs)]
+            label = "gunicorn --preload" if preload else "gunicorn"
+            print(
+                f"{label:<20} start to first response "
+                f"{statistics.median(times) * 1000:>9.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
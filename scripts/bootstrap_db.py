@@ -0,0 +1,39 @@
+"""Create the collections and indexes the app needs (safe to re-run).
+
+Run it on deploy, before the app starts serving. gunicorn runs the same
+setup when it starts unless DB_BOOTSTRAP_ON_START is off.
+
+    python scripts/bootstrap_db.py
+"""
+import os
+import sys
+from types import SimpleNamespace
+
+from dotenv import load_dotenv
+from pymongo import MongoClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.utils.indexes import bootstrap_database  # noqa: E402
+from app.utils.mongo_options import client_options  # noqa: E402
+
+# Load environment variables
+load_dotenv()
+
+
+def main():
+    client = MongoClient(os.getenv("MONGO_URI"), **client_options())
+    print("Bootstrapping the database...")
+    try:
+        bootstrap_database(SimpleNamespace(db=client.get_default_database()))
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return 1
+    finally:
+        client.close()
+    print("Database ready")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
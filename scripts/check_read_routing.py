@@ -0,0 +1,189 @@
+"""Check read preference and write concern routing against a replica set.
+
+Seeds a throwaway event in the database at MONGO_URI, which must name a
+replica set with at least one secondary (use a scratch database), and
+watches every command the Event model sends:
+
+- event lists (get_all_events) are answered by a secondary;
+- registration and attendance writes carry writeConcern majority;
+- participant reports are read from a secondary in a causally
+  consistent session and include an attendance change made just before.
+
+A local three member replica set:
+
+    for port in 27017 27018 27019; do
+        mkdir -p /tmp/rs/$port
+        mongod --replSet rs0 --port $port --dbpath /tmp/rs/$port --fork \\
+            --logpath /tmp/rs/$port.log
+    done
+    mongosh --port 27017 --eval 'rs.initiate({_id: "rs0", members: [
+        {_id: 0, host: "localhost:27017"}, {_id: 1, host: "localhost:27018"},
+        {_id: 2, host: "localhost:27019"}]})'
+
+    MONGO_URI="mongodb://localhost:27017,localhost:27018,localhost:27019/bench?replicaSet=rs0" \\
+        python scripts/check_read_routing.py
+"""
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from bson import ObjectId
+from dotenv import load_dotenv
+from pymongo import MongoClient, monitoring
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.models.event import Event  # noqa: E402
+from app.utils.mongo_options import client_options  # noqa: E402
+
+# Load environment variables
+load_dotenv()
+
+BENCH_PREFIX = "ROUTE"
+
+
+class CommandLog(monitoring.CommandListener):
+    """Remembers the commands sent on the events collection and who answered"""
+
+    def __init__(self):
+        self.commands = []
+        self.pending = {}
+
+    def started(self, event):
+        if event.command.get(event.command_name) == "events":
+            self.pending[event.request_id] = event.command
+
+    def succeeded(self, event):
+        command = self.pending.pop(event.request_id, None)
+        if command is not None:
+            self.commands.append((event.command_name, command, event.connection_id))
+
+    def failed(self, event):
+        self.pending.pop(event.request_id, None)
+
+    def take(self):
+        commands, self.commands = self.commands, []
+        return commands
+
+
+def check(label, ok):
+    print(f"{'PASS' if ok else 'FAIL'}  {label}")
+    return ok
+
+
+def main():
+    log = CommandLog()
+    client = MongoClient(
+        os.getenv("MONGO_URI"), event_listeners=[log], **client_options()
+    )
+    db = client.get_default_database()
+    client.admin.command("ping")
+    # Give the driver time to discover every member of the set
+    time.sleep(2)
+    primary = client.primary
+    secondaries = client.secondaries
+    print(f"primary {primary}, secondaries {sorted(secondaries)}")
+    if not secondaries:
+        print("No secondaries found: MONGO_URI must point at a replica set")
+        return 1
+
+    enrollments = [f"{BENCH_PREFIX}{i}" for i in range(3)]
+    db.users.insert_many(
+        [
+            {
+                "name": f"Student {enrollment}",
+                "amity_email": f"{enrollment.lower()}@s.amity.edu",
+                "enrollment_number": enrollment,
+                "branch": "CSE",
+                "year": 2,
+                "phone_number": "9999999999",
+            }
+            for enrollment in enrollments
+        ]
+    )
+    event_id = str(
+        db.events.insert_one(
+            {
+                "name": f"{BENCH_PREFIX} event",
+                "date": datetime.now() + timedelta(days=7),
+                "venue": "Routing check",
+                "description": "",
+                "max_participants": 10,
+                "creator_id": enrollments[0],
+                "participants": [],
+                "custom_fields": [],
+                "is_approved": True,
+                "version": 1,
+                "created_at": datetime.now(),
+            }
+        ).inserted_id
+    )
+    event_model = Event(SimpleNamespace(db=db))
+    results = []
+
+    try:
+        log.take()
+        event_model.get_all_events()
+        reads = log.take()
+        results.append(
+            check(
+                "event list read from a secondary",
+                bool(reads) and all(address in secondaries for _, _, address in reads),
+            )
+        )
+
+        event_model.register_participant(event_id, enrollments[1], {})
+        event_model.mark_attendance(event_id, enrollments[1], True)
+        writes = [
+            command
+            for name, command, _ in log.take()
+            if name in ("update", "findAndModify")
+        ]
+        results.append(
+            check(
+                "registration and attendance written with majority",
+                len(writes) == 2
+                and all(
+                    command.get("writeConcern", {}).get("w") == "majority"
+                    for command in writes
+                ),
+            )
+        )
+
+        csv = "".join(event_model.generate_csv_report(event_id))
+        commands = log.take()
+        report_reads = [
+            (command, address)
+            for name, command, address in commands
+            if name == "aggregate"
+        ]
+        results.append(
+            check(
+                "report read from a secondary after a primary read",
+                commands[0][2] == primary
+                and bool(report_reads)
+                and all(address in secondaries for _, address in report_reads),
+            )
+        )
+        results.append(
+            check(
+                "report reads wait for the secondary to catch up",
+                all(
+                    "afterClusterTime" in command.get("readConcern", {})
+                    for command, _ in report_reads
+                ),
+            )
+        )
+        results.append(check("report includes the new attendance", "Present" in csv))
+    finally:
+        db.users.delete_many({"enrollment_number": {"$in": enrollments}})
+        db.events.delete_many({"name": f"{BENCH_PREFIX} event"})
+        db.event_analytics.delete_many({"_id": ObjectId(event_id)})
+
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+import argparse
+import os
+import re
+import sys
+from types import SimpleNamespace
+
+from dotenv import load_dotenv
+from pymongo import MongoClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.models.image import hash_file  # noqa: E402
+
+# Load environment variables
+load_dotenv()
+
+DEFAULT_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "app", "static", "uploads"
+)
+IMAGE_FIELDS = ["image_url", "image_detail_url", "image_thumbnail_url"]
+
+
+def find_duplicates(directory):
+    """Group files by content digest; returns {kept_name: [duplicate_names]}"""
+    by_digest = {}
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if not os.path.isfile(path):
+            continue
+        with open(path, "rb") as file:
+            by_digest.setdefault(hash_file(file), []).append(name)
+    return {names[0]: names[1:] for names in by_digest.values() if len(names) > 1}
+
+
+def repoint_events(mongo, duplicate, kept):
+    """Point event image URLs that end with duplicate at kept instead"""
+    updated = 0
+    for field in IMAGE_FIELDS:
+        query = {field: {"$regex": "/" + re.escape(duplicate) + "$"}}
+        for event in mongo.db.events.find(query, {field: 1}):
+            url = event[field]
+            mongo.db.events.update_one(
+                {"_id": event["_id"], field: url},
+                {"$set": {field: url[: -len(duplicate)] + kept}},
+            )
+            updated += 1
+    return updated
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Remove byte-identical copies of uploaded images"
+    )
+    parser.add_argument(
+        "--dir", default=DEFAULT_DIR, help="Upload directory (default: app uploads)"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Only report the duplicates"
+    )
+    args = parser.parse_args()
+
+    duplicates = find_duplicates(args.dir)
+    if not duplicates:
+        print("No duplicate images found")
+        return
+
+    mongo = None
+    if not args.dry_run:
+        client = MongoClient(os.getenv("MONGO_URI"))
+        mongo = SimpleNamespace(db=client.get_default_database())
+
+    removed = 0
+    freed = 0
+    for kept, copies in duplicates.items():
+        print(f"{kept}: {len(copies)} duplicate(s)")
+        for duplicate in copies:
+            path = os.path.join(args.dir, duplicate)
+            size = os.path.getsize(path)
+            print(f"  {duplicate} ({size} bytes)")
+            if args.dry_run:
+                continue
+            # Repoint events before deleting so no event is left without an image
+            updated = repoint_events(mongo, duplicate, kept)
+            os.remove(path)
+            removed += 1
+            freed += size
+            if updated:
+                print(f"    repointed {updated} event image URL(s)")
+
+    if args.dry_run:
+        print("Dry run: nothing was changed")
+    else:
+        print(f"Removed {removed} file(s), freed {freed} bytes")
+
+
+if __name__ == "__main__":
+    main()
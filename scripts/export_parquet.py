@@ -0,0 +1,53 @@
+import argparse
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+from dotenv import load_dotenv
+from pymongo import MongoClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.utils.parquet_export import ParquetExporter  # noqa: E402
+
+# Load environment variables
+load_dotenv()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Export events and participants as month-partitioned Parquet"
+    )
+    parser.add_argument("output", help="Directory to write the Parquet dataset to")
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Export everything instead of only rows since the last watermark "
+        "(use a fresh output directory)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=5000,
+        help="Documents read and written per batch (bounds memory use)",
+    )
+    args = parser.parse_args()
+
+    client = MongoClient(os.getenv("MONGO_URI"))
+    exporter = ParquetExporter(
+        SimpleNamespace(db=client.get_default_database()),
+        args.output,
+        batch_size=args.batch_size,
+    )
+
+    watermark = None if args.full else exporter.get_watermark()
+    print(
+        f"Exporting {'changes since ' + str(watermark) if watermark else 'all rows'}..."
+    )
+    summary = exporter.export(full=args.full)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import argparse
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+from dotenv import load_dotenv
+from pymongo import MongoClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.models.user import User  # noqa: E402
+from app.utils.student_import import import_students, read_students  # noqa: E402
+
+# Load environment variables
+load_dotenv()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import students from CSV/XLSX")
+    parser.add_argument("file", help="Path to a .csv or .xlsx file of students")
+    parser.add_argument(
+        "--report", help="Write the per-row JSON report to this path instead of stdout"
+    )
+    args = parser.parse_args()
+
+    client = MongoClient(os.getenv("MONGO_URI"))
+    user_model = User(SimpleNamespace(db=client.get_default_database()))
+
+    with open(args.file, "rb") as file:
+        students = read_students(file, args.file)
+
+    print(f"Importing {len(students)} students from {args.file}...")
+    report = import_students(user_model, students)
+
+    print("\nImport Summary:")
+    print(f"Rows processed: {report['total']}")
+    print(f"Users created: {report['created']}")
+    print(f"Rows failed: {report['failed']}")
+
+    if args.report:
+        with open(args.report, "w") as output:
+            json.dump(report, output, indent=2)
+    else:
+        for row in report["rows"]:
+            if row["error"]:
+                print(f"Row {row['row']} ({row['enrollment_number']}): {row['error']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Load test the QR check-in endpoint like a set of entry gates.
+
+Issues check-in tokens for the participants of an event (using the same
+CHECKIN_SECRET as the server), then has each gate thread scan a share of
+them against a running server and reports throughput and latency. A
+share of the scans is repeated to exercise de-duplication.
+
+    MONGO_URI=... CHECKIN_SECRET=... python scripts/load_test_checkin.py \\
+        --base-url http://localhost:5005 --event-id <id> --auth-token <organizer JWT>
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from bson import ObjectId
+from dotenv import load_dotenv
+from pymongo import MongoClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.utils.checkin import issue_checkin_token  # noqa: E402
+
+# Load environment variables
+load_dotenv()
+
+
+def run_gate(base_url, event_id, auth_token, tokens):
+    """Scan tokens one after another like a single gate; returns latencies"""
+    session = requests.Session()
+    session.headers["Authorization"] = f"Bearer {auth_token}"
+    latencies = []
+    errors = 0
+    for token in tokens:
+        started = time.perf_counter()
+        response = session.post(
+            f"{base_url}/api/events/{event_id}/checkin", json={"token": token}
+        )
+        latencies.append(time.perf_counter() - started)
+        if response.status_code != 200:
+            errors += 1
+    return latencies, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test QR check-in")
+    parser.add_argument("--base-url", default="http://localhost:5005")
+    parser.add_argument("--event-id", required=True)
+    parser.add_argument("--auth-token", required=True, help="Organizer JWT")
+    parser.add_argument("--gates", type=int, default=8)
+    parser.add_argument(
+        "--repeat-share", type=float, default=0.1, help="Share of scans repeated"
+    )
+    args = parser.parse_args()
+
+    db = MongoClient(os.getenv("MONGO_URI")).get_default_database()
+    event = db.events.find_one(
+        {"_id": ObjectId(args.event_id)}, {"participants.enrollment_number": 1}
+    )
+    tokens = [
+        issue_checkin_token(args.event_id, p["enrollment_number"])
+        for p in event["participants"]
+        if isinstance(p, dict)
+    ]
+    tokens += random.sample(tokens, int(len(tokens) * args.repeat_share))
+    random.shuffle(tokens)
+    shares = [tokens[gate :: args.gates] for gate in range(args.gates)]
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.gates) as executor:
+        results = list(
+            executor.map(
+                lambda share: run_gate(
+                    args.base_url, args.event_id, args.auth_token, share
+                ),
+                shares,
+            )
+        )
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for gate, _ in results for latency in gate)
+    errors = sum(gate_errors for _, gate_errors in results)
+    print(f"Scans: {len(latencies)} from {args.gates} gates in {elapsed:.2f}s")
+    print(f"Throughput: {len(latencies) / elapsed:.1f} scans/s")
+    print(
+        f"Latency ms: p50 {statistics.median(latencies) * 1000:.1f}, "
+        f"p95 {latencies[int(len(latencies) * 0.95)] * 1000:.1f}, "
+        f"max {latencies[-1] * 1000:.1f}"
+    )
+    print(f"Errors: {errors}")
+
+
+if __name__ == "__main__":
+    main()
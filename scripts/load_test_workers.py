@@ -0,0 +1,247 @@
+"""Compare sync and gevent gunicorn workers under load.
+
+For each worker class, starts `gunicorn run:app` (with gunicorn.conf.py)
+on a local port against the database at MONGO_URI (use a scratch
+database), then has --concurrency clients hammer GET /api/events and
+POST /api/events/<id>/register for --duration seconds each, and reports
+throughput and latency. Every registration uses a fresh seeded student.
+
+Registration emails go to a local stand-in for the Mailgun API that
+answers after --mail-latency seconds, so no real mail is sent.
+
+    MONGO_URI=mongodb://localhost:27017/bench python scripts/load_test_workers.py \\
+        --worker-classes sync gevent --workers 2 --concurrency 100
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jwt
+import requests
+from dotenv import load_dotenv
+from pymongo import MongoClient
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Load environment variables
+load_dotenv()
+
+BENCH_PREFIX = "LOADW"
+
+
+def start_mail_sink(latency):
+    """Serve a fake Mailgun API on a free port; returns its base URL"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(b'{"message": "Queued"}')
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}/v3"
+
+
+def seed(db, users):
+    """Create students to register; returns their enrollment numbers"""
+    db.users.delete_many({"enrollment_number": {"$regex": f"^{BENCH_PREFIX}"}})
+    enrollments = [f"{BENCH_PREFIX}{i:07d}" for i in range(users)]
+    for start in range(0, users, 10000):
+        db.users.insert_many(
+            [
+                {
+                    "name": f"Student {enrollment}",
+                    "amity_email": f"{enrollment.lower()}@s.amity.edu",
+                    "enrollment_number": enrollment,
+                    "branch": "CSE",
+                    "year": 2,
+                    "phone_number": "9999999999",
+                }
+                for enrollment in enrollments[start : start + 10000]
+            ]
+        )
+    return enrollments
+
+
+def create_event(db, worker_class, capacity):
+    db.events.delete_many({"name": f"{BENCH_PREFIX} {worker_class}"})
+    return str(
+        db.events.insert_one(
+            {
+                "name": f"{BENCH_PREFIX} {worker_class}",
+                "date": datetime.now() + timedelta(days=7),
+                "venue": "Load test",
+                "description": "",
+                "max_participants": capacity,
+                "creator_id": f"{BENCH_PREFIX}0000000",
+                "prizes": [],
+                "participants": [],
+                "external_participants": [],
+                "allow_external": False,
+                "event_code": None,
+                "custom_fields": [],
+                "is_approved": True,
+                "approval_status": "approved",
+                "version": 1,
+                "created_at": datetime.now(),
+            }
+        ).inserted_id
+    )
+
+
+def token(enrollment):
+    return jwt.encode(
+        {
+            "enrollment_number": enrollment,
+            "exp": datetime.utcnow() + timedelta(hours=1),
+        },
+        os.getenv("JWT_SECRET_KEY", "your-secret-key"),
+    )
+
+
+def start_server(worker_class, workers, port, mail_base):
+    env = dict(
+        os.environ,
+        GUNICORN_WORKER_CLASS=worker_class,
+        GUNICORN_WORKERS=str(workers),
+        GUNICORN_BIND=f"127.0.0.1:{port}",
+        GUNICORN_ACCESS_LOG="",
+        MAILGUN_API_BASE=mail_base,
+        MAILGUN_DOMAIN="load.test",
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "run:app"],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            requests.get(f"http://127.0.0.1:{port}/api/events", timeout=1)
+            return server
+        except requests.RequestException:
+            time.sleep(0.5)
+    server.terminate()
+    raise RuntimeError(f"gunicorn ({worker_class}) did not start")
+
+
+def run_load(concurrency, duration, make_request):
+    """Call make_request from concurrency clients for duration seconds"""
+    deadline = time.perf_counter() + duration
+
+    def client(index):
+        session = requests.Session()
+        latencies = []
+        errors = 0
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                response = make_request(session)
+                ok = response.status_code < 400
+            except requests.RequestException:
+                ok = False
+            latencies.append(time.perf_counter() - started)
+            errors += not ok
+        return latencies, errors
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(client, range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies = sorted(latency for client, _ in results for latency in client)
+    errors = sum(client_errors for _, client_errors in results)
+    return latencies, errors, elapsed
+
+
+def report(label, latencies, errors, elapsed):
+    if not latencies:
+        print(f"  {label:<10} no requests completed")
+        return
+    print(
+        f"  {label:<10}{len(latencies) / elapsed:>8.1f} req/s   "
+        f"p50 {statistics.median(latencies) * 1000:>7.1f} ms   "
+        f"p95 {latencies[int(len(latencies) * 0.95)] * 1000:>7.1f} ms   "
+        f"errors {errors}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--worker-classes", nargs="+", default=["sync", "gevent"], help="To compare"
+    )
+    parser.add_argument("--workers", type=int, default=2, help="Worker processes")
+    parser.add_argument("--concurrency", type=int, default=50, help="Clients")
+    parser.add_argument("--duration", type=float, default=15, help="Seconds per test")
+    parser.add_argument("--users", type=int, default=20000, help="Students seeded")
+    parser.add_argument("--port", type=int, default=5099)
+    parser.add_argument(
+        "--mail-latency", type=float, default=0.3, help="Fake Mailgun delay (s)"
+    )
+    args = parser.parse_args()
+
+    db = MongoClient(os.getenv("MONGO_URI")).get_default_database()
+    print(f"Seeding {args.users} students...")
+    enrollments = seed(db, args.users)
+    mail_base = start_mail_sink(args.mail_latency)
+    base_url = f"http://127.0.0.1:{args.port}/api"
+    browse_headers = {"Authorization": f"Bearer {token(enrollments[0])}"}
+
+    try:
+        for worker_class in args.worker_classes:
+            event_id = create_event(db, worker_class, args.users)
+            server = start_server(worker_class, args.workers, args.port, mail_base)
+            print(f"{worker_class} workers ({args.workers} processes):")
+            try:
+                latencies, errors, elapsed = run_load(
+                    args.concurrency,
+                    args.duration,
+                    lambda session: session.get(
+                        f"{base_url}/events", headers=browse_headers
+                    ),
+                )
+                report("events", latencies, errors, elapsed)
+
+                students = iter(enrollments[1:])
+                lock = threading.Lock()
+
+                # Bound now, so a late request cannot see the next class's event
+                def register(session, students=students, lock=lock, event_id=event_id):
+                    with lock:
+                        enrollment = next(students)
+                    return session.post(
+                        f"{base_url}/events/{event_id}/register",
+                        json={"custom_field_values": {}},
+                        headers={"Authorization": f"Bearer {token(enrollment)}"},
+                    )
+
+                latencies, errors, elapsed = run_load(
+                    args.concurrency, args.duration, register
+                )
+                report("register", latencies, errors, elapsed)
+            finally:
+                server.terminate()
+                server.wait()
+    finally:
+        db.users.delete_many({"enrollment_number": {"$regex": f"^{BENCH_PREFIX}"}})
+        db.events.delete_many({"name": {"$regex": f"^{BENCH_PREFIX}"}})
+
+
+if __name__ == "__main__":
+    main()
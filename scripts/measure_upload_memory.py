@@ -0,0 +1,162 @@
+"""Measure peak memory of parsing an event form with a large image.
+
+Builds a multipart body with a generated image of each size and parses
+it inside a request context two ways: through Werkzeug's request.files
+(the old path) and through the streaming parse_image_form. The body is
+generated while it is read, so the figures only show what the parser
+keeps. Peak Python allocations are reported with tracemalloc. Bodies over
+the configured limits must be rejected before they are read in full; the
+last line checks that with a body of 4x MAX_CONTENT_LENGTH.
+
+    python scripts/measure_upload_memory.py --sizes 1 8 50
+"""
+import argparse
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+from flask import Flask, request
+from werkzeug.test import EnvironBuilder
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.utils.multipart import (  # noqa: E402
+    UploadTooLarge,
+    discard_images,
+    parse_image_form,
+)
+from config import Config  # noqa: E402
+
+BOUNDARY = "----measure-upload-memory"
+CONTENT_TYPE = f"multipart/form-data; boundary={BOUNDARY}"
+# Leading bytes of a JPEG, so the content passes the magic byte check
+JPEG_HEAD = b"\xff\xd8\xff\xe0\x00\x10JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00"
+
+
+class GeneratedBody(io.RawIOBase):
+    """A multipart body with an image of `size` bytes, produced on read"""
+
+    def __init__(self, size):
+        self.parts = [
+            self._field("name", "Memory test"),
+            self._field("description", "x" * 2000),
+            (
+                f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="image"; '
+                'filename="photo.jpg"\r\nContent-Type: image/jpeg\r\n\r\n'
+            ).encode()
+            + JPEG_HEAD,
+        ]
+        self.image_left = size - len(JPEG_HEAD)
+        self.tail = f"\r\n--{BOUNDARY}--\r\n".encode()
+        self.length = sum(map(len, self.parts)) + self.image_left + len(self.tail)
+        # Binary data with line breaks now and then, like real images
+        self.block = (os.urandom(255) + b"\n") * 256
+        self.pending = b""
+        self.sent = 0
+
+    @staticmethod
+    def _field(name, value):
+        return (
+            f"--{BOUNDARY}\r\nContent-Disposition: form-data; "
+            f'name="{name}"\r\n\r\n{value}\r\n'
+        ).encode()
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if not self.pending:
+            if self.parts:
+                self.pending = self.parts.pop(0)
+            elif self.image_left > 0:
+                self.pending = self.block[: min(self.image_left, len(self.block))]
+                self.image_left -= len(self.pending)
+            else:
+                self.pending, self.tail = self.tail, b""
+        data, self.pending = self.pending[: len(buffer)], self.pending[len(buffer) :]
+        buffer[: len(data)] = data
+        self.sent += len(data)
+        return len(data)
+
+
+def request_context(app, body, content_length):
+    """A POST request reading body; chunked when content_length is None"""
+    environ = EnvironBuilder(method="POST").get_environ()
+    environ["CONTENT_TYPE"] = CONTENT_TYPE
+    environ["wsgi.input"] = io.BufferedReader(body, 64 * 1024)
+    if content_length is None:
+        environ.pop("CONTENT_LENGTH", None)
+        environ["wsgi.input_terminated"] = True
+    else:
+        environ["CONTENT_LENGTH"] = str(content_length)
+    return app.request_context(environ)
+
+
+def measure(app, size, streaming):
+    body = GeneratedBody(size)
+    tracemalloc.start()
+    started = time.perf_counter()
+    error = None
+    with request_context(app, body, body.length):
+        try:
+            if streaming:
+                form, images = parse_image_form(
+                    {"image"}, max_file_size=size * 2, max_total=size * 2
+                )
+                assert images["image"]["size"] == size, "image was not spooled"
+                discard_images(images)
+            else:
+                # Werkzeug parses (and buffers) the whole form on first access
+                request.files["image"].read(1)
+        except UploadTooLarge as e:
+            error = str(e)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, elapsed, body.sent, error
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1, 8, 50],
+        help="Image sizes in MB (default: 1 8 50)",
+    )
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    # Let Werkzeug accept the large bodies being compared
+    app.config["MAX_CONTENT_LENGTH"] = None
+
+    print(f"{'image':>8}  {'parser':<10}{'peak memory':>14}{'time':>10}")
+    for megabytes in args.sizes:
+        size = megabytes * 1024 * 1024
+        for streaming in (False, True):
+            peak, elapsed, _, _ = measure(app, size, streaming)
+            name = "streaming" if streaming else "werkzeug"
+            print(
+                f"{megabytes:>6}MB  {name:<10}{peak / 1024:>11.0f} KB{elapsed:>9.2f}s"
+            )
+
+    # Oversized bodies are rejected from Content-Length before reading, and
+    # while reading when the length is not known up front
+    app.config["MAX_CONTENT_LENGTH"] = Config.MAX_CONTENT_LENGTH
+    body = GeneratedBody(4 * Config.MAX_CONTENT_LENGTH)
+    with request_context(app, body, None):
+        try:
+            parse_image_form({"image"})
+            print("Oversized body was accepted")
+        except UploadTooLarge as e:
+            print(
+                f"Oversized body rejected after {body.sent} of {body.length} bytes: {e}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import argparse
+import os
+import sys
+from types import SimpleNamespace
+
+from dotenv import load_dotenv
+from pymongo import MongoClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.models.event_analytics import EventAnalytics  # noqa: E402
+
+# Load environment variables
+load_dotenv()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Recompute event analytics rollups from the events collection"
+    )
+    parser.add_argument(
+        "--event-id", help="Only rebuild this event (default: every event)"
+    )
+    args = parser.parse_args()
+
+    client = MongoClient(os.getenv("MONGO_URI"))
+    analytics = EventAnalytics(SimpleNamespace(db=client.get_default_database()))
+
+    target = args.event_id or "all events"
+    print(f"Rebuilding analytics for {target}...")
+    rebuilt = analytics.rebuild(args.event_id)
+    print(f"Rollups written: {rebuilt}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Stress test for the id allocator.
+
+Generates a large number of ids concurrently from several processes, each
+running several threads, and checks that no id was handed out twice.
+
+    python scripts/stress_id_allocator.py --total 1000000 --processes 4 --threads 8
+"""
+import argparse
+import os
+import string
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from types import SimpleNamespace
+
+from dotenv import load_dotenv
+from pymongo import MongoClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.utils.id_allocator import IdAllocator  # noqa: E402
+
+# Load environment variables
+load_dotenv()
+
+COUNTER_NAME = "stress_test"
+
+
+def generate(count, threads, block_size):
+    """Generate count ids in one process using a shared allocator"""
+    client = MongoClient(os.getenv("MONGO_URI"))
+    mongo = SimpleNamespace(db=client.get_default_database())
+    allocator = IdAllocator(
+        mongo, COUNTER_NAME, string.digits, 8, prefix="EXT", block_size=block_size
+    )
+
+    per_thread = [count // threads + (i < count % threads) for i in range(threads)]
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        batches = executor.map(
+            lambda n: [allocator.next_id() for _ in range(n)], per_thread
+        )
+        return [temp_id for batch in batches for temp_id in batch]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stress test the id allocator")
+    parser.add_argument("--total", type=int, default=1_000_000)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--block-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    db = MongoClient(os.getenv("MONGO_URI")).get_default_database()
+    db.counters.delete_one({"_id": COUNTER_NAME})
+
+    counts = [
+        args.total // args.processes + (i < args.total % args.processes)
+        for i in range(args.processes)
+    ]
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.processes) as executor:
+        results = executor.map(
+            generate,
+            counts,
+            [args.threads] * args.processes,
+            [args.block_size] * args.processes,
+        )
+        ids = [temp_id for batch in results for temp_id in batch]
+    elapsed = time.perf_counter() - started
+
+    db.counters.delete_one({"_id": COUNTER_NAME})
+
+    unique = len(set(ids))
+    print(f"Generated {len(ids)} ids in {elapsed:.2f}s ({len(ids) / elapsed:,.0f}/s)")
+    print(f"Unique ids: {unique}")
+    print(f"Duplicates: {len(ids) - unique}")
+    sys.exit(0 if unique == len(ids) == args.total else 1)
+
+
+if __name__ == "__main__":
+    main()